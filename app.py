@@ -4,9 +4,15 @@
 # AUTHOR: Chandy Neat
 # ==============================================================
 
-from flask import Flask, render_template, redirect, url_for
+from flask import Flask, render_template, redirect, request, url_for, jsonify
 from datetime import datetime
 from config import Config
+from models import db as database
+from models import query_log
+from models.cache import dashboard_cache
+from models.audit_model import configure_audit, get_audit_writer
+from utils import logger, metrics, profiler
+from utils.security import HashPoolBusy, configure_hasher, get_hasher
 
 # ==============================================================
 # 🔹 Initialize Flask App
@@ -15,6 +21,21 @@ app = Flask(__name__)
 app.config.from_object(Config)
 app.secret_key = app.config['SECRET_KEY']
 
+# ==============================================================
+# 🔹 Structured Logging (JSON, request-id correlated)
+# ==============================================================
+logger.init_app(app)
+
+# ==============================================================
+# 🔹 Database Connection Pool
+# ==============================================================
+database.init_app(app)
+query_log.init_app(app)
+configure_audit(app.config)
+configure_hasher(app.config)
+profiler.init_app(app)
+metrics.init_app(app, caches={'dashboard': dashboard_cache}, pool_stats=database.pool_stats)
+
 # ==============================================================
 # 🔹 Import & Register Blueprints
 # ==============================================================
@@ -26,6 +47,8 @@ from routes.attendance_routes import attendance_routes
 from routes.teacher_routes import teacher_routes
 from routes.grade_routes import grade_bp   # ✅ Added Grade Routes
 from routes.class_routes import classes_bp  # ✅ Added Grade Routes
+from routes.audit_routes import audit_bp
+from routes.export_routes import export_bp
 
 # Register all blueprints
 app.register_blueprint(auth_bp)
@@ -36,6 +59,8 @@ app.register_blueprint(attendance_routes)
 app.register_blueprint(teacher_routes)
 app.register_blueprint(grade_bp)  # ✅ Register new grade blueprint
 app.register_blueprint(classes_bp)  # ✅ Register new grade blueprint
+app.register_blueprint(audit_bp)
+app.register_blueprint(export_bp)
 
 # ==============================================================
 # 🔹 Global Template Variables
@@ -53,6 +78,26 @@ def home():
     """Redirect to login page."""
     return redirect(url_for('auth.login'))
 
+@app.route('/health/db-pool')
+def db_pool_health():
+    """Connection pool stats (in-use, idle, waits, timeouts) for monitoring."""
+    return jsonify(database.pool_stats())
+
+@app.route('/health/cache')
+def cache_health():
+    """Dashboard cache hit/miss counters for monitoring."""
+    return jsonify(dashboard_cache.stats())
+
+@app.route('/health/hashing')
+def hashing_health():
+    """Password hashing pool settings and hashed/verified/rejected counters."""
+    return jsonify(get_hasher().stats())
+
+@app.route('/health/audit')
+def audit_health():
+    """Audit writer queue depth and written/dropped/failed counters."""
+    return jsonify(get_audit_writer().stats())
+
 # ==============================================================
 # 🔹 Error Handlers
 # ==============================================================
@@ -61,6 +106,14 @@ def not_found(e):
     """Custom 404 page."""
     return render_template('errors/404.html'), 404
 
+@app.errorhandler(HashPoolBusy)
+def hashing_busy(e):
+    """Login/hash capacity exhausted: answer immediately and ask the client to retry."""
+    headers = {'Retry-After': '2'}
+    if request.is_json:
+        return jsonify({'error': str(e)}), 503, headers
+    return render_template('errors/503.html'), 503, headers
+
 @app.errorhandler(500)
 def internal_error(e):
     """Custom 500 page."""
@@ -0,0 +1,278 @@
+# ==============================================================
+# FILE: benchmarks/explain_plans.py
+# PURPOSE: Query plan regression check. Collects the SQL the app issues,
+#          EXPLAINs each statement and fails on full scans of the big tables
+#          or on examined-row estimates above the recorded per-query budget
+# USAGE:   python benchmarks/explain_plans.py [--record] [--seed-schools N]
+#                 [--budgets benchmarks/plan_budgets.json] [--headroom 2.0]
+#                 [--sqlite]   (fresh migrated in-memory database; full-scan check only,
+#                               SQLite has no row estimates)
+# ==============================================================
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app import app
+from models import query_log
+from models.pool import configure_pool, get_pool
+from benchmarks.run_benchmarks import build_scenarios, load_fixture, login
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), 'plan_budgets.json')
+
+# A full table scan on any of these fails the check unless the budget entry
+# says allow_full_scan (e.g. an intentional whole-table export)
+WATCHED_TABLES = ('attendance', 'grades', 'students')
+
+_SKIP = re.compile(r'^\s*(SET|SHOW|PRAGMA|BEGIN|COMMIT|ROLLBACK|SELECT\s+(GET_LOCK|RELEASE_LOCK|1\b))', re.I)
+_PLAIN_INSERT = re.compile(r'^\s*INSERT\s+(?:IGNORE\s+)?INTO\s+\w+\s*\([^)]*\)\s*VALUES\b', re.I)
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?', re.I)
+_NOT_ALIAS = {'where', 'join', 'left', 'right', 'inner', 'outer', 'cross', 'on', 'using', 'set', 'group',
+              'order', 'limit', 'having', 'union', 'values', 'for', 'as', 'straight_join', 'natural'}
+
+
+def extra_paths(fx):
+    """GET pages beyond the benchmark scenarios, with their filters switched on."""
+    class_id, subject_id, student_id = fx['class_id'], fx['subject_id'], fx['student_id']
+    return [
+        ('admin', f"/students/?class_id={class_id}&status=active"),
+        ('admin', "/students/?gender=Female"),
+        ('admin', f"/attendance?class_id={class_id}&date_from=2000-01-01&date_to=2100-01-01"),
+        ('admin', "/audit/api"),
+        ('admin', f"/audit/api?user_id={fx['admin']['id']}&action=grade"),
+        ('admin', "/subjects/"),
+        ('admin', f"/students/edit/{student_id}"),
+        ('admin', f"/export/students.csv?class_id={class_id}"),
+        ('admin', f"/export/grades.csv?class_id={class_id}&subject_id={subject_id}"),
+        ('teacher', "/export/attendance.csv?date_from=2000-01-01&date_to=2100-01-01"),
+        ('teacher', f"/grades/gradebook?class_id={class_id}&subject_id={subject_id}&term=Term+2"),
+    ]
+
+
+# ==============================================================
+# 🔹 Collect statements (one example per normalized shape)
+# ==============================================================
+def collect_statements(fx):
+    statements = {}
+    origin = ['']
+
+    def listener(sql, params):
+        shape = query_log.normalize(sql)
+        if shape not in statements:
+            statements[shape] = {'sql': sql, 'params': tuple(params or ()), 'origin': origin[0]}
+
+    requests = [(name, role, method, path, form) for name, role, method, path, form in build_scenarios(fx)]
+    requests += [(path, role, 'GET', path, None) for role, path in extra_paths(fx)]
+
+    query_log.add_listener(listener)
+    try:
+        for name, role, method, path, form in requests:
+            origin[0] = name
+            client = app.test_client()
+            login(client, role, fx)
+            resp = client.open(path, method=method, data=form() if form else None)
+            resp.get_data()  # drain streamed responses so their queries run
+            if resp.status_code >= 500:
+                print(f"⚠️ {name}: HTTP {resp.status_code}")
+    finally:
+        query_log.remove_listener(listener)
+    return statements
+
+
+def budget_key(shape):
+    return hashlib.sha1(shape.encode('utf-8')).hexdigest()[:16]
+
+
+def table_aliases(sql):
+    """Map every alias (and table name) used in the statement to its table."""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in _NOT_ALIAS:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def explainable(sql):
+    return not _SKIP.match(sql) and not _PLAIN_INSERT.match(sql) and re.search(r'\b(FROM|UPDATE)\b', sql, re.I)
+
+
+# ==============================================================
+# 🔹 EXPLAIN per engine -> (full_scans, rows_examined_estimate)
+# ==============================================================
+def _mysql_tables(node, found):
+    """Yield plan table nodes in order; nested_loop entries keep their join order."""
+    if isinstance(node, dict):
+        if 'nested_loop' in node:
+            found.append([item['table'] for item in node['nested_loop'] if 'table' in item])
+            for item in node['nested_loop']:
+                _mysql_tables({k: v for k, v in item['table'].items()}, found)
+        elif 'table' in node and isinstance(node['table'], dict):
+            found.append([node['table']])
+            _mysql_tables({k: v for k, v in node['table'].items() if k != 'table'}, found)
+        else:
+            for value in node.values():
+                _mysql_tables(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _mysql_tables(value, found)
+
+
+def explain_mysql(cursor, sql, params):
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    plan = json.loads(cursor.fetchone()[0])
+    groups = []
+    _mysql_tables(plan, groups)
+
+    full_scans, examined = [], 0
+    for tables in groups:
+        outer_rows = 1  # rows_produced_per_join is cumulative along a join
+        for t in tables:
+            if t.get('access_type') == 'ALL':
+                full_scans.append(t.get('table_name', '?'))
+            examined += outer_rows * float(t.get('rows_examined_per_scan', 0))
+            outer_rows = float(t.get('rows_produced_per_join', outer_rows)) or 1
+    return full_scans, int(examined)
+
+
+def explain_sqlite(cursor, sql, params):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    full_scans = []
+    for row in cursor.fetchall():
+        match = re.match(r'^SCAN (\w+)$', row[3])
+        if match:
+            full_scans.append(match.group(1))
+    return full_scans, None
+
+
+def explain_all(statements):
+    conn = get_pool().checkout()
+    cursor = conn.cursor()
+    explain = explain_mysql if get_pool().backend.name == 'mysql' else explain_sqlite
+    results = {}
+    try:
+        for shape, st in statements.items():
+            if not explainable(st['sql']):
+                continue
+            try:
+                scans, examined = explain(cursor, st['sql'], st['params'])
+            except Exception as e:
+                print(f"⚠️ Could not EXPLAIN ({e}): {shape[:120]}")
+                continue
+            aliases = table_aliases(st['sql'])
+            scanned = sorted({aliases.get(s.lower(), s.lower()) for s in scans})
+            results[budget_key(shape)] = {**st, 'shape': shape, 'full_scans': scanned, 'rows_examined': examined}
+    finally:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+    return results
+
+
+# ==============================================================
+# 🔹 Check / record
+# ==============================================================
+def check(results, budgets):
+    failures = []
+    for key, r in sorted(results.items(), key=lambda kv: kv[1]['origin']):
+        budget = budgets.get(key)
+        label = f"[{key}] {r['origin']}: {r['shape'][:140]}"
+        if budget is None:
+            failures.append(f"🆕 no budget recorded (run with --record): {label}")
+            continue
+        bad_scans = [t for t in r['full_scans'] if t in WATCHED_TABLES]
+        if bad_scans and not budget.get('allow_full_scan'):
+            failures.append(f"❌ full table scan on {', '.join(bad_scans)}: {label}")
+        limit = budget.get('max_rows_examined')
+        if r['rows_examined'] is None:
+            continue  # SQLite: no row estimates, full-scan check only
+        if limit is None:
+            # Budgets recorded on SQLite carry no row limit; on MySQL that would
+            # silently skip the examined-rows half of the check
+            failures.append(f"🆕 no row budget recorded (run with --record on a seeded MySQL database): {label}")
+        elif r['rows_examined'] > limit:
+            failures.append(f"❌ examines ~{r['rows_examined']:,} rows (budget {limit:,}): {label}")
+    return failures
+
+
+def record(results, budgets, headroom):
+    updated = {}
+    for key, r in results.items():
+        old = budgets.get(key, {})
+        entry = {
+            'sql': r['shape'][:300],
+            'origin': r['origin'],
+            'allow_full_scan': old.get('allow_full_scan', False),
+        }
+        if r['rows_examined'] is not None:
+            entry['max_rows_examined'] = max(10, math.ceil(r['rows_examined'] * headroom))
+        elif 'max_rows_examined' in old:
+            entry['max_rows_examined'] = old['max_rows_examined']
+        updated[key] = entry
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN every query the app issues and check plan budgets.")
+    parser.add_argument('--budgets', default=BUDGETS_PATH)
+    parser.add_argument('--record', action='store_true',
+                        help="Write current estimates (x headroom) as the budgets; keeps allow_full_scan flags")
+    parser.add_argument('--headroom', type=float, default=2.0)
+    parser.add_argument('--seed-schools', type=int, help="Load N schools of synthetic data first")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sqlite', action='store_true', help="Use a fresh in-memory SQLite database")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        # Tables plus every migration, so the hot-path indexes are in place
+        from migrations.runner import MigrationRunner
+        app.config.update(DB_BACKEND='sqlite', SQLITE_PATH=':memory:')
+        pool = configure_pool(app.config)
+        conn = pool.checkout()
+        try:
+            MigrationRunner(pool.backend, conn, log=lambda *_: None).upgrade()
+        finally:
+            conn.close()
+        args.seed_schools = args.seed_schools or 1
+    if args.seed_schools:
+        from seeders.synthetic_data import SyntheticPlan, generate
+        conn = get_pool().checkout()
+        try:
+            generate(conn, SyntheticPlan(schools=args.seed_schools, seed=args.seed))
+        finally:
+            conn.close()
+
+    app.config['TESTING'] = True
+    statements = collect_statements(load_fixture())
+    results = explain_all(statements)
+    print(f"🔎 {len(statements)} distinct statements, {len(results)} explained on {get_pool().backend.describe()}")
+
+    budgets = {}
+    if os.path.exists(args.budgets):
+        with open(args.budgets, encoding='utf-8') as f:
+            budgets = json.load(f)
+
+    if args.record:
+        budgets = record(results, budgets, args.headroom)
+        with open(args.budgets, 'w', encoding='utf-8') as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Recorded {len(budgets)} budgets in {args.budgets}")
+
+    failures = check(results, budgets)
+    for line in failures:
+        print(line)
+    if failures:
+        print(f"\n❌ {len(failures)} plan problem(s). Fix the query or index, or set allow_full_scan "
+              f"in {os.path.relpath(args.budgets)} for an intentional scan.")
+        sys.exit(1)
+    print("✅ All query plans within budget.")
+
+
+if __name__ == "__main__":
+    main()
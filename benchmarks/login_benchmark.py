@@ -0,0 +1,82 @@
+# ==============================================================
+# FILE: benchmarks/login_benchmark.py
+# PURPOSE: Password verification throughput (logins/sec, logins/sec per core)
+# USAGE:   python benchmarks/login_benchmark.py [--logins 200] [--threads 16]
+#                 [--workers 0,1,2,4] [--method scrypt]
+# ==============================================================
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.security import HashPoolBusy, PasswordHasher, normalize_method
+from werkzeug.security import generate_password_hash
+
+PASSWORD = 'correct horse battery staple'
+
+
+def run(method, workers, logins, threads, max_pending):
+    """Verify `logins` passwords from `threads` concurrent callers; busy rejections are retried."""
+    hasher = PasswordHasher(method=method, workers=workers, max_pending=max_pending)
+    stored = generate_password_hash(PASSWORD, method=method)
+    hasher.verify(stored, PASSWORD)  # start the pool outside the timed section
+
+    remaining = [logins]
+    lock = threading.Lock()
+    busy = [0]
+
+    def caller():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            while True:
+                try:
+                    assert hasher.verify(stored, PASSWORD)
+                    break
+                except HashPoolBusy:
+                    with lock:
+                        busy[0] += 1
+                    time.sleep(0.005)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=caller) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    rate = logins / elapsed
+    cores = workers or 1
+    return {'workers': workers, 'seconds': elapsed, 'logins_per_sec': rate,
+            'per_core': rate / cores, 'busy_rejections': busy[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login password verification.")
+    parser.add_argument('--method', default='scrypt', help="werkzeug hash method (e.g. pbkdf2:sha256:600000)")
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16, help="Concurrent request threads")
+    parser.add_argument('--workers', default=f"0,{os.cpu_count() or 1}",
+                        help="Comma-separated pool sizes to compare (0 = inline in the request thread)")
+    parser.add_argument('--max-pending', type=int, default=0, help="Queue-depth limit (0 = 4 per worker)")
+    args = parser.parse_args()
+
+    print(f"🔐 {normalize_method(args.method)}: {args.logins} logins from {args.threads} threads "
+          f"on {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>8}{'seconds':>10}{'logins/s':>11}{'per core':>10}{'busy':>7}")
+    for workers in (int(w) for w in args.workers.split(',')):
+        r = run(args.method, workers, args.logins, args.threads, args.max_pending or None)
+        label = 'inline' if workers == 0 else str(workers)
+        print(f"{label:>8}{r['seconds']:>10.2f}{r['logins_per_sec']:>11.1f}"
+              f"{r['per_core']:>10.1f}{r['busy_rejections']:>7}")
+
+
+if __name__ == "__main__":
+    main()
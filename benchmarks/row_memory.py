@@ -0,0 +1,132 @@
+# ==============================================================
+# FILE: benchmarks/row_memory.py
+# PURPOSE: Memory of dict rows (dictionary cursor) vs compact Rows (models/rows.py)
+# USAGE:   python benchmarks/row_memory.py [--rows 1000000]
+#                 [--db]   (fetch real attendance rows from the configured database instead)
+# ==============================================================
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.rows import fetch_rows, row_class
+
+# Same columns as AttendanceModel.get_all_attendance()
+COLUMNS = ('id', 'student_name', 'class_name', 'date', 'status')
+ATTENDANCE_SQL = """
+    SELECT a.id, s.name AS student_name, c.name AS class_name, a.date, a.status
+    FROM attendance a
+    JOIN students s ON a.student_id = s.id
+    JOIN classes c ON a.class_id = c.id
+    ORDER BY a.date DESC
+    LIMIT %s
+"""
+
+
+def driver_rows(count, seed=42):
+    """
+    Tuples shaped like what the driver returns for get_all_attendance().
+    Names and dates are fresh objects per row, as they would be off the wire.
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    statuses = ('Present', 'Absent', 'Late')
+    return [
+        (i, f"Student {rng.randrange(50000)}", f"Class {rng.randrange(400)}",
+         start + timedelta(days=rng.randrange(365)), rng.choice(statuses))
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(build):
+    """Run build() under tracemalloc; return (result, retained_bytes, peak_bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def scan_seconds(rows, attribute=False):
+    """Time one pass reading a column from every row, by key (row['status']) or attribute (row.status)."""
+    started = time.perf_counter()
+    if attribute:
+        sum(1 for row in rows if row.status == 'Present')
+    else:
+        sum(1 for row in rows if row['status'] == 'Present')
+    return time.perf_counter() - started
+
+
+def report(label, rows, retained, peak, build_s):
+    count = len(rows)
+    key_s = scan_seconds(rows)
+    attr_s = f"{scan_seconds(rows, attribute=True):>9.2f}" if not isinstance(rows[0], dict) else f"{'-':>9}"
+    print(f"{label:<24}{retained / 2**20:>10.1f}{retained / count:>10.0f}{peak / 2**20:>10.1f}"
+          f"{build_s:>9.2f}{key_s:>9.2f}{attr_s}")
+
+
+def print_header():
+    print(f"{'representation':<24}{'MiB':>10}{'B/row':>10}{'peak MiB':>10}{'build s':>9}"
+          f"{'key s':>9}{'attr s':>9}")
+
+
+def synthetic(count):
+    print(f"🧪 {count:,} synthetic attendance rows; containers only (the values are shared)")
+    raw = driver_rows(count)
+    cls = row_class(COLUMNS)
+    print_header()
+    for label, build in (
+        ('dict (dictionary=True)', lambda: [dict(zip(COLUMNS, r)) for r in raw]),
+        ('Row (models/rows.py)', lambda: list(map(cls, raw))),
+    ):
+        rows, retained, peak, build_s = measure(build)
+        report(label, rows, retained, peak, build_s)
+        del rows
+
+
+def from_database(count):
+    from app import app
+    from models.pool import get_pool
+
+    print(f"🗄️ Up to {count:,} attendance rows from {get_pool().backend.describe()}; values included")
+    print_header()
+    with app.app_context():
+        for label, dictionary in (('dict (dictionary=True)', True), ('Row (models/rows.py)', False)):
+            conn = get_pool().checkout()
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                cursor.execute(ATTENDANCE_SQL, (count,))
+                rows, retained, peak, build_s = measure(
+                    cursor.fetchall if dictionary else lambda: fetch_rows(cursor))
+            finally:
+                cursor.close()
+                conn.close()
+            if not rows:
+                raise SystemExit("❌ No attendance rows; seed with `python seeders/seed_data.py --schools N`.")
+            report(label, rows, retained, peak, build_s)
+            del rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of dict rows and compact Rows.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--db', action='store_true', help="Fetch from the configured database")
+    args = parser.parse_args()
+
+    if args.db:
+        from_database(args.rows)
+    else:
+        synthetic(args.rows)
+
+
+if __name__ == "__main__":
+    main()
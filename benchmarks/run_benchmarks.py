@@ -0,0 +1,286 @@
+# ==============================================================
+# FILE: benchmarks/run_benchmarks.py
+# PURPOSE: Per-route HTTP benchmarks with latency percentiles
+# USAGE:   python benchmarks/run_benchmarks.py [--seed-schools 5] [--requests 200]
+#                 [--threads 4] [--only admin_dashboard,...] [--compare old.json]
+#                 [--sqlite [PATH]]   (embedded database, no MySQL server needed)
+# ==============================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app import app
+from models.pool import configure_pool, get_pool
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+# ==============================================================
+# 🔹 Fixture: pick real ids from the seeded database
+# ==============================================================
+def load_fixture():
+    """Find one admin, one class with its teacher, a subject and a student."""
+    conn = get_pool().checkout()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT id, email FROM users WHERE role = 'admin' ORDER BY id LIMIT 1")
+        admin = cursor.fetchone()
+        cursor.execute("""
+            SELECT c.id AS class_id, t.id AS teacher_id, u.id AS user_id, u.email
+            FROM classes c
+            JOIN teachers t ON c.teacher_id = t.id
+            JOIN users u ON t.user_id = u.id
+            ORDER BY c.id LIMIT 1
+        """)
+        teacher = cursor.fetchone()
+        cursor.execute("SELECT id FROM subjects WHERE class_id = %s ORDER BY id LIMIT 1",
+                       (teacher['class_id'],))
+        subject = cursor.fetchone()
+        cursor.execute("SELECT id FROM students WHERE class_id = %s AND status = 'active' ORDER BY id",
+                       (teacher['class_id'],))
+        roster = [row['id'] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+    if not (admin and teacher and subject and roster):
+        raise SystemExit("❌ Database has no usable data; run with --seed-schools N first.")
+    return {
+        'admin': admin,
+        'teacher': teacher,
+        'class_id': teacher['class_id'],
+        'subject_id': subject['id'],
+        'roster': roster,
+        'student_id': roster[0],
+    }
+
+
+# ==============================================================
+# 🔹 Scenarios: (name, role, method, path, form-data builder)
+# ==============================================================
+def build_scenarios(fx):
+    def attendance_form():
+        data = {'class_id': fx['class_id'], 'student_id': fx['roster']}
+        data.update({f"status_{sid}": 'Present' for sid in fx['roster']})
+        return data
+
+    return [
+        ('admin_dashboard', 'admin', 'GET', '/admin', None),
+        ('admin_students_list', 'admin', 'GET', '/students/', None),
+        ('admin_grades_list', 'admin', 'GET', '/grades/', None),
+        ('admin_subject_assign_page', 'admin', 'GET', '/subjects/assign_page', None),
+        ('admin_classes_manage', 'admin', 'GET', '/classes/manage', None),
+        ('admin_teachers_list', 'admin', 'GET', '/teachers', None),
+        ('teacher_dashboard', 'teacher', 'GET', '/teacher', None),
+        ('teacher_attendance_view', 'teacher', 'GET', '/attendance', None),
+        ('teacher_class_roster', 'teacher', 'GET', f"/attendance/students/{fx['class_id']}", None),
+        ('teacher_mark_attendance', 'teacher', 'POST', '/attendance/mark', attendance_form),
+        ('teacher_gradebook_view', 'teacher', 'GET',
+         f"/grades/gradebook?class_id={fx['class_id']}&subject_id={fx['subject_id']}", None),
+        ('student_dashboard', 'student', 'GET', '/student', None),
+        ('student_grades', 'student', 'GET', '/grades/', None),
+    ]
+
+
+def login(client, role, fx):
+    """Put a role's identity straight into the session (login hashing is benchmarked separately)."""
+    with client.session_transaction() as sess:
+        if role == 'admin':
+            sess.update(user_id=fx['admin']['id'], email=fx['admin']['email'], role='admin')
+        elif role == 'teacher':
+            t = fx['teacher']
+            sess.update(user_id=t['user_id'], id=t['class_id'], email=t['email'], role='teacher')
+        else:
+            sess.update(user_id=fx['student_id'], id=fx['student_id'], role='student')
+
+
+# ==============================================================
+# 🔹 Measurement
+# ==============================================================
+def server_questions():
+    """MySQL's global statement counter; used to derive queries per request (None on SQLite)."""
+    if get_pool().backend.name != 'mysql':
+        return None
+    conn = get_pool().checkout()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        return int(cursor.fetchone()[1])
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_scenario(scenario, fx, requests, threads, warmup):
+    name, role, method, path, form = scenario
+    latencies = []
+    errors = []
+    header_queries = []
+    lock = threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def worker(count, record):
+        client = app.test_client()
+        login(client, role, fx)
+        local = []
+        for _ in range(count):
+            data = form() if form else None
+            started = time.perf_counter()
+            resp = client.open(path, method=method, data=data)
+            elapsed = (time.perf_counter() - started) * 1000
+            if resp.status_code >= 500:
+                with lock:
+                    errors.append(resp.status_code)
+            local.append(elapsed)
+            if record and 'X-DB-Queries' in resp.headers:
+                with lock:
+                    header_queries.append(int(resp.headers['X-DB-Queries']))
+        if record:
+            with lock:
+                latencies.extend(local)
+
+    worker(warmup, record=False)
+
+    # Fallback statement counter, sampled around the measured phase only; the
+    # two SHOW STATUS calls themselves are subtracted.
+    questions_before = server_questions()
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(per_thread, True)) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - started
+    questions_after = server_questions()
+    queries = questions_after - questions_before - 2 if questions_before is not None else 0
+
+    latencies.sort()
+    total = len(latencies)
+    # Prefer the app's own per-request count (X-DB-Queries) when instrumentation is on
+    if len(header_queries) == total:
+        queries = sum(header_queries)
+    return {
+        'scenario': name,
+        'role': role,
+        'method': method,
+        'path': path,
+        'requests': total,
+        'errors': len(errors),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / total, 3) if total else 0,
+        'throughput_rps': round(total / wall, 2) if wall else 0,
+        'queries_per_request': round(queries / total, 2) if total else 0,
+    }
+
+
+# ==============================================================
+# 🔹 Reporting
+# ==============================================================
+def print_table(results):
+    header = f"{'scenario':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>10}{'q/req':>8}{'err':>5}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['scenario']:<28}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{r['throughput_rps']:>10.1f}{r['queries_per_request']:>8.1f}{r['errors']:>5}")
+
+
+def compare(results, baseline_path, threshold):
+    """Print p95 deltas against an earlier run; returns True if any scenario regressed."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['scenario']: r for r in json.load(f)['results']}
+
+    regressed = False
+    print(f"\n📊 Compared with {baseline_path} (regression threshold {threshold:.0%} on p95)")
+    for r in results:
+        old = baseline.get(r['scenario'])
+        if not old or not old['p95_ms']:
+            continue
+        delta = (r['p95_ms'] - old['p95_ms']) / old['p95_ms']
+        flag = ''
+        if delta > threshold:
+            flag = '  ❌ REGRESSION'
+            regressed = True
+        print(f"   {r['scenario']:<28}{old['p95_ms']:>9.2f} -> {r['p95_ms']:>9.2f} ms ({delta:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application routes.")
+    parser.add_argument('--seed-schools', type=int, help="Load N schools of synthetic data first")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--only', help="Comma-separated scenario names")
+    parser.add_argument('--output', help="Result JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="Earlier result JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--sqlite', nargs='?', const=':memory:', metavar='PATH',
+                        help="Run against a fresh embedded SQLite database (default in-memory); implies a seed")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from migrations.create_table import create_tables
+        app.config.update(DB_BACKEND='sqlite', SQLITE_PATH=args.sqlite)
+        create_tables(configure_pool(app.config).backend)
+        args.seed_schools = args.seed_schools or 1
+
+    if args.seed_schools:
+        from seeders.synthetic_data import SyntheticPlan, generate
+        conn = get_pool().checkout()
+        try:
+            generate(conn, SyntheticPlan(schools=args.seed_schools, seed=args.seed))
+        finally:
+            conn.close()
+
+    app.config['TESTING'] = True
+    fx = load_fixture()
+    scenarios = build_scenarios(fx)
+    if args.only:
+        wanted = set(args.only.split(','))
+        scenarios = [s for s in scenarios if s[0] in wanted]
+
+    results = []
+    for scenario in scenarios:
+        results.append(run_scenario(scenario, fx, args.requests, args.threads, args.warmup))
+
+    print_table(results)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'backend': get_pool().backend.describe(),
+            'settings': {k: getattr(args, k) for k in ('requests', 'warmup', 'threads', 'seed_schools', 'seed')},
+            'results': results,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# ==============================================================
+# FILE: commands/import_students.py
+# PURPOSE: Import a student enrollment file (CSV or XLSX) in chunks
+# USAGE:   python commands/import_students.py enrollment.csv [--errors errors.csv]
+#                 [--chunk-size 1000] [--dry-run]
+# COLUMNS: name,gender,dob,email,contact,address,class[,year,status]
+# ==============================================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.pool import get_pool
+from models.student_import import ErrorReport, StudentImporter, read_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import students from a CSV or XLSX file.")
+    parser.add_argument('path')
+    parser.add_argument('--errors', help="Error report path (default: <file>.errors.csv)")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--dry-run', action='store_true', help="Validate only; nothing is written")
+    args = parser.parse_args()
+
+    errors_path = args.errors or f"{os.path.splitext(args.path)[0]}.errors.csv"
+    report = ErrorReport(errors_path)
+    conn = get_pool().checkout()
+    started = time.perf_counter()
+    try:
+        importer = StudentImporter(conn, chunk_size=args.chunk_size, dry_run=args.dry_run, on_error=report)
+        totals = importer.run(read_rows(args.path, args.path))
+    finally:
+        conn.close()
+        report.close()
+
+    elapsed = time.perf_counter() - started
+    prefix = "🧪 Dry run: " if args.dry_run else "✅ "
+    print(f"{prefix}{totals['imported']:,} of {totals['rows']:,} rows "
+          f"{'valid' if args.dry_run else 'imported'} in {elapsed:.1f}s")
+    if report.count:
+        print(f"⚠️ {report.count:,} row(s) rejected; see {errors_path}")
+    else:
+        os.remove(errors_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# ==============================================================
+# FILE: commands/provision_users.py
+# PURPOSE: Bulk-create user (and teacher) accounts from a CSV file
+# USAGE:   python commands/provision_users.py accounts.csv [--report report.csv]
+#                 [--chunk-size 500] [--dry-run]
+# CSV:     username,email,role[,password,name,specialization,contact,status]
+# ==============================================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.pool import get_pool
+from models.user_provisioning import UserProvisioner, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create accounts in bulk from a CSV file.")
+    parser.add_argument('csv_path')
+    parser.add_argument('--report', help="Where to write the per-row CSV report (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--dry-run', action='store_true', help="Validate and check duplicates without writing")
+    args = parser.parse_args()
+
+    conn = get_pool().checkout()
+    started = time.perf_counter()
+    try:
+        provisioner = UserProvisioner(conn, chunk_size=args.chunk_size, dry_run=args.dry_run)
+        with open(args.csv_path, newline='', encoding='utf-8-sig') as src:
+            if args.report:
+                with open(args.report, 'w', newline='', encoding='utf-8') as out:
+                    write_report(provisioner.run_csv(src), out)
+            else:
+                write_report(provisioner.run_csv(src), sys.stdout)
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    t = provisioner.totals
+    print(f"{'🧪 Dry run: ' if args.dry_run else '✅ '}{t['created']} created, {t['skipped']} skipped, "
+          f"{t['error']} errors in {elapsed:.1f}s", file=sys.stderr)
+    if args.report:
+        print(f"💾 Report saved to {args.report}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,3 +11,57 @@ class Config:
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
     MYSQL_DB = os.getenv("MYSQL_DB", "student_management")
     SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey123")
+    APP_ENV = os.getenv("APP_ENV", "development")
+
+    # --- Logging (JSON lines via a background queue) ---
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+    # --- Storage backend: "mysql" (default) or "sqlite" (embedded; tests and benchmarks) ---
+    DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+    SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+
+    # --- Connection pool ---
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # --- Caching ---
+    DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 300))
+
+    # --- Grading ---
+    GRADING_PLUS_MINUS = os.getenv("GRADING_PLUS_MINUS", "false").lower() in ("1", "true", "yes")
+
+    # --- SQL instrumentation ---
+    SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))
+
+    # --- Sampling profiler (off by default) ---
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", 0.01))
+    PROFILER_HEADER = os.getenv("PROFILER_HEADER", "X-Profile")
+    PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", 5))
+    PROFILER_OVERHEAD_BUDGET = float(os.getenv("PROFILER_OVERHEAD_BUDGET", 0.01))
+    PROFILER_OUTPUT_DIR = os.getenv("PROFILER_OUTPUT_DIR", "profiles")
+
+    # --- Metrics (/metrics, Prometheus text format) ---
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1")
+
+    # --- Audit trail (batched background writer) ---
+    AUDIT_DURABILITY = os.getenv("AUDIT_DURABILITY", "async")  # async | block | sync
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 200))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1.0))
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+    AUDIT_BLOCK_TIMEOUT = float(os.getenv("AUDIT_BLOCK_TIMEOUT", 2.0))
+
+    # --- Password hashing (process pool) ---
+    # werkzeug method string, e.g. "scrypt" or "pbkdf2:sha256:600000"; hashes made
+    # with other parameters are upgraded on the user's next successful login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = os.getenv("PASSWORD_HASH_WORKERS", "")  # blank = one per CPU, 0 = inline
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 0))  # 0 = 4 per worker
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))
@@ -1,41 +1,54 @@
-import mysql.connector
+# ==============================================================
+# FILE: migrate.py
+# PURPOSE: Apply pending schema migrations (migrations/versions/)
+# USAGE:   python migrate.py [--status] [--target N] [--dry-run]
+# ==============================================================
+
+import argparse
+import sys
+
 from config import Config
-import os
+from models.backend import Error, create_backend
+from migrations.runner import MigrationRunner
+
 
-def run_migration():
-    print("🚀 Running migration...")
+def run_migration(target=None, dry_run=False, status=False):
+    backend = create_backend({k: getattr(Config, k) for k in dir(Config) if k.isupper()})
+    print(f"🚀 Migrating {backend.describe()}...")
 
+    conn = None
     try:
-        # Connect to MySQL server (without selecting DB yet)
-        conn = mysql.connector.connect(
-            host=Config.MYSQL_HOST,
-            user=Config.MYSQL_USER,
-            password=Config.MYSQL_PASSWORD
-        )
-        cursor = conn.cursor()
-
-        # Create database if not exists
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {Config.MYSQL_DB}")
-        cursor.execute(f"USE {Config.MYSQL_DB}")
-
-        # Run the migration SQL
-        sql_path = os.path.join(os.path.dirname(__file__), 'migrations', 'init_db.sql')
-        with open(sql_path, 'r', encoding='utf-8') as f:
-            sql_commands = f.read().split(';')
-
-            for command in sql_commands:
-                command = command.strip()
-                if command:
-                    cursor.execute(command)
-
-        conn.commit()
-        print("✅ Migration completed successfully!")
-    except mysql.connector.Error as err:
+        # Create the database itself if needed (MySQL), then connect to it
+        backend.ensure_database()
+        conn = backend.connect()
+        runner = MigrationRunner(backend, conn)
+
+        if status:
+            for migration, applied_at in runner.status():
+                mark = f"✅ {applied_at}" if applied_at else "⏳ pending"
+                print(f"   {migration.version:04d} {migration.description:<70} {mark}")
+            return True
+
+        applied = runner.upgrade(target=target, dry_run=dry_run)
+        if dry_run:
+            print("📝 Dry run: nothing was applied.")
+        elif applied:
+            print(f"✅ Applied {len(applied)} migration(s).")
+        else:
+            print("✅ Database is up to date.")
+        return True
+    except (Error, RuntimeError) as err:
         print(f"❌ Error: {err}")
+        return False
     finally:
-        if conn.is_connected():
-            cursor.close()
+        if conn is not None:
             conn.close()
 
+
 if __name__ == "__main__":
-    run_migration()
+    parser = argparse.ArgumentParser(description="Apply pending database migrations.")
+    parser.add_argument('--status', action='store_true', help="List migrations and whether they are applied")
+    parser.add_argument('--target', type=int, help="Stop after this version")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would run")
+    args = parser.parse_args()
+    sys.exit(0 if run_migration(args.target, args.dry_run, args.status) else 1)
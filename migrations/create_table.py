@@ -6,218 +6,280 @@
 
 import os
 import sys
-from mysql.connector import connect, Error
 
 # ✅ Import config from root folder
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from config import Config
+from models.backend import Error, create_backend
 
 
-def create_tables():
-    conn = None
+# ==============================================================
+# 🧱 SCHEMA (MySQL DDL; other backends translate it via backend.schema())
+# ==============================================================
+DROP_STATEMENTS = [
+    "SET FOREIGN_KEY_CHECKS = 0;",
+    """
+    DROP TABLE IF EXISTS 
+        audit_logs,
+        grade_stats,
+        student_averages,
+        grades,
+        attendance,
+        subject_teacher,
+        subjects,
+        students,
+        classes,
+        teachers,
+        users;
+    """,
+    "SET FOREIGN_KEY_CHECKS = 1;",
+]
+
+SCHEMA = [
+    # --- USERS ---
+    """
+    CREATE TABLE users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(100) NOT NULL,
+        email VARCHAR(150) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        role ENUM('admin', 'teacher','student') NOT NULL,
+        image VARCHAR(255),
+        status ENUM('active', 'inactive') DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+
+    # --- TEACHERS ---
+    """
+    CREATE TABLE teachers (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        name VARCHAR(150) NOT NULL,
+        email VARCHAR(150) UNIQUE,
+        contact VARCHAR(20),
+        specialization VARCHAR(150),
+        image VARCHAR(255),
+        status ENUM('active', 'inactive') DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE
+    );
+    """,
+
+    # --- CLASSES ---
+    """
+    CREATE TABLE classes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        year INT NOT NULL,
+        teacher_id INT,
+        FOREIGN KEY (teacher_id) REFERENCES teachers(id)
+            ON UPDATE CASCADE
+            ON DELETE SET NULL
+    );
+    """,
+
+    # --- STUDENTS ---
+    """
+    CREATE TABLE students (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(150) NOT NULL,
+        gender ENUM('Male', 'Female', 'Other'),
+        dob DATE,
+        email VARCHAR(150) UNIQUE,
+        contact VARCHAR(20),
+        address TEXT,
+        image VARCHAR(255),
+        class_id INT,
+        status ENUM('active', 'inactive') DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_students_class_status (class_id, status),
+        INDEX idx_students_status_gender (status, gender),
+        FOREIGN KEY (class_id) REFERENCES classes(id)
+            ON UPDATE CASCADE
+            ON DELETE SET NULL
+    );
+    """,
+
+    # --- SUBJECTS ---
+    """
+    CREATE TABLE subjects (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(150) NOT NULL,
+        image VARCHAR(255),
+        class_id INT,
+        FOREIGN KEY (class_id) REFERENCES classes(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE
+    );
+    """,
+
+    # --- SUBJECT_TEACHER ---
+    """
+    CREATE TABLE subject_teacher (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        subject_id INT NOT NULL,
+        teacher_id INT NOT NULL,
+        assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (subject_id) REFERENCES subjects(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE,
+        FOREIGN KEY (teacher_id) REFERENCES teachers(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE,
+        UNIQUE KEY unique_assignment (subject_id, teacher_id)
+    );
+    """,
+
+    # --- ATTENDANCE ---
+    """
+    CREATE TABLE attendance (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        class_id INT NOT NULL,
+        date DATE NOT NULL,
+        status ENUM('Present', 'Absent', 'Late', 'Excused') DEFAULT 'Present',
+        UNIQUE KEY unique_student_date (student_id, date),
+        INDEX idx_attendance_date_keyset (date, id, class_id, student_id, status),
+        INDEX idx_attendance_class_keyset (class_id, date, id, student_id, status),
+        FOREIGN KEY (student_id) REFERENCES students(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE,
+        FOREIGN KEY (class_id) REFERENCES classes(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE
+    );
+    """,
+
+    # --- GRADES ---
+    """
+    CREATE TABLE grades (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        subject_id INT NOT NULL,
+        class_id INT,
+        teacher_id INT,
+        term ENUM('Term 1', 'Term 2', 'Term 3', 'Final') DEFAULT 'Term 1',
+        score DECIMAL(5,2) NOT NULL,
+        grade_letter VARCHAR(2),
+        remarks VARCHAR(255),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY unique_student_subject_term (student_id, subject_id, term),
+        FOREIGN KEY (student_id) REFERENCES students(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE,
+        FOREIGN KEY (subject_id) REFERENCES subjects(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE,
+        FOREIGN KEY (class_id) REFERENCES classes(id)
+            ON UPDATE CASCADE
+            ON DELETE SET NULL,
+        FOREIGN KEY (teacher_id) REFERENCES teachers(id)
+            ON UPDATE CASCADE
+            ON DELETE SET NULL
+    );
+    """,
+
+    # --- GRADE STATS (rollup maintained by GradeModel writes) ---
+    """
+    CREATE TABLE grade_stats (
+        class_id INT NOT NULL,
+        subject_id INT NOT NULL,
+        term VARCHAR(20) NOT NULL,
+        grade_count INT NOT NULL DEFAULT 0,
+        score_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+        score_sq_sum DECIMAL(18,4) NOT NULL DEFAULT 0,
+        count_a INT NOT NULL DEFAULT 0,
+        count_b INT NOT NULL DEFAULT 0,
+        count_c INT NOT NULL DEFAULT 0,
+        count_d INT NOT NULL DEFAULT 0,
+        count_f INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (class_id, subject_id, term)
+    );
+    """,
+
+    # --- STUDENT AVERAGES (per-term + 'All', used for ranking) ---
+    """
+    CREATE TABLE student_averages (
+        student_id INT NOT NULL,
+        term VARCHAR(20) NOT NULL,
+        class_id INT,
+        grade_count INT NOT NULL DEFAULT 0,
+        score_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+        avg_score DECIMAL(7,4),
+        PRIMARY KEY (student_id, term),
+        INDEX idx_student_averages_rank (term, avg_score),
+        INDEX idx_student_averages_class_rank (term, class_id, avg_score),
+        FOREIGN KEY (student_id) REFERENCES students(id)
+            ON UPDATE CASCADE
+            ON DELETE CASCADE
+    );
+    """,
+
+    # --- AUDIT LOGS ---
+    """
+    CREATE TABLE audit_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        action VARCHAR(255) NOT NULL,
+        entity_type VARCHAR(50),
+        entity_id INT,
+        details JSON,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_audit_user (user_id, id),
+        INDEX idx_audit_entity (entity_type, entity_id, id),
+        INDEX idx_audit_action (action, id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+            ON UPDATE CASCADE
+            ON DELETE SET NULL
+    );
+    """,
+]
+
+
+def create_tables(backend=None, conn=None):
+    """
+    Drop and recreate every table. Uses the configured backend (DB_BACKEND)
+    unless one is passed in; pass `conn` to build the schema on an already
+    open connection (e.g. a fresh in-memory SQLite database).
+    """
+    own_conn = conn is None
     cursor = None
 
     try:
-        print("🚀 Connecting to MySQL...")
-
-        conn = connect(
-            host=Config.MYSQL_HOST,
-            user=Config.MYSQL_USER,
-            password=Config.MYSQL_PASSWORD,
-            database=Config.MYSQL_DB
-        )
-
-        if conn.is_connected():
-            cursor = conn.cursor()
-            print("✅ Connected to MySQL successfully!")
-
-            # ==================================================
-            # 🧹 DROP OLD TABLES
-            # ==================================================
-            print("⚙️ Dropping existing tables (if any)...")
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 0;")
-            cursor.execute("""
-                DROP TABLE IF EXISTS 
-                    audit_logs,
-                    grades,
-                    attendance,
-                    subject_teacher,
-                    subjects,
-                    students,
-                    classes,
-                    teachers,
-                    users;
-            """)
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 1;")
-
-            # ==================================================
-            # 🧱 CREATE TABLES
-            # ==================================================
-            print("🧩 Creating tables...")
-
-            # --- USERS ---
-            cursor.execute("""
-            CREATE TABLE users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(100) NOT NULL,
-                email VARCHAR(150) NOT NULL UNIQUE,
-                password_hash VARCHAR(255) NOT NULL,
-                role ENUM('admin', 'teacher','student') NOT NULL,
-                image VARCHAR(255),
-                status ENUM('active', 'inactive') DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """)
-
-            # --- TEACHERS ---
-            cursor.execute("""
-            CREATE TABLE teachers (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                name VARCHAR(150) NOT NULL,
-                email VARCHAR(150) UNIQUE,
-                contact VARCHAR(20),
-                specialization VARCHAR(150),
-                image VARCHAR(255),
-                status ENUM('active', 'inactive') DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE
-            );
-            """)
-
-            # --- CLASSES ---
-            cursor.execute("""
-            CREATE TABLE classes (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL,
-                year INT NOT NULL,
-                teacher_id INT,
-                FOREIGN KEY (teacher_id) REFERENCES teachers(id)
-                    ON UPDATE CASCADE
-                    ON DELETE SET NULL
-            );
-            """)
-
-            # --- STUDENTS ---
-            cursor.execute("""
-            CREATE TABLE students (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(150) NOT NULL,
-                gender ENUM('Male', 'Female', 'Other'),
-                dob DATE,
-                email VARCHAR(150) UNIQUE,
-                contact VARCHAR(20),
-                address TEXT,
-                image VARCHAR(255),
-                class_id INT,
-                status ENUM('active', 'inactive') DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (class_id) REFERENCES classes(id)
-                    ON UPDATE CASCADE
-                    ON DELETE SET NULL
-            );
-            """)
-
-            # --- SUBJECTS ---
-            cursor.execute("""
-            CREATE TABLE subjects (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(150) NOT NULL,
-                image VARCHAR(255),
-                class_id INT,
-                FOREIGN KEY (class_id) REFERENCES classes(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE
-            );
-            """)
-
-            # --- SUBJECT_TEACHER ---
-            cursor.execute("""
-            CREATE TABLE subject_teacher (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                subject_id INT NOT NULL,
-                teacher_id INT NOT NULL,
-                assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (subject_id) REFERENCES subjects(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE,
-                FOREIGN KEY (teacher_id) REFERENCES teachers(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE,
-                UNIQUE KEY unique_assignment (subject_id, teacher_id)
-            );
-            """)
-
-            # --- ATTENDANCE ---
-            cursor.execute("""
-            CREATE TABLE attendance (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                class_id INT NOT NULL,
-                date DATE NOT NULL,
-                status ENUM('Present', 'Absent', 'Late', 'Excused') DEFAULT 'Present',
-                FOREIGN KEY (student_id) REFERENCES students(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE,
-                FOREIGN KEY (class_id) REFERENCES classes(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE
-            );
-            """)
-
-            # --- GRADES ---
-            cursor.execute("""
-            CREATE TABLE grades (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                subject_id INT NOT NULL,
-                class_id INT,
-                teacher_id INT,
-                term ENUM('Term 1', 'Term 2', 'Term 3', 'Final') DEFAULT 'Term 1',
-                score DECIMAL(5,2) NOT NULL,
-                grade_letter VARCHAR(2),
-                remarks VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE,
-                FOREIGN KEY (subject_id) REFERENCES subjects(id)
-                    ON UPDATE CASCADE
-                    ON DELETE CASCADE,
-                FOREIGN KEY (class_id) REFERENCES classes(id)
-                    ON UPDATE CASCADE
-                    ON DELETE SET NULL,
-                FOREIGN KEY (teacher_id) REFERENCES teachers(id)
-                    ON UPDATE CASCADE
-                    ON DELETE SET NULL
-            );
-            """)
-
-            # --- AUDIT LOGS ---
-            cursor.execute("""
-            CREATE TABLE audit_logs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT,
-                action TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-                    ON UPDATE CASCADE
-                    ON DELETE SET NULL
-            );
-      
-            """)
-
-            # ==================================================
-            # ✅ COMMIT CHANGES
-            # ==================================================
-            conn.commit()
-            print("🎉 All tables created successfully with updated constraints!")
+        if backend is None:
+            backend = create_backend({k: getattr(Config, k) for k in dir(Config) if k.isupper()})
+        if own_conn:
+            print(f"🚀 Connecting to {backend.describe()}...")
+            conn = backend.connect()
+            print("✅ Connected successfully!")
+        cursor = conn.cursor()
+
+        # ==================================================
+        # 🧹 DROP OLD TABLES
+        # ==================================================
+        print("⚙️ Dropping existing tables (if any)...")
+        for statement in backend.schema(DROP_STATEMENTS):
+            cursor.execute(statement)
+
+        # ==================================================
+        # 🧱 CREATE TABLES
+        # ==================================================
+        print("🧩 Creating tables...")
+        for statement in backend.schema(SCHEMA):
+            cursor.execute(statement)
+
+        # ==================================================
+        # ✅ COMMIT CHANGES
+        # ==================================================
+        conn.commit()
+        print("🎉 All tables created successfully with updated constraints!")
 
     except Error as e:
-        print(f"❌ MySQL Error: {e}")
+        print(f"❌ Database Error: {e}")
 
     except Exception as e:
         print(f"⚠️ Unexpected Error: {e}")
@@ -225,9 +287,9 @@ def create_tables():
     finally:
         if cursor:
             cursor.close()
-        if conn and conn.is_connected():
+        if own_conn and conn is not None:
             conn.close()
-            print("🔒 MySQL connection closed.")
+            print("🔒 Database connection closed.")
 
 
 # ==============================================================
@@ -0,0 +1,45 @@
+# ==============================================================
+# FILE: migrations/rebuild_grade_stats.py
+# PURPOSE: Recompute the grade_stats and student_averages rollups
+#          from grades and verify grade_stats
+# USAGE:   python migrations/rebuild_grade_stats.py [--verify-only]
+# ==============================================================
+
+import os
+import sys
+
+# ✅ Import project modules from root folder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.pool import get_pool
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
+
+
+def rebuild_grade_stats(verify_only=False):
+    conn = get_pool().checkout()
+    try:
+        if not verify_only:
+            print("🔁 Rebuilding grade_stats from grades...")
+            GradeStatsModel.rebuild(conn)
+            print("🔁 Rebuilding student_averages from grades...")
+            RankModel.rebuild(conn)
+
+        mismatches = GradeStatsModel.verify(conn)
+        if mismatches:
+            print(f"❌ grade_stats differs from grades for {len(mismatches)} key(s):")
+            for class_id, subject_id, term in mismatches[:20]:
+                print(f"   class={class_id} subject={subject_id} term={term}")
+            return False
+
+        print("✅ grade_stats matches grades.")
+        return True
+    finally:
+        conn.close()
+
+
+# ==============================================================
+# MAIN EXECUTION
+# ==============================================================
+if __name__ == "__main__":
+    ok = rebuild_grade_stats(verify_only='--verify-only' in sys.argv)
+    sys.exit(0 if ok else 1)
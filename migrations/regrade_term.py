@@ -0,0 +1,44 @@
+# ==============================================================
+# FILE: migrations/regrade_term.py
+# PURPOSE: Re-apply the active grading scale to every grade in a term
+# USAGE:   python migrations/regrade_term.py "Term 1" [--batch-size 1000]
+# ==============================================================
+
+import os
+import sys
+import time
+
+# ✅ Import project modules from root folder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.pool import get_pool
+from models.grade_model import GradeModel
+from models.grade_stats_model import GradeStatsModel
+
+
+def regrade_term(term, batch_size=1000):
+    conn = get_pool().checkout()
+    try:
+        print(f"🔁 Regrading '{term}' with the active grading scale...")
+        started = time.perf_counter()
+        changed = GradeModel.regrade_term(conn, term, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"✅ {changed} grade(s) updated in {elapsed:.2f}s")
+
+        # Band cut-offs may have moved, so the A-F rollup buckets are recomputed too
+        GradeStatsModel.rebuild(conn)
+        print("✅ grade_stats rebuilt.")
+    finally:
+        conn.close()
+
+
+# ==============================================================
+# MAIN EXECUTION
+# ==============================================================
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('Usage: python migrations/regrade_term.py "Term 1" [--batch-size N]')
+        sys.exit(1)
+    size = 1000
+    if '--batch-size' in sys.argv:
+        size = int(sys.argv[sys.argv.index('--batch-size') + 1])
+    regrade_term(sys.argv[1], batch_size=size)
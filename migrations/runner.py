@@ -0,0 +1,305 @@
+# ==============================================================
+# FILE: migrations/runner.py
+# PURPOSE: Versioned, incremental schema migrations (tracked in schema_migrations)
+# ==============================================================
+#
+# Migrations live in migrations/versions/NNNN_description.py. Each module has a
+# docstring (shown in `migrate.py --status`) and an upgrade(ctx) function;
+# ctx is a MigrationContext. Set TRANSACTIONAL = False in a module that must
+# commit as it goes (batched backfills).
+#
+# Where the engine has transactional DDL (SQLite) a migration and its
+# schema_migrations row commit together. MySQL commits implicitly on every
+# DDL statement, so migrations are written to be re-runnable: ensure_index()
+# and add_column() skip work that is already done.
+
+import importlib.util
+import os
+import re
+import time
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'versions')
+LOCK_NAME = 'student_management.schema_migrations'
+
+SCHEMA_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INT
+)
+"""
+
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f"migration_{self.version:04d}", self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    @property
+    def description(self):
+        doc = (self.module.__doc__ or '').strip()
+        return doc.splitlines()[0] if doc else self.name.replace('_', ' ')
+
+    @property
+    def transactional(self):
+        return getattr(self.module, 'TRANSACTIONAL', True)
+
+
+def discover(directory=VERSIONS_DIR):
+    """Return every migration in version order."""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration version in {directory}")
+    return migrations
+
+
+# ==============================================================
+# 🔹 What a migration's upgrade(ctx) gets
+# ==============================================================
+class MigrationContext:
+    def __init__(self, backend, conn, log=print):
+        self.backend = backend
+        self.conn = conn
+        self.log = log
+
+    def execute(self, sql, params=()):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else []
+        finally:
+            cursor.close()
+
+    def _introspect(self, method, *args):
+        cursor = self.conn.cursor()
+        try:
+            return getattr(self.backend, method)(cursor, *args)
+        finally:
+            cursor.close()
+
+    def table_exists(self, table):
+        return self._introspect('table_exists', table)
+
+    def columns(self, table):
+        return self._introspect('columns', table)
+
+    def indexes(self, table, unique_only=False):
+        return self._introspect('indexes', table, unique_only)
+
+    def create_tables(self, statements):
+        """Run CREATE TABLE statements (MySQL DDL) for tables that do not exist yet."""
+        for statement in statements:
+            table = re.search(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)', statement, re.I).group(1)
+            if self.table_exists(table):
+                continue
+            for translated in self.backend.schema([statement]):
+                self.execute(translated)
+            self.log(f"   ➕ table {table}")
+
+    def add_column(self, table, column, definition):
+        """ALTER TABLE ... ADD COLUMN unless the column exists. `definition` is MySQL DDL."""
+        if column in self.columns(table):
+            return False
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        self.log(f"   ➕ column {table}.{column}")
+        return True
+
+    def ensure_index(self, table, name, columns, unique=False):
+        """
+        Create an index unless one with that name exists, or (non-unique only)
+        an existing index already starts with `columns`, which serves the same
+        lookups, or (unique) a unique index on exactly `columns` exists under
+        another name (e.g. SQLite's sqlite_autoindex_* for an inline UNIQUE
+        KEY). A redundant index would only slow down writes.
+        """
+        columns = list(columns)
+        existing = self.indexes(table)
+        if name in existing:
+            return False
+        if unique:
+            for other, other_columns in self.indexes(table, unique_only=True).items():
+                if [c.lower() for c in other_columns] == [c.lower() for c in columns]:
+                    self.log(f"   ✔️ {table}({', '.join(columns)}) already unique by {other}")
+                    return False
+        else:
+            for other, other_columns in existing.items():
+                if [c.lower() for c in other_columns[:len(columns)]] == [c.lower() for c in columns]:
+                    self.log(f"   ✔️ {table}({', '.join(columns)}) already covered by {other}")
+                    return False
+        started = time.perf_counter()
+        self.execute(self.backend.create_index_sql(table, name, columns, unique=unique))
+        self.log(f"   ➕ index {name} on {table}({', '.join(columns)}) "
+                 f"in {time.perf_counter() - started:.1f}s")
+        return True
+
+    def drop_index(self, table, name):
+        """Drop an index if it exists (e.g. one superseded by a wider index)."""
+        if name not in self.indexes(table):
+            return False
+        self.execute(self.backend.drop_index_sql(table, name))
+        self.log(f"   ➖ index {name} on {table}")
+        return True
+
+    def delete_duplicates(self, table, columns, batch_size=1000, pause=0.05, key='id'):
+        """
+        Delete rows that repeat another row's `columns`, keeping the newest
+        (highest `key`) of each group, so a unique index can be built on
+        `columns`. Rows with a NULL in `columns` are left alone (a unique
+        index allows them). Deletes run in batches of `batch_size` ids, each
+        its own transaction. Safe to re-run; returns the number of rows deleted.
+        """
+        match = ' AND '.join(f"t.{c} = d.{c}" for c in columns)
+        not_null = ' AND '.join(f"{c} IS NOT NULL" for c in columns)
+        ids = [row[0] for row in self.execute(f"""
+            SELECT t.{key}
+            FROM {table} t
+            JOIN (
+                SELECT {', '.join(columns)}, MAX({key}) AS keep_id
+                FROM {table}
+                WHERE {not_null}
+                GROUP BY {', '.join(columns)}
+                HAVING COUNT(*) > 1
+            ) AS d ON {match}
+            WHERE t.{key} < d.keep_id
+        """)]
+        if not ids:
+            return 0
+        cursor = self.conn.cursor()
+        try:
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                self.conn.commit()
+                if pause:
+                    time.sleep(pause)
+        finally:
+            cursor.close()
+        self.log(f"   🧹 deleted {len(ids):,} duplicate {table} row(s) on ({', '.join(columns)})")
+        return len(ids)
+
+    def backfill(self, table, set_clause, where='1 = 1', params=(), batch_size=1000, pause=0.05,
+                 key='id'):
+        """
+        Online backfill: UPDATE `table` SET <set_clause> WHERE <where> in
+        primary-key ranges of `batch_size` rows (`params` fill the placeholders
+        in `where`). Each batch is its own short transaction, with a `pause`
+        between batches so replication and live traffic keep up. Safe to
+        re-run; returns the number of rows changed.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+            low, high = cursor.fetchone()
+            if low is None:
+                return 0
+            changed = 0
+            started = time.perf_counter()
+            for start in range(low, high + 1, batch_size):
+                cursor.execute(
+                    f"UPDATE {table} SET {set_clause} WHERE {key} BETWEEN %s AND %s AND ({where})",
+                    (start, start + batch_size - 1, *params)
+                )
+                changed += max(cursor.rowcount, 0)
+                self.conn.commit()
+                if pause:
+                    time.sleep(pause)
+            self.log(f"   🔁 backfilled {changed:,} {table} row(s) in {time.perf_counter() - started:.1f}s")
+            return changed
+        finally:
+            cursor.close()
+
+
+# ==============================================================
+# 🔹 Runner
+# ==============================================================
+class MigrationRunner:
+    def __init__(self, backend, conn, migrations=None, log=print):
+        self.backend = backend
+        self.conn = conn
+        self.migrations = discover() if migrations is None else migrations
+        self.log = log
+
+    def _ensure_schema_table(self):
+        cursor = self.conn.cursor()
+        try:
+            for statement in self.backend.schema([SCHEMA_TABLE]):
+                cursor.execute(statement)
+            self.conn.commit()
+        finally:
+            cursor.close()
+
+    def applied(self):
+        """Return {version: applied_at}."""
+        self._ensure_schema_table()
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT version, applied_at FROM schema_migrations ORDER BY version")
+            return dict(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def pending(self, target=None):
+        done = self.applied()
+        return [m for m in self.migrations
+                if m.version not in done and (target is None or m.version <= target)]
+
+    def status(self):
+        done = self.applied()
+        return [(m, done.get(m.version)) for m in self.migrations]
+
+    def upgrade(self, target=None, dry_run=False):
+        """Apply pending migrations in order; returns the versions applied."""
+        cursor = self.conn.cursor()
+        if not self.backend.acquire_lock(cursor, LOCK_NAME):
+            cursor.close()
+            raise RuntimeError("Another migration run holds the lock; try again when it finishes.")
+        try:
+            applied = []
+            for migration in self.pending(target):
+                self.log(f"⚙️ {migration.version:04d} {migration.description}")
+                if dry_run:
+                    continue
+                self._apply(migration)
+                applied.append(migration.version)
+            return applied
+        finally:
+            self.backend.release_lock(cursor, LOCK_NAME)
+            cursor.close()
+
+    def _apply(self, migration):
+        ctx = MigrationContext(self.backend, self.conn, log=self.log)
+        in_transaction = migration.transactional and self.backend.transactional_ddl
+        started = time.perf_counter()
+        try:
+            if in_transaction:
+                self.conn.start_transaction()
+            migration.module.upgrade(ctx)
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            ctx.execute("INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s)",
+                        (migration.version, migration.name, duration_ms))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            if not in_transaction:
+                self.log("   ⚠️ This engine cannot roll back DDL; steps already run stay applied. "
+                         "The migration skips them when re-run.")
+            raise
+        self.log(f"   ✅ done in {duration_ms} ms")
@@ -0,0 +1,8 @@
+"""Index attendance for class/day lookups and per-student history."""
+
+
+def upgrade(ctx):
+    # Attendance page and roster marking: WHERE class_id = ? AND date BETWEEN ...
+    ctx.ensure_index('attendance', 'idx_attendance_class_date', ['class_id', 'date'])
+    # Student summaries: WHERE student_id = ? [AND date ...]
+    ctx.ensure_index('attendance', 'idx_attendance_student_date', ['student_id', 'date'])
@@ -0,0 +1,8 @@
+"""Index grades for per-student term reports and class/subject gradebooks."""
+
+
+def upgrade(ctx):
+    # Student report card and rank rebuilds: WHERE student_id = ? AND term = ?
+    ctx.ensure_index('grades', 'idx_grades_student_term', ['student_id', 'term'])
+    # Gradebook and grade_stats rebuilds: WHERE class_id = ? AND subject_id = ?
+    ctx.ensure_index('grades', 'idx_grades_class_subject', ['class_id', 'subject_id'])
@@ -0,0 +1,8 @@
+"""Index students by class and status, and users by role."""
+
+
+def upgrade(ctx):
+    # Rosters and the students list filter: WHERE class_id = ? AND status = 'active'
+    ctx.ensure_index('students', 'idx_students_class_status', ['class_id', 'status'])
+    # Dashboard counts and user management: WHERE role = ?
+    ctx.ensure_index('users', 'idx_users_role', ['role'])
@@ -0,0 +1,25 @@
+"""Give older audit_logs tables the structured columns AuditWriter writes."""
+
+# The backfill commits per batch, so this migration cannot be one transaction
+TRANSACTIONAL = False
+
+
+def upgrade(ctx):
+    ctx.add_column('audit_logs', 'entity_type', 'VARCHAR(50)')
+    ctx.add_column('audit_logs', 'entity_id', 'INT')
+    ctx.add_column('audit_logs', 'details', 'JSON')
+
+    # action was a nullable TEXT column; it becomes VARCHAR(255) NOT NULL so it
+    # can be indexed. Fill the gaps first, in small batches, while the app runs.
+    ctx.backfill('audit_logs', "action = 'unknown'", where="action IS NULL")
+    if ctx.backend.name == 'mysql':
+        (data_type, nullable), = ctx.execute("""
+            SELECT data_type, is_nullable FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = 'audit_logs' AND column_name = 'action'
+        """)
+        if data_type.lower() != 'varchar' or nullable == 'YES':
+            ctx.execute("ALTER TABLE audit_logs MODIFY action VARCHAR(255) NOT NULL")
+
+    ctx.ensure_index('audit_logs', 'idx_audit_user', ['user_id', 'id'])
+    ctx.ensure_index('audit_logs', 'idx_audit_entity', ['entity_type', 'entity_id', 'id'])
+    ctx.ensure_index('audit_logs', 'idx_audit_action', ['action', 'id'])
@@ -0,0 +1,15 @@
+"""Make the attendance covering indexes follow the (date, id) keyset order."""
+
+
+def upgrade(ctx):
+    # Pages and exports read ORDER BY a.date DESC, a.id DESC. With id right
+    # after date (class_id, date for one class) the index returns rows in that
+    # order, so a page stops after LIMIT rows instead of sorting the range
+    ctx.ensure_index('attendance', 'idx_attendance_date_keyset',
+                     ['date', 'id', 'class_id', 'student_id', 'status'])
+    ctx.ensure_index('attendance', 'idx_attendance_class_keyset',
+                     ['class_id', 'date', 'id', 'student_id', 'status'])
+    # The previous covering indexes are superseded; dropped only once the
+    # replacements exist (class_id keeps an index for its foreign key)
+    ctx.drop_index('attendance', 'idx_attendance_date_cover')
+    ctx.drop_index('attendance', 'idx_attendance_class_date_cover')
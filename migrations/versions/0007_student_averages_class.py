@@ -0,0 +1,15 @@
+"""Keep each student's class on student_averages so class/year ranks use an index."""
+
+# The backfill commits per batch, so this migration cannot be one transaction
+TRANSACTIONAL = False
+
+
+def upgrade(ctx):
+    ctx.add_column('student_averages', 'class_id', 'INT')
+
+    # Class and year ranks count (term, class_id, avg_score >= mine) instead of
+    # every student in the term
+    ctx.backfill('student_averages',
+                 "class_id = (SELECT class_id FROM students WHERE students.id = student_averages.student_id)",
+                 where="class_id IS NULL", key='student_id')
+    ctx.ensure_index('student_averages', 'idx_student_averages_class_rank', ['term', 'class_id', 'avg_score'])
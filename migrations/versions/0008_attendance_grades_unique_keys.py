@@ -0,0 +1,25 @@
+"""Add the attendance and grades unique keys that the upserts conflict on."""
+
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
+
+# Duplicates are deleted in committed batches before the unique indexes build
+TRANSACTIONAL = False
+
+
+def upgrade(ctx):
+    # mark_attendance_bulk and save_gradebook are INSERT ... ON DUPLICATE KEY
+    # UPDATE on these keys; without them every re-save added another row.
+    # Keep the newest row of each key, then make the key unique.
+    ctx.delete_duplicates('attendance', ['student_id', 'date'])
+    ctx.ensure_index('attendance', 'unique_student_date', ['student_id', 'date'], unique=True)
+
+    removed = ctx.delete_duplicates('grades', ['student_id', 'subject_id', 'term'])
+    ctx.ensure_index('grades', 'unique_student_subject_term', ['student_id', 'subject_id', 'term'],
+                     unique=True)
+
+    # The rollups counted the duplicate grades; recompute them from what is left
+    if removed:
+        GradeStatsModel.rebuild(ctx.conn)
+        RankModel.rebuild(ctx.conn)
+        ctx.log("   🔁 rebuilt grade_stats and student_averages")
@@ -4,27 +4,36 @@
 # AUTHOR: Chandy Neat
 # ==============================================================
 
-import mysql.connector
-from mysql.connector import Error
-from config import Config
+import heapq
+import itertools
+import logging
+from models.backend import Error
+from models.pool import get_pool
+from models.db import get_db, stream_rows
+from models.audit_model import audit
+from models.unit_of_work import current_scope
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 
 class AttendanceModel:
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+
     # --------------------------------------------------------------
-    # ✅ Helper: Connect to Database
+    # ✅ Helper: Borrow a connection from the shared pool
+    #    (conn.close() returns it to the pool). Inside a unit of work
+    #    the request's connection is joined instead.
     # --------------------------------------------------------------
     @staticmethod
     def get_connection():
         try:
-            conn = mysql.connector.connect(
-                host=Config.MYSQL_HOST,
-                user=Config.MYSQL_USER,
-                password=Config.MYSQL_PASSWORD,
-                database=Config.MYSQL_DB
-            )
-            return conn
+            if current_scope() is not None:
+                return get_db()
+            return get_pool().checkout()
         except Error as e:
-            print(f"❌ Database connection error: {e}")
+            logger.error(f"❌ Database connection error: {e}")
             return None
 
     # --------------------------------------------------------------
@@ -36,7 +45,7 @@ class AttendanceModel:
         if not conn:
             return []
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute("""
             SELECT 
                 a.id, 
@@ -49,11 +58,119 @@ class AttendanceModel:
             JOIN classes c ON a.class_id = c.id
             ORDER BY a.date DESC;
         """)
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         conn.close()
         return data
 
+    # --------------------------------------------------------------
+    # ✅ Get one page of attendance within a date range
+    #    Keyset pagination on (date, id), newest first.
+    #    after: (date, id) of the last row on the previous page
+    # --------------------------------------------------------------
+    @staticmethod
+    def get_attendance_page(date_from, date_to, class_ids=None, after=None, limit=DEFAULT_PAGE_SIZE):
+        limit = max(1, min(int(limit or AttendanceModel.DEFAULT_PAGE_SIZE), AttendanceModel.MAX_PAGE_SIZE))
+        if class_ids is not None and not class_ids:
+            return [], None
+
+        conn = AttendanceModel.get_connection()
+        if not conn:
+            return [], None
+
+        def branch(class_id=None):
+            # Rows of one class (or all classes) in keyset order: served straight
+            # from idx_attendance_class_keyset / idx_attendance_date_keyset
+            conditions = ["date BETWEEN %s AND %s"]
+            params = [date_from, date_to]
+            if class_id is not None:
+                conditions.insert(0, "class_id = %s")
+                params.insert(0, class_id)
+            if after:
+                after_date, after_id = after
+                conditions.append("(date < %s OR (date = %s AND id < %s))")
+                params.extend([after_date, after_date, after_id])
+            return f"""
+                SELECT id, student_id, class_id, date, status
+                FROM attendance
+                WHERE {' AND '.join(conditions)}
+                ORDER BY date DESC, id DESC
+                LIMIT %s
+            """, params + [limit + 1]
+
+        # Several classes: take the first page of each class from its index and
+        # merge, so the final sort sees at most len(class_ids) * (limit + 1) rows
+        # instead of every row of those classes in the date range
+        branches = [branch(cid) for cid in class_ids] if class_ids else [branch()]
+        source = " UNION ALL ".join(f"SELECT * FROM ({sql}) AS p{i}" for i, (sql, _) in enumerate(branches))
+        params = [value for _, branch_params in branches for value in branch_params] + [limit + 1]
+
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT 
+                a.id, 
+                s.name AS student_name, 
+                c.name AS class_name, 
+                a.date, 
+                a.status
+            FROM ({source}) AS a
+            JOIN students s ON a.student_id = s.id
+            JOIN classes c ON a.class_id = c.id
+            ORDER BY a.date DESC, a.id DESC
+            LIMIT %s;
+        """, tuple(params))
+        data = fetch_rows(cursor)
+        cursor.close()
+        conn.close()
+
+        next_cursor = None
+        if len(data) > limit:
+            data = data[:limit]
+            next_cursor = (data[-1]['date'], data[-1]['id'])
+        return data, next_cursor
+
+    # --------------------------------------------------------------
+    # ✅ Stream every attendance row in a date range (exports)
+    #    Same filters and order as get_attendance_page, no LIMIT
+    #    (grouped by class beyond EXPORT_MERGE_MAX_CLASSES classes);
+    #    rows come off an unbuffered cursor as tuples (EXPORT_HEADER)
+    # --------------------------------------------------------------
+    EXPORT_HEADER = ('ID', 'Date', 'Student', 'Class', 'Status')
+
+    # Up to this many classes are merged into one (date, id) order; each open
+    # stream holds a pooled connection. Larger selections come class by class.
+    EXPORT_MERGE_MAX_CLASSES = 4
+
+    @staticmethod
+    def iter_export(date_from, date_to, class_ids=None):
+        if class_ids is not None and not class_ids:
+            return iter(())
+
+        def stream(class_id=None):
+            # One index-ordered scan (idx_attendance_date_keyset, or
+            # idx_attendance_class_keyset for a class): rows leave MySQL as
+            # they are read, with no filesort of the range in front of them
+            conditions = ["a.date BETWEEN %s AND %s"]
+            params = [date_from, date_to]
+            if class_id is not None:
+                conditions.insert(0, "a.class_id = %s")
+                params.insert(0, class_id)
+            return stream_rows(f"""
+                SELECT a.id, a.date, s.name AS student_name, c.name AS class_name, a.status
+                FROM attendance a
+                JOIN students s ON a.student_id = s.id
+                JOIN classes c ON a.class_id = c.id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY a.date DESC, a.id DESC
+            """, tuple(params))
+
+        if not class_ids:
+            return stream()
+        streams = [stream(class_id) for class_id in class_ids]
+        if len(streams) > AttendanceModel.EXPORT_MERGE_MAX_CLASSES:
+            return itertools.chain.from_iterable(streams)
+        return heapq.merge(*streams, key=lambda row: (row[1], row[0]), reverse=True)
+
     # --------------------------------------------------------------
     # ✅ Get attendance by class
     # --------------------------------------------------------------
@@ -63,7 +180,7 @@ class AttendanceModel:
         if not conn:
             return []
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute("""
             SELECT 
                 a.id,
@@ -77,7 +194,7 @@ class AttendanceModel:
             WHERE a.class_id = %s
             ORDER BY a.date DESC;
         """, (class_id,))
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         conn.close()
         return data
@@ -91,50 +208,54 @@ class AttendanceModel:
         if not conn:
             return []
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute("""
             SELECT id, name 
             FROM students 
             WHERE class_id = %s AND status = 'active';
         """, (class_id,))
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         conn.close()
         return data
 
     # --------------------------------------------------------------
-    # ✅ Mark attendance (insert or update)
+    # ✅ Mark attendance for a whole class roster in one round trip
+    #    records: iterable of (student_id, status)
     # --------------------------------------------------------------
     @staticmethod
-    def mark_attendance(student_id, class_id, date, status):
+    def mark_attendance_bulk(class_id, date, records):
+        rows = [(student_id, class_id, date, status) for student_id, status in records]
+        if not rows:
+            return 0
+
         conn = AttendanceModel.get_connection()
         if not conn:
-            return
+            return 0
 
-        cursor = conn.cursor()
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        params = [value for row in rows for value in row]
 
-        # Check if attendance exists for this student & date
-        cursor.execute("""
-            SELECT id FROM attendance 
-            WHERE student_id = %s AND date = %s;
-        """, (student_id, date))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE attendance 
-                SET status = %s, class_id = %s
-                WHERE student_id = %s AND date = %s;
-            """, (status, class_id, student_id, date))
-        else:
-            cursor.execute("""
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
                 INSERT INTO attendance (student_id, class_id, date, status)
-                VALUES (%s, %s, %s, %s);
-            """, (student_id, class_id, date, status))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
+                VALUES {placeholders}
+                ON DUPLICATE KEY UPDATE
+                    status = VALUES(status),
+                    class_id = VALUES(class_id);
+            """, params)
+            conn.commit()
+        except Error as e:
+            conn.rollback()
+            logger.error(f"❌ Error marking attendance: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        # After the write's try: an audit failure must not roll back committed rows
+        audit('attendance.mark', 'class', class_id, {'date': date, 'students': len(rows)})
+        return len(rows)
 
     # --------------------------------------------------------------
     # ✅ Get attendance summary for a student
@@ -0,0 +1,315 @@
+# ==============================================================
+# FILE: models/audit_model.py
+# PURPOSE: Audit trail — batched background writer and paged reads
+# ==============================================================
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import has_request_context, session
+
+from models.backend import IntegrityError
+from models.db import get_db
+from models.pool import get_pool
+from models.unit_of_work import on_commit
+
+logger = logging.getLogger(__name__)
+
+# Durability modes:
+#   async - enqueue and return; events are dropped (and counted) if the queue is full
+#   block - enqueue, waiting up to AUDIT_BLOCK_TIMEOUT for space when the queue is full
+#   sync  - insert in the caller's thread before returning (durable, adds one INSERT)
+DURABILITY_MODES = ('async', 'block', 'sync')
+
+_COLUMNS = ('user_id', 'action', 'entity_type', 'entity_id', 'details', 'timestamp')
+
+
+class AuditWriter:
+    """
+    Collects audit events in a bounded in-memory queue; one background thread
+    writes them to `audit_logs` as multi-row INSERTs of up to `batch_size`,
+    at least every `flush_interval` seconds. Pending events are flushed at
+    interpreter exit. A batch rejected by a constraint is rewritten row by
+    row, so one bad event does not cost the rest of the batch.
+    """
+
+    def __init__(self, durability='async', batch_size=200, flush_interval=1.0,
+                 max_queue=10000, block_timeout=2.0, retries=3):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown audit durability mode: {durability}")
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.retries = retries
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0, 'orphaned': 0}
+
+    # ------------------------
+    # ✍️ RECORD
+    # ------------------------
+    def record(self, action, entity_type=None, entity_id=None, details=None, user_id=None):
+        """Queue one event; the acting user defaults to the logged-in session user."""
+        if user_id is None and has_request_context():
+            user_id = session.get('user_id')
+        event = (
+            user_id,
+            action,
+            entity_type,
+            entity_id,
+            json.dumps(details, default=str) if details is not None else None,
+            datetime.now(),
+        )
+
+        if self.durability == 'sync':
+            self._write([event])
+            return True
+
+        self._ensure_thread()
+        try:
+            if self.durability == 'block':
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            self._bump('dropped')
+            logger.warning("⚠️ Audit queue full; dropped event %s", action)
+            return False
+        self._bump('enqueued')
+        return True
+
+    # ------------------------
+    # 🔧 Background flushing
+    # ------------------------
+    def _ensure_thread(self):
+        # Threads do not survive fork (gunicorn --preload), so restart per process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+
+    def _drain(self, first):
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _write(self, batch):
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(batch))
+        sql = f"INSERT INTO audit_logs ({', '.join(_COLUMNS)}) VALUES {placeholders}"
+        params = [v for event in batch for v in event]
+
+        for attempt in range(1, self.retries + 1):
+            conn = None
+            try:
+                conn = get_pool().checkout()
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, params)
+                    conn.commit()
+                finally:
+                    cursor.close()
+                self._bump('written', len(batch))
+                self._bump('batches')
+                return
+            except IntegrityError as e:
+                # Retrying the same rows cannot succeed; split them up below
+                rejected = e
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    self._bump('failed', len(batch))
+                    logger.error("❌ Could not write %s audit event(s): %s", len(batch), e)
+                    if self.durability == 'sync':
+                        raise
+                    return
+                time.sleep(0.1 * 2 ** attempt)
+            finally:
+                if conn is not None:
+                    conn.close()
+        self._isolate(batch, rejected)
+
+    def _isolate(self, batch, error):
+        """
+        Write a constraint-rejected batch one event at a time. An event whose
+        user has been deleted since it was recorded (the user_id foreign key)
+        is kept without its user, as ON DELETE SET NULL would have left it.
+        """
+        if len(batch) > 1:
+            for event in batch:
+                self._write([event])
+            return
+        event = batch[0]
+        if event[0] is not None:
+            self._bump('orphaned')
+            logger.warning("⚠️ Audit event %s: user %s rejected (%s); storing it without a user",
+                           event[1], event[0], error)
+            self._write([(None, *event[1:])])
+            return
+        self._bump('failed')
+        logger.error("❌ Could not write audit event %s: %s", event[1], error)
+        if self.durability == 'sync':
+            raise error
+
+    def flush(self, timeout=5.0):
+        """Stop the writer after it has drained the queue (used at shutdown)."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout)
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(pending), self.batch_size):
+            self._write(pending[start:start + self.batch_size])
+
+    def _bump(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def stats(self):
+        with self._stats_lock:
+            return {'durability': self.durability, 'queued': self._queue.qsize(), **self._stats}
+
+
+# ==============================================================
+# 🔹 Process-wide writer
+# ==============================================================
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _writer_from(config):
+    return AuditWriter(
+        durability=config.get('AUDIT_DURABILITY', 'async'),
+        batch_size=int(config.get('AUDIT_BATCH_SIZE', 200)),
+        flush_interval=float(config.get('AUDIT_FLUSH_INTERVAL', 1.0)),
+        max_queue=int(config.get('AUDIT_QUEUE_SIZE', 10000)),
+        block_timeout=float(config.get('AUDIT_BLOCK_TIMEOUT', 2.0)),
+    )
+
+
+def configure_audit(config):
+    """(Re)build the shared writer from app.config, flushing the previous one."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.flush()
+        _writer = _writer_from(config)
+    return _writer
+
+
+def get_audit_writer():
+    """Return the shared writer, building it from Config on first use."""
+    global _writer
+    if _writer is None:
+        from config import Config
+        with _writer_lock:
+            if _writer is None:
+                _writer = _writer_from({k: getattr(Config, k) for k in dir(Config) if k.isupper()})
+    return _writer
+
+
+def audit(action, entity_type=None, entity_id=None, details=None, user_id=None):
+    """
+    Record an audit event, e.g. audit('grade.update', 'grade', 12, {'from': 70, 'to': 75}).
+    Inside a unit of work the event is recorded when it commits, and not at all on rollback.
+    """
+    if user_id is None and has_request_context():
+        user_id = session.get('user_id')
+    writer = get_audit_writer()
+    return on_commit(lambda: writer.record(action, entity_type, entity_id, details, user_id))
+
+
+@atexit.register
+def _flush_at_exit():
+    if _writer is not None:
+        _writer.flush()
+
+
+# ==============================================================
+# 🔹 Reading the log
+# ==============================================================
+class AuditModel:
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    @staticmethod
+    def get_page(after_id=None, user_id=None, action=None, entity_type=None, entity_id=None,
+                 limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of audit events, newest first, using keyset pagination on id.
+        `action` matches a prefix ('grade.' -> every grade action).
+        Returns (events, next_cursor); next_cursor is None on the last page.
+        """
+        limit = max(1, min(int(limit or AuditModel.DEFAULT_PAGE_SIZE), AuditModel.MAX_PAGE_SIZE))
+
+        conditions = []
+        params = []
+        if after_id:
+            conditions.append("a.id < %s")
+            params.append(after_id)
+        if user_id:
+            conditions.append("a.user_id = %s")
+            params.append(user_id)
+        if action:
+            conditions.append("a.action LIKE %s")
+            params.append(action.replace('%', r'\%').replace('_', r'\_') + '%')
+        if entity_type:
+            conditions.append("a.entity_type = %s")
+            params.append(entity_type)
+            if entity_id:
+                conditions.append("a.entity_id = %s")
+                params.append(entity_id)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit + 1)
+
+        db = get_db()
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT a.id, a.user_id, u.username, a.action, a.entity_type, a.entity_id,
+                   a.details, a.timestamp
+            FROM audit_logs a
+            LEFT JOIN users u ON a.user_id = u.id
+            {where}
+            ORDER BY a.id DESC
+            LIMIT %s
+        """, tuple(params))
+        events = cursor.fetchall()
+        cursor.close()
+
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = events[-1]['id']
+        return events, next_cursor
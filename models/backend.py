@@ -0,0 +1,88 @@
+# ==============================================================
+# FILE: models/backend.py
+# PURPOSE: Storage backend interface (MySQL in production, SQLite embedded)
+# ==============================================================
+
+from importlib import import_module
+
+# Both backends raise mysql.connector's exception classes, so models keep
+# catching one hierarchy whatever engine is underneath.
+from mysql.connector import DatabaseError, Error, IntegrityError, OperationalError, ProgrammingError
+
+BACKENDS = {
+    'mysql': ('models.mysql_backend', 'MySQLBackend'),
+    'sqlite': ('models.sqlite_backend', 'SQLiteBackend'),
+}
+
+
+class Backend:
+    """
+    What the connection pool and the schema tools need from an engine.
+
+    Connections returned by connect() speak the subset of the
+    mysql.connector API the models use: cursor(dictionary=..., buffered=...),
+    execute/executemany with %s placeholders, fetchone/fetchmany/fetchall,
+    lastrowid, commit, rollback, in_transaction, ping and close.
+    """
+
+    name = None
+
+    def connect(self):
+        raise NotImplementedError
+
+    def is_alive(self, raw):
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def schema(self, statements):
+        """Turn the MySQL DDL in migrations/create_table.py into statements for this engine."""
+        return list(statements)
+
+    # ------------------------
+    # 🧭 Introspection / DDL helpers (used by the migration runner)
+    # ------------------------
+    # Whether CREATE/ALTER can be rolled back (MySQL commits implicitly on DDL)
+    transactional_ddl = False
+
+    def ensure_database(self):
+        """Create the target database if the engine needs that done separately."""
+
+    def table_exists(self, cursor, table):
+        raise NotImplementedError
+
+    def columns(self, cursor, table):
+        """Return the set of column names of `table`."""
+        raise NotImplementedError
+
+    def indexes(self, cursor, table, unique_only=False):
+        """Return {index_name: [column, ...]} in index order, primary key excluded."""
+        raise NotImplementedError
+
+    def create_index_sql(self, table, name, columns, unique=False):
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        return f"CREATE {kind} {name} ON {table} ({', '.join(columns)})"
+
+    def drop_index_sql(self, table, name):
+        return f"DROP INDEX {name}"
+
+    def acquire_lock(self, cursor, name, timeout=30):
+        """Take a named advisory lock (one migration runner at a time); True if held."""
+        return True
+
+    def release_lock(self, cursor, name):
+        pass
+
+    def describe(self):
+        return self.name
+
+
+def create_backend(config):
+    """Build the backend named by DB_BACKEND ('mysql' or 'sqlite') from a config mapping."""
+    name = (config.get('DB_BACKEND') or 'mysql').lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DB_BACKEND '{name}' (choose from {', '.join(BACKENDS)})")
+    module, cls = BACKENDS[name]
+    return getattr(import_module(module), cls).from_config(config)
@@ -0,0 +1,69 @@
+# ==============================================================
+# FILE: models/cache.py
+# PURPOSE: In-process TTL cache for expensive read-only aggregates
+# ==============================================================
+
+import threading
+import time
+
+from config import Config
+from models.unit_of_work import on_commit
+
+
+class TTLCache:
+    """
+    Small thread-safe TTL cache keyed by string.
+
+    Entries expire after `ttl` seconds and can be dropped early with
+    invalidate(prefix). Each invalidation bumps a generation counter so a
+    value computed before a write is never stored after that write.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get_or_set(self, key, loader, ttl=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._stats['hits'] += 1
+                return entry[1]
+            self._stats['misses'] += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        return value
+
+    def invalidate(self, prefix=''):
+        """Drop every key starting with `prefix` (everything by default)."""
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data), **self._stats}
+
+
+# ==============================================================
+# 🔹 Dashboard aggregate cache
+# ==============================================================
+dashboard_cache = TTLCache(ttl=Config.DASHBOARD_CACHE_TTL)
+
+
+def invalidate_dashboard():
+    """Called by model write methods whose data feeds dashboard aggregates."""
+    # Inside a unit of work, wait for the commit so a concurrent request
+    # cannot cache aggregates that still miss the pending writes
+    on_commit(lambda: dashboard_cache.invalidate('dashboard:'))
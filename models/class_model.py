@@ -1,5 +1,12 @@
+import logging
 from models.db import get_db
-from mysql.connector import Error
+from models.cache import invalidate_dashboard
+from models.grade_model import GradeModel
+from models.rank_model import RankModel
+from models.backend import Error
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 class ClassModel:
     """Model for managing class-related operations."""
@@ -10,14 +17,14 @@ class ClassModel:
     @staticmethod
     def get_all():
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT c.*, u.username AS teacher_name
             FROM classes c
             LEFT JOIN users u ON c.teacher_id = u.id
             ORDER BY c.year DESC
         """)
-        classes = cursor.fetchall()
+        classes = fetch_rows(cursor)
         cursor.close()
         return classes
 
@@ -27,16 +34,33 @@ class ClassModel:
     @staticmethod
     def get_all_classes():
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT id, name, year
             FROM classes
             ORDER BY year DESC, name ASC
         """)
-        classes = cursor.fetchall()
+        classes = fetch_rows(cursor)
         cursor.close()
         return classes
 
+    # --------------------------------------------------------------
+    # ✅ Get IDs of the classes taught by a teacher (by user ID)
+    # --------------------------------------------------------------
+    @staticmethod
+    def get_ids_for_teacher(user_id):
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("""
+            SELECT c.id
+            FROM classes c
+            JOIN teachers t ON c.teacher_id = t.id
+            WHERE t.user_id = %s
+        """, (user_id,))
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return ids
+
     # --------------------------------------------------------------
     # ✅ Get class by ID
     # --------------------------------------------------------------
@@ -62,9 +86,10 @@ class ClassModel:
                 VALUES (%s, %s, %s)
             """, (name, year, teacher_id))
             db.commit()
+            invalidate_dashboard()
             return True
         except Error as e:
-            print(f"❌ Error adding class: {e}")
+            logger.error(f"❌ Error adding class: {e}")
             db.rollback()
             return False
         finally:
@@ -84,9 +109,10 @@ class ClassModel:
                 WHERE id = %s
             """, (name, year, teacher_id, class_id))
             db.commit()
+            invalidate_dashboard()
             return True
         except Error as e:
-            print(f"❌ Error updating class: {e}")
+            logger.error(f"❌ Error updating class: {e}")
             db.rollback()
             return False
         finally:
@@ -100,11 +126,16 @@ class ClassModel:
         db = get_db()
         cursor = db.cursor()
         try:
+            # Its subjects' grades cascade, its other grades and its students
+            # lose their class; follow both in the rollups in this transaction
+            GradeModel.before_parent_delete(cursor, class_id=class_id)
+            RankModel.clear_class(cursor, class_id)
             cursor.execute("DELETE FROM classes WHERE id = %s", (class_id,))
             db.commit()
+            invalidate_dashboard()
             return True
         except Error as e:
-            print(f"❌ Error deleting class: {e}")
+            logger.error(f"❌ Error deleting class: {e}")
             db.rollback()
             return False
         finally:
@@ -1,24 +1,22 @@
-import mysql.connector
-from mysql.connector import Error
+import logging
+from models.backend import Error
 from datetime import datetime
+from models.pool import get_pool
+from models.rank_model import RankModel
+
+logger = logging.getLogger(__name__)
 
 
 class DashboardModel:
-    def __init__(self, db_config):
+    def __init__(self, pool=None):
         """
-        db_config: dictionary with host, user, password, and database keys.
-        Example:
-        db_config = {
-            "host": "localhost",
-            "user": "root",
-            "password": "",
-            "database": "student_performance"
-        }
+        pool: optional ConnectionPool; defaults to the shared application pool.
+        Connections are borrowed per call and returned on close().
         """
-        self.db_config = db_config
+        self.pool = pool
 
     def _get_connection(self):
-        return mysql.connector.connect(**self.db_config)
+        return (self.pool or get_pool()).checkout()
 
     # ------------------ TEACHER DASHBOARD ------------------
 
@@ -61,7 +59,7 @@ class DashboardModel:
             }
 
         except Error as e:
-            print(f"Error fetching teacher dashboard data: {e}")
+            logger.error(f"Error fetching teacher dashboard data: {e}")
             return None
         finally:
             cursor.close()
@@ -69,8 +67,8 @@ class DashboardModel:
 
     # ------------------ STUDENT DASHBOARD ------------------
 
-    def get_student_dashboard_data(self, student_id):
-        """Get performance summary for a specific student."""
+    def get_student_dashboard_data(self, student_id, scope="class", term=None):
+        """Get performance summary for a specific student (rank within `scope`, optionally per term)."""
         connection = self._get_connection()
         cursor = connection.cursor(dictionary=True)
 
@@ -94,19 +92,13 @@ class DashboardModel:
             avg_score = cursor.fetchone()["avg_score"] or 0
             gpa = round((avg_score / 25), 2)  # 100 -> 4.0 scale conversion
 
-            # Rank among classmates (based on average score)
-            cursor.execute("""
-                SELECT student_id, AVG(score) AS avg_score
-                FROM student_scores
-                GROUP BY student_id
-                ORDER BY avg_score DESC;
-            """)
-            all_students = cursor.fetchall()
-
-            rank = next(
-                (i + 1 for i, row in enumerate(all_students) if row["student_id"] == student_id),
-                None
-            )
+            # Rank among classmates (indexed lookup on student_averages)
+            rank_cursor = connection.cursor()
+            try:
+                ranking = RankModel.rank_with_cursor(rank_cursor, student_id, scope, term)
+            finally:
+                rank_cursor.close()
+            rank = ranking["rank"] if ranking else None
 
             return {
                 "subjects": subjects,
@@ -116,7 +108,7 @@ class DashboardModel:
             }
 
         except Error as e:
-            print(f"Error fetching student dashboard data: {e}")
+            logger.error(f"Error fetching student dashboard data: {e}")
             return None
         finally:
             cursor.close()
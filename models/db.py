@@ -1,40 +1,68 @@
 # models/db.py
-import os
-import mysql.connector
-from flask import current_app, g
-from mysql.connector import Error
+from flask import g
+from models.backend import Error
+from models.pool import configure_pool, get_pool, PoolTimeoutError
+
 
 def get_db():
     """
-    Return a MySQL connection from flask.g, using current_app.config.
+    Return a pooled MySQL connection cached on flask.g.
     Must be called inside app context / request context.
+    The connection goes back to the pool when the app context tears down.
     """
-    if 'db' not in g:
-        # prefer current_app.config, but fallback to ENV vars (defensive)
-        host = current_app.config.get('MYSQL_HOST') or os.getenv('MYSQL_HOST', 'localhost')
-        user = current_app.config.get('MYSQL_USER') or os.getenv('MYSQL_USER', 'root')
-        password = current_app.config.get('MYSQL_PASSWORD') or os.getenv('MYSQL_PASSWORD', '')
-        database = current_app.config.get('MYSQL_DB') or os.getenv('MYSQL_DB', 'student_management')
-
+    db = g.get('db')
+    if db is None or db.released:
         try:
-            g.db = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database,
-                autocommit=False
-            )
+            g.db = get_pool().checkout()
+        except PoolTimeoutError:
+            raise
         except Error as e:
             # raise a clear error so Flask debugger shows it
             raise RuntimeError(f"Could not connect to MySQL: {e}") from e
 
     return g.db
 
+
 def close_db(e=None):
     db = g.pop('db', None)
-    if db is not None and getattr(db, 'is_connected', None):
-        try:
-            if db.is_connected():
-                db.close()
-        except Exception:
-            pass
+    if db is not None:
+        db.close()
+
+
+def init_app(app):
+    """Build the shared pool from app.config and hook connection release into teardown."""
+    configure_pool(app.config)
+    app.teardown_appcontext(close_db)
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+def stream_rows(sql, params=(), batch_size=1000):
+    """
+    Yield result rows (tuples) of a large SELECT without loading them all.
+
+    Uses its own pooled connection and an unbuffered cursor, so MySQL sends
+    rows as they are fetched and only `batch_size` rows sit in memory. Meant
+    for exports wrapped in stream_with_context. If the consumer stops early
+    (client disconnected) the connection still has unread rows, so it is
+    closed instead of being returned to the pool.
+    """
+    conn = get_pool().checkout()
+    cursor = conn.cursor(buffered=False)
+    finished = False
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        finished = True
+    finally:
+        if finished:
+            cursor.close()
+            conn.close()
+        else:
+            conn.invalidate()
@@ -1,12 +1,22 @@
-from models.db import get_db
+from models.db import get_db, stream_rows
+from models.cache import invalidate_dashboard
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
+from models.grading_scale import get_scale
+from models.audit_model import audit
+from models.rows import fetch_rows
 
 class GradeModel:
     """Model for managing student grades."""
 
+    TERMS = ('Term 1', 'Term 2', 'Term 3', 'Final')
+    MIN_SCORE = 0
+    MAX_SCORE = 100
+
     @staticmethod
     def get_all_grades():
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT 
                 g.id,
@@ -23,20 +33,59 @@ class GradeModel:
             JOIN classes c ON g.class_id = c.id
             ORDER BY s.username ASC
         """)
-        grades = cursor.fetchall()
+        grades = fetch_rows(cursor)
         cursor.close()
         return grades
 
+    EXPORT_HEADER = ('ID', 'Student', 'Subject', 'Class', 'Term', 'Score', 'Grade', 'Remarks')
+
+    @staticmethod
+    def iter_export(class_id=None, subject_id=None, term=None):
+        """Stream grades as tuples (see EXPORT_HEADER), optionally narrowed like the gradebook."""
+        conditions = []
+        params = []
+        if class_id:
+            conditions.append("g.class_id = %s")
+            params.append(class_id)
+        if subject_id:
+            conditions.append("g.subject_id = %s")
+            params.append(subject_id)
+        if term:
+            conditions.append("g.term = %s")
+            params.append(term)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        return stream_rows(f"""
+            SELECT g.id, st.name AS student_name, sub.name AS subject_name, c.name AS class_name,
+                   g.term, g.score, g.grade_letter, g.remarks
+            FROM grades g
+            JOIN students st ON g.student_id = st.id
+            JOIN subjects sub ON g.subject_id = sub.id
+            JOIN classes c ON g.class_id = c.id
+            {where}
+            ORDER BY g.id
+        """, tuple(params))
+
     @staticmethod
-    def add_grade(student_id, subject_id, class_id, score, grade, remarks):
+    def add_grade(student_id, subject_id, class_id, score, grade, remarks, term='Term 1'):
         db = get_db()
         cursor = db.cursor()
-        cursor.execute("""
-            INSERT INTO grades (student_id, subject_id, class_id, score, grade_letter, remarks)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (student_id, subject_id, class_id, score, grade, remarks))
-        db.commit()
-        cursor.close()
+        try:
+            cursor.execute("""
+                INSERT INTO grades (student_id, subject_id, class_id, term, score, grade_letter, remarks)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (student_id, subject_id, class_id, term, score, grade, remarks))
+            GradeStatsModel.apply(cursor, class_id, subject_id, term, score)
+            RankModel.apply(cursor, student_id, term, score)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        invalidate_dashboard()
+        audit('grade.create', 'student', student_id,
+              {'subject_id': subject_id, 'class_id': class_id, 'term': term, 'score': score})
 
     @staticmethod
     def get_grade_by_id(grade_id):
@@ -63,22 +112,276 @@ class GradeModel:
         return grade
 
 
+    @staticmethod
+    def _lock_grade(cursor, grade_id):
+        """Read the rollup key and score of a grade row, locking it for the transaction."""
+        cursor.execute("""
+            SELECT student_id, class_id, subject_id, term, score
+            FROM grades
+            WHERE id = %s
+            FOR UPDATE
+        """, (grade_id,))
+        return cursor.fetchone()
+
     @staticmethod
     def update_grade(grade_id, score, grade, remarks):
         db = get_db()
         cursor = db.cursor()
-        cursor.execute("""
-            UPDATE grades
-            SET score = %s, grade_letter = %s, remarks = %s
-            WHERE id = %s
-        """, (score, grade, remarks, grade_id))
-        db.commit()
-        cursor.close()
+        try:
+            old = GradeModel._lock_grade(cursor, grade_id)
+            if old is None:
+                return
+            student_id, class_id, subject_id, term, old_score = old
+            cursor.execute("""
+                UPDATE grades
+                SET score = %s, grade_letter = %s, remarks = %s
+                WHERE id = %s
+            """, (score, grade, remarks, grade_id))
+            GradeStatsModel.apply(cursor, class_id, subject_id, term, old_score, sign=-1)
+            GradeStatsModel.apply(cursor, class_id, subject_id, term, score)
+            RankModel.apply(cursor, student_id, term, old_score, sign=-1)
+            RankModel.apply(cursor, student_id, term, score)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        invalidate_dashboard()
+        audit('grade.update', 'grade', grade_id, {'student_id': student_id, 'from': old_score, 'to': score})
 
     @staticmethod
     def delete_grade(grade_id):
         db = get_db()
         cursor = db.cursor()
-        cursor.execute("DELETE FROM grades WHERE id = %s", (grade_id,))
-        db.commit()
+        try:
+            old = GradeModel._lock_grade(cursor, grade_id)
+            if old is None:
+                return
+            student_id, class_id, subject_id, term, old_score = old
+            cursor.execute("DELETE FROM grades WHERE id = %s", (grade_id,))
+            GradeStatsModel.apply(cursor, class_id, subject_id, term, old_score, sign=-1)
+            RankModel.apply(cursor, student_id, term, old_score, sign=-1)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        invalidate_dashboard()
+        audit('grade.delete', 'grade', grade_id, {'student_id': student_id, 'score': old_score})
+
+    @staticmethod
+    def before_parent_delete(cursor, student_id=None, subject_id=None, class_id=None):
+        """
+        Keep the rollups in step with a parent delete that reaches grades
+        through foreign keys. Call with the deleting transaction's cursor
+        right before the parent DELETE:
+        - student / subject: its grades go (ON DELETE CASCADE)
+        - class: grades of its subjects go (subjects cascade with the class);
+          its other grades move to NO_CLASS (grades.class_id ON DELETE SET NULL)
+        """
+        if class_id is not None:
+            cursor.execute("""
+                SELECT g.student_id, g.class_id, g.subject_id, g.term, g.score,
+                       sub.class_id = %s AS cascades
+                FROM grades g
+                JOIN subjects sub ON sub.id = g.subject_id
+                WHERE g.class_id = %s OR sub.class_id = %s
+                FOR UPDATE
+            """, (class_id, class_id, class_id))
+        else:
+            column, value = ('student_id', student_id) if student_id is not None else ('subject_id', subject_id)
+            cursor.execute(f"""
+                SELECT student_id, class_id, subject_id, term, score, 1 AS cascades
+                FROM grades
+                WHERE {column} = %s
+                FOR UPDATE
+            """, (value,))
+        rows = cursor.fetchall()
+
+        stats, ranks = [], []
+        for sid, cid, subid, term, score, cascades in rows:
+            stats.append((cid, subid, term, score, -1))
+            if cascades:
+                ranks.append((sid, term, score, -1))
+            else:
+                stats.append((None, subid, term, score, 1))
+        GradeStatsModel.apply_many(cursor, stats)
+        RankModel.apply_many(cursor, ranks)
+        return len(rows)
+
+    @staticmethod
+    def regrade_term(conn, term, scale=None, batch_size=1000):
+        """
+        Recompute grade_letter/remarks for every grade in `term` with `scale`
+        (default: the active scale). Rows are read in id order, classified one
+        batch at a time in a single vectorized call, and only changed rows are
+        written back with one CASE-based UPDATE per batch. Returns rows changed.
+        """
+        scale = scale or get_scale()
+        cursor = conn.cursor()
+        changed = 0
+        last_id = 0
+        try:
+            while True:
+                cursor.execute("""
+                    SELECT id, score, grade_letter, remarks
+                    FROM grades
+                    WHERE term = %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                """, (term, last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                letters, remarks = scale.classify_many([row[1] for row in rows])
+                updates = [
+                    (row[0], letter, remark)
+                    for row, letter, remark in zip(rows, letters, remarks)
+                    if (row[2], row[3]) != (letter, remark)
+                ]
+                if updates:
+                    ids = [u[0] for u in updates]
+                    letter_case = " ".join(["WHEN %s THEN %s"] * len(updates))
+                    remark_case = " ".join(["WHEN %s THEN %s"] * len(updates))
+                    params = [v for u in updates for v in (u[0], u[1])]
+                    params += [v for u in updates for v in (u[0], u[2])]
+                    params += ids
+                    cursor.execute(f"""
+                        UPDATE grades
+                        SET grade_letter = CASE id {letter_case} END,
+                            remarks = CASE id {remark_case} END
+                        WHERE id IN ({', '.join(['%s'] * len(ids))})
+                    """, params)
+                    conn.commit()
+                    changed += len(updates)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        if changed:
+            audit('grade.regrade', 'term', None, {'term': term, 'changed': changed})
+        return changed
+
+    # ------------------------
+    # 📒 GRADEBOOK (class x subject x term in one transaction)
+    # ------------------------
+    @staticmethod
+    def get_gradebook(class_id, subject_id, term):
+        """Active students of a class with their current score for subject/term."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("""
+            SELECT st.id AS student_id, st.name AS student_name,
+                   g.score, g.grade_letter, g.remarks
+            FROM students st
+            LEFT JOIN grades g
+                ON g.student_id = st.id AND g.subject_id = %s AND g.term = %s
+            WHERE st.class_id = %s AND st.status = 'active'
+            ORDER BY st.name ASC
+        """, (subject_id, term, class_id))
+        rows = fetch_rows(cursor)
         cursor.close()
+        return rows
+
+    @staticmethod
+    def save_gradebook(class_id, subject_id, term, entries):
+        """
+        Validate, classify and upsert a whole class's scores for one subject/term.
+
+        entries: iterable of (student_id, score) with raw (string) values;
+        blank scores are skipped. Invalid rows are reported and left out, the
+        rest are written with one multi-row upsert on (student_id, subject_id,
+        term) in a single transaction together with the rollups.
+        Returns (saved_count, errors) where errors is [{'student_id', 'error'}].
+        """
+        if term not in GradeModel.TERMS:
+            raise ValueError(f"Unknown term '{term}'")
+
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            cursor.execute("""
+                SELECT id FROM students
+                WHERE class_id = %s AND status = 'active'
+            """, (class_id,))
+            roster = {row[0] for row in cursor.fetchall()}
+
+            errors, valid = [], {}
+            for raw_id, raw_score in entries:
+                try:
+                    student_id = int(raw_id)
+                except (TypeError, ValueError):
+                    errors.append({'student_id': raw_id, 'error': 'Invalid student id'})
+                    continue
+                if raw_score is None or str(raw_score).strip() == '':
+                    continue
+                if student_id not in roster:
+                    errors.append({'student_id': student_id, 'error': 'Student is not enrolled in this class'})
+                    continue
+                try:
+                    score = round(float(raw_score), 2)
+                except (TypeError, ValueError):
+                    errors.append({'student_id': student_id, 'error': f"Score '{raw_score}' is not a number"})
+                    continue
+                if not GradeModel.MIN_SCORE <= score <= GradeModel.MAX_SCORE:
+                    errors.append({'student_id': student_id,
+                                   'error': f'Score must be between {GradeModel.MIN_SCORE} and {GradeModel.MAX_SCORE}'})
+                    continue
+                valid[student_id] = score
+
+            if not valid:
+                return 0, errors
+
+            student_ids = list(valid)
+            scores = [valid[sid] for sid in student_ids]
+            letters, remarks = get_scale().classify_many(scores)
+
+            # Lock the rows being replaced so the rollup deltas are exact
+            cursor.execute(f"""
+                SELECT student_id, class_id, score
+                FROM grades
+                WHERE subject_id = %s AND term = %s
+                  AND student_id IN ({', '.join(['%s'] * len(student_ids))})
+                FOR UPDATE
+            """, (subject_id, term, *student_ids))
+            previous = cursor.fetchall()
+
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(student_ids))
+            params = [
+                v for sid, score, letter, remark in zip(student_ids, scores, letters, remarks)
+                for v in (sid, subject_id, class_id, term, score, letter, remark)
+            ]
+            cursor.execute(f"""
+                INSERT INTO grades (student_id, subject_id, class_id, term, score, grade_letter, remarks)
+                VALUES {placeholders}
+                ON DUPLICATE KEY UPDATE
+                    class_id = VALUES(class_id),
+                    score = VALUES(score),
+                    grade_letter = VALUES(grade_letter),
+                    remarks = VALUES(remarks)
+            """, params)
+
+            GradeStatsModel.apply_many(cursor, [
+                *[(old_class, subject_id, term, old_score, -1) for _, old_class, old_score in previous],
+                *[(class_id, subject_id, term, score, 1) for score in scores],
+            ])
+            RankModel.apply_many(cursor, [
+                *[(sid, term, old_score, -1) for sid, _, old_score in previous],
+                *[(sid, term, score, 1) for sid, score in zip(student_ids, scores)],
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        invalidate_dashboard()
+        audit('grade.gradebook_save', 'class', class_id,
+              {'subject_id': subject_id, 'term': term, 'saved': len(student_ids), 'errors': len(errors)})
+        return len(student_ids), errors
@@ -0,0 +1,212 @@
+# ==============================================================
+# FILE: models/grade_stats_model.py
+# PURPOSE: Incrementally maintained grade rollup per class/subject/term
+# ==============================================================
+
+from models.db import get_db
+from models.grading_scale import get_scale
+
+# Grades with no class are rolled up under class_id 0
+NO_CLASS = 0
+
+BUCKETS = ('a', 'b', 'c', 'd', 'f')
+
+
+def score_bucket(score):
+    """Rollup bucket of a score: the active scale's band letter (A-F, no +/-)."""
+    return get_scale().base_letter(score).lower()
+
+
+class GradeStatsModel:
+    """
+    Rollup table `grade_stats` keyed by (class_id, subject_id, term).
+    Writers call apply() with the cursor of their own transaction so the
+    rollup commits (or rolls back) together with the grade row.
+    """
+
+    # ------------------------
+    # 🧩 INCREMENTAL MAINTENANCE
+    # ------------------------
+    @staticmethod
+    def apply(cursor, class_id, subject_id, term, score, sign=1):
+        """Add (sign=1) or remove (sign=-1) one score from the rollup."""
+        GradeStatsModel.apply_many(cursor, [(class_id, subject_id, term, score, sign)])
+
+    @staticmethod
+    def apply_many(cursor, changes):
+        """
+        Apply (class_id, subject_id, term, score, sign) changes with a single
+        multi-row upsert; changes to the same key are summed first.
+        """
+        deltas = {}
+        for class_id, subject_id, term, score, sign in changes:
+            score = float(score)
+            key = (class_id or NO_CLASS, subject_id, term)
+            d = deltas.setdefault(key, [0, 0.0, 0.0] + [0] * len(BUCKETS))
+            d[0] += sign
+            d[1] += sign * score
+            d[2] += sign * score * score
+            d[3 + BUCKETS.index(score_bucket(score))] += sign
+        if not deltas:
+            return
+
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(deltas))
+        params = [v for key, d in deltas.items() for v in (*key, *d)]
+        cursor.execute(f"""
+            INSERT INTO grade_stats
+                (class_id, subject_id, term, grade_count, score_sum, score_sq_sum,
+                 count_a, count_b, count_c, count_d, count_f)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE
+                grade_count = grade_count + VALUES(grade_count),
+                score_sum = score_sum + VALUES(score_sum),
+                score_sq_sum = score_sq_sum + VALUES(score_sq_sum),
+                count_a = count_a + VALUES(count_a),
+                count_b = count_b + VALUES(count_b),
+                count_c = count_c + VALUES(count_c),
+                count_d = count_d + VALUES(count_d),
+                count_f = count_f + VALUES(count_f)
+        """, params)
+
+    # ------------------------
+    # 🔍 READ (cost independent of the number of grades)
+    # ------------------------
+    @staticmethod
+    def class_averages(class_ids=None):
+        """[{class_name, avg_score}] per class, optionally limited to class_ids."""
+        if class_ids is not None and not class_ids:
+            return []
+        where = ""
+        params = ()
+        if class_ids:
+            where = f"WHERE gs.class_id IN ({', '.join(['%s'] * len(class_ids))})"
+            params = tuple(class_ids)
+
+        db = get_db()
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT c.name AS class_name,
+                   ROUND(SUM(gs.score_sum) / NULLIF(SUM(gs.grade_count), 0), 2) AS avg_score
+            FROM grade_stats gs
+            JOIN classes c ON gs.class_id = c.id
+            {where}
+            GROUP BY c.name
+            HAVING SUM(gs.grade_count) > 0
+            ORDER BY c.name
+        """, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    @staticmethod
+    def overall_average(class_ids=None):
+        if class_ids is not None and not class_ids:
+            return 0
+        where = ""
+        params = ()
+        if class_ids:
+            where = f"WHERE class_id IN ({', '.join(['%s'] * len(class_ids))})"
+            params = tuple(class_ids)
+
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(f"""
+            SELECT ROUND(SUM(score_sum) / NULLIF(SUM(grade_count), 0), 2)
+            FROM grade_stats
+            {where}
+        """, params)
+        (avg,) = cursor.fetchone()
+        cursor.close()
+        return avg or 0
+
+    @staticmethod
+    def distribution():
+        """[(letter, count)] across all grades, skipping empty buckets."""
+        db = get_db()
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT COALESCE(SUM(count_a), 0) AS a, COALESCE(SUM(count_b), 0) AS b,
+                   COALESCE(SUM(count_c), 0) AS c, COALESCE(SUM(count_d), 0) AS d,
+                   COALESCE(SUM(count_f), 0) AS f
+            FROM grade_stats
+        """)
+        row = cursor.fetchone()
+        cursor.close()
+        return [(b.upper(), int(row[b])) for b in BUCKETS if row[b]]
+
+    @staticmethod
+    def subject_averages_for_class(class_id):
+        """{subject_id: avg_score} for one class across all terms."""
+        db = get_db()
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT subject_id,
+                   ROUND(SUM(score_sum) / NULLIF(SUM(grade_count), 0), 2) AS avg_score
+            FROM grade_stats
+            WHERE class_id = %s
+            GROUP BY subject_id
+        """, (class_id or NO_CLASS,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return {row['subject_id']: row['avg_score'] for row in rows}
+
+    # ------------------------
+    # 🔁 REBUILD / VERIFY
+    # ------------------------
+    @staticmethod
+    def _aggregate_sql():
+        bucket = get_scale().sql_case('score')
+        counts = ",\n".join(
+            f"SUM({bucket} = '{b.upper()}') AS count_{b}" for b in BUCKETS
+        )
+        return f"""
+            SELECT COALESCE(class_id, 0) AS class_id, subject_id, term,
+                   COUNT(*) AS grade_count,
+                   SUM(score) AS score_sum,
+                   SUM(score * score) AS score_sq_sum,
+                   {counts}
+            FROM grades
+            GROUP BY COALESCE(class_id, 0), subject_id, term
+        """
+
+    @staticmethod
+    def rebuild(conn):
+        """Recompute grade_stats from scratch inside one transaction."""
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM grade_stats")
+            cursor.execute(f"""
+                INSERT INTO grade_stats
+                    (class_id, subject_id, term, grade_count, score_sum, score_sq_sum,
+                     count_a, count_b, count_c, count_d, count_f)
+                {GradeStatsModel._aggregate_sql()}
+            """)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def verify(conn):
+        """Compare grade_stats with a fresh aggregate; returns a list of mismatched keys."""
+        columns = ('grade_count', 'score_sum', 'score_sq_sum',
+                   'count_a', 'count_b', 'count_c', 'count_d', 'count_f')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(GradeStatsModel._aggregate_sql())
+            expected = {(r['class_id'], r['subject_id'], r['term']): r for r in cursor.fetchall()}
+            cursor.execute("SELECT * FROM grade_stats WHERE grade_count <> 0")
+            actual = {(r['class_id'], r['subject_id'], r['term']): r for r in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+        mismatches = []
+        for key in expected.keys() | actual.keys():
+            exp, act = expected.get(key), actual.get(key)
+            if exp is None or act is None or any(
+                abs(float(exp[c]) - float(act[c])) > 0.005 for c in columns
+            ):
+                mismatches.append(key)
+        return sorted(mismatches, key=str)
@@ -0,0 +1,105 @@
+# ==============================================================
+# FILE: models/grading_scale.py
+# PURPOSE: Single configurable score -> letter/remarks grading scale
+# ==============================================================
+
+import numpy as np
+
+from config import Config
+
+
+class GradingScale:
+    """
+    Grading scale defined by descending (min_score, letter, remarks) bands.
+
+    With plus_minus=True each band except the top and bottom is split into
+    '-', plain and '+' thirds (e.g. 80-83.33 -> B-, 86.67-90 -> B+).
+
+    classify() maps one score; classify_many() maps a whole array of scores
+    with one np.searchsorted call.
+    """
+
+    def __init__(self, bands, plus_minus=False):
+        bands = sorted(bands, key=lambda b: b[0], reverse=True)
+        if not bands or bands[-1][0] > 0:
+            raise ValueError("The lowest band must start at 0 or below")
+        self.bands = bands
+        self.plus_minus = plus_minus
+
+        # Flatten to ascending cut-offs for searchsorted
+        cutoffs, letters, remarks = [], [], []
+        for i, (low, letter, remark) in enumerate(reversed(bands)):
+            is_bottom = i == 0
+            is_top = i == len(bands) - 1
+            if plus_minus and not is_bottom and not is_top:
+                high = bands[len(bands) - 2 - i][0]
+                third = (high - low) / 3
+                for offset, suffix in ((0, '-'), (third, ''), (2 * third, '+')):
+                    cutoffs.append(low + offset)
+                    letters.append(letter + suffix)
+                    remarks.append(remark)
+            else:
+                cutoffs.append(low)
+                letters.append(letter)
+                remarks.append(remark)
+
+        self._cutoffs = np.asarray(cutoffs, dtype=float)
+        self._letters = np.asarray(letters, dtype=object)
+        self._remarks = np.asarray(remarks, dtype=object)
+        self._base_cutoffs = np.asarray([b[0] for b in reversed(bands)], dtype=float)
+        self._base_letters = np.asarray([b[1] for b in reversed(bands)], dtype=object)
+
+    # ------------------------
+    # 🔢 CLASSIFY
+    # ------------------------
+    def classify_many(self, scores):
+        """Return (letters, remarks) object arrays for an array-like of scores."""
+        scores = np.asarray(scores, dtype=float)
+        idx = np.searchsorted(self._cutoffs, scores, side='right') - 1
+        idx = np.clip(idx, 0, len(self._cutoffs) - 1)
+        return self._letters[idx], self._remarks[idx]
+
+    def classify(self, score):
+        """Return (letter, remarks) for a single score."""
+        letters, remarks = self.classify_many([score])
+        return letters[0], remarks[0]
+
+    def base_letter(self, score):
+        """Band letter without +/- (used for the A-F rollup buckets)."""
+        idx = np.searchsorted(self._base_cutoffs, float(score), side='right') - 1
+        return self._base_letters[max(idx, 0)]
+
+    def sql_case(self, column='score'):
+        """SQL CASE expression giving the band letter of `column`."""
+        whens = "\n".join(
+            f"WHEN {column} >= {low:g} THEN '{letter}'" for low, letter, _ in self.bands[:-1]
+        )
+        return f"CASE\n{whens}\nELSE '{self.bands[-1][1]}'\nEND"
+
+
+# ==============================================================
+# 🔹 Default scale
+# ==============================================================
+DEFAULT_BANDS = [
+    (90, 'A', 'Excellent'),
+    (80, 'B', 'Good'),
+    (70, 'C', 'Average'),
+    (60, 'D', 'Needs Improvement'),
+    (0, 'F', 'Fail'),
+]
+
+_scale = None
+
+
+def get_scale():
+    """Return the configured grading scale (GRADING_PLUS_MINUS toggles +/- variants)."""
+    global _scale
+    if _scale is None:
+        _scale = GradingScale(DEFAULT_BANDS, plus_minus=Config.GRADING_PLUS_MINUS)
+    return _scale
+
+
+def set_scale(scale):
+    """Replace the active scale (e.g. before running a bulk regrade)."""
+    global _scale
+    _scale = scale
@@ -0,0 +1,89 @@
+# ==============================================================
+# FILE: models/mysql_backend.py
+# PURPOSE: MySQL backend (mysql.connector); the production engine
+# ==============================================================
+
+import mysql.connector
+
+from models.backend import Backend
+
+
+class MySQLBackend(Backend):
+    name = 'mysql'
+
+    def __init__(self, host='localhost', user='root', password='', database='student_management'):
+        self.db_config = {
+            'host': host,
+            'user': user,
+            'password': password,
+            'database': database,
+            'autocommit': False,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            host=config.get('MYSQL_HOST', 'localhost'),
+            user=config.get('MYSQL_USER', 'root'),
+            password=config.get('MYSQL_PASSWORD', ''),
+            database=config.get('MYSQL_DB', 'student_management'),
+        )
+
+    def connect(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def ensure_database(self):
+        config = {k: v for k, v in self.db_config.items() if k != 'database'}
+        conn = mysql.connector.connect(**config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{self.db_config['database']}`")
+            cursor.close()
+        finally:
+            conn.close()
+
+    def table_exists(self, cursor, table):
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_name = %s
+        """, (table,))
+        return cursor.fetchone()[0] > 0
+
+    def columns(self, cursor, table):
+        cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s
+        """, (table,))
+        return {name for (name,) in cursor.fetchall()}
+
+    def indexes(self, cursor, table, unique_only=False):
+        cursor.execute(f"""
+            SELECT index_name, column_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name <> 'PRIMARY'
+                {'AND non_unique = 0' if unique_only else ''}
+            ORDER BY index_name, seq_in_index
+        """, (table,))
+        result = {}
+        for name, column in cursor.fetchall():
+            result.setdefault(name, []).append(column)
+        return result
+
+    def create_index_sql(self, table, name, columns, unique=False):
+        # InnoDB online DDL: reads and writes continue while the index builds
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        return (f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)}), "
+                f"ALGORITHM=INPLACE, LOCK=NONE")
+
+    def drop_index_sql(self, table, name):
+        return f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE"
+
+    def acquire_lock(self, cursor, name, timeout=30):
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (name, timeout))
+        return cursor.fetchone()[0] == 1
+
+    def release_lock(self, cursor, name):
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        cursor.fetchall()
+
+    def describe(self):
+        return f"mysql://{self.db_config['user']}@{self.db_config['host']}/{self.db_config['database']}"
@@ -0,0 +1,260 @@
+# ==============================================================
+# FILE: models/pool.py
+# PURPOSE: Shared MySQL connection pool used by every model
+# ==============================================================
+
+import threading
+import time
+from collections import deque
+
+from models.backend import Error, create_backend
+from models.query_log import wrap_cursor
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw backend connection (mysql.connector or SQLite).
+    Calling close() hands the connection back to the pool instead of
+    tearing down the socket, so existing `conn.close()` calls keep working.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self.created_at = created_at
+        self.released = False
+        # Open unit-of-work scopes, innermost last (see models/unit_of_work.py)
+        self.scopes = []
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        # Instrumented when a request is being recorded (see models/query_log.py)
+        return wrap_cursor(self._raw.cursor(*args, **kwargs))
+
+    def commit(self):
+        # Inside a unit of work the outermost scope commits once at its end
+        if not self.scopes:
+            self._raw.commit()
+
+    def rollback(self):
+        if self.scopes:
+            self.scopes[-1].fail()
+        else:
+            self._raw.rollback()
+
+    def close(self):
+        if self.scopes:
+            return  # held by the open unit of work until the request ends
+        if not self.released:
+            self.released = True
+            self._pool.release(self)
+
+    def invalidate(self):
+        """Close the underlying socket instead of pooling it (e.g. a result was left unread)."""
+        if not self.released:
+            self.released = True
+            self._pool.release(self, discard=True)
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool with bounded overflow over a storage backend
+    (models/backend.py), which opens and health-checks the connections.
+
+    - pool_size:    connections kept open while idle
+    - max_overflow: extra connections opened under burst load, closed on release
+    - timeout:      seconds a checkout waits before raising PoolTimeoutError
+    - recycle:      seconds after which a connection is closed instead of reused
+    - pre_ping:     ping the server on checkout and replace dead connections
+    """
+
+    def __init__(self, backend, pool_size=10, max_overflow=10, timeout=30,
+                 recycle=3600, pre_ping=True):
+        self.backend = backend
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'invalidated': 0,
+        }
+
+    # --------------------------------------------------------------
+    # ✅ Internal helpers
+    # --------------------------------------------------------------
+    def _connect(self):
+        raw = self.backend.connect()
+        self._bump('created')
+        return raw, time.monotonic()
+
+    def _bump(self, key):
+        with self._cond:
+            self._stats[key] += 1
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _is_stale(self, created_at):
+        return self.recycle is not None and self.recycle >= 0 and \
+            time.monotonic() - created_at > self.recycle
+
+    def _is_alive(self, raw):
+        return self.backend.is_alive(raw)
+
+    # --------------------------------------------------------------
+    # ✅ Checkout / release
+    # --------------------------------------------------------------
+    def checkout(self):
+        """Return a PooledConnection, waiting up to `timeout` seconds if exhausted."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            waited = False
+            while not self._idle and self._open >= self.pool_size + self.max_overflow:
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a database connection"
+                    )
+                self._cond.wait(remaining)
+
+            entry = self._idle.popleft() if self._idle else None
+            if entry is None:
+                self._open += 1
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+
+        # Network work happens outside the lock
+        try:
+            if entry is not None:
+                raw, created_at = entry
+                if self._is_stale(created_at):
+                    self._bump('recycled')
+                    self._discard(raw)
+                    entry = None
+                elif self.pre_ping and not self._is_alive(raw):
+                    self._bump('invalidated')
+                    self._discard(raw)
+                    entry = None
+            if entry is None:
+                raw, created_at = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw, created_at)
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, rolling back any open transaction."""
+        raw = conn._raw
+        keep = not discard
+        try:
+            if keep and raw.in_transaction:
+                raw.rollback()
+        except Error:
+            keep = False
+        if discard:
+            self._bump('invalidated')
+
+        with self._cond:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.pool_size and not self._is_stale(conn.created_at):
+                self._idle.append((raw, conn.created_at))
+                raw = None
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+        if raw is not None:
+            self._discard(raw)
+
+    def dispose(self):
+        """Close every idle connection (checked-out ones close on release)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+
+    # --------------------------------------------------------------
+    # ✅ Monitoring
+    # --------------------------------------------------------------
+    def stats(self):
+        with self._cond:
+            return {
+                'backend': self.backend.name,
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                **self._stats,
+            }
+
+
+# ==============================================================
+# 🔹 Process-wide pool
+# ==============================================================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _settings_from(config):
+    return dict(
+        backend=create_backend(config),
+        pool_size=int(config.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(config.get('DB_POOL_MAX_OVERFLOW', 10)),
+        timeout=float(config.get('DB_POOL_TIMEOUT', 30)),
+        recycle=int(config.get('DB_POOL_RECYCLE', 3600)),
+        pre_ping=bool(config.get('DB_POOL_PRE_PING', True)),
+    )
+
+
+def configure_pool(config):
+    """(Re)create the shared pool from a mapping such as app.config."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.dispose()
+        _pool = ConnectionPool(**_settings_from(config))
+    return _pool
+
+
+def get_pool():
+    """Return the shared pool, building it from Config on first use."""
+    global _pool
+    if _pool is None:
+        from config import Config
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**_settings_from(
+                    {k: getattr(Config, k) for k in dir(Config) if k.isupper()}
+                ))
+    return _pool
@@ -0,0 +1,194 @@
+# ==============================================================
+# FILE: models/query_log.py
+# PURPOSE: Per-request SQL instrumentation (timings, row counts, N+1 hints)
+# ==============================================================
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('query_log', default=None)
+
+_WS = re.compile(r'\s+')
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'IN \(\?(?:, \?)*\)', re.IGNORECASE)
+_ROW_LIST = re.compile(r'\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))+')
+
+
+def normalize(sql):
+    """Reduce a statement to its shape: literals and placeholders become '?', lists collapse."""
+    shape = _WS.sub(' ', sql).strip().rstrip(';').strip()
+    shape = shape.replace('%s', '?')
+    shape = _STRING.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    shape = _ROW_LIST.sub('(...)', shape)
+    return shape
+
+
+class QueryLog:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        self.entries = []          # [shape, duration_ms, rows]
+        self.started = time.perf_counter()
+
+    def record(self, sql, duration_ms):
+        entry = [normalize(sql), duration_ms, 0]
+        self.entries.append(entry)
+        return entry
+
+    @property
+    def count(self):
+        return len(self.entries)
+
+    @property
+    def total_ms(self):
+        return sum(e[1] for e in self.entries)
+
+    def repeated_shapes(self, threshold):
+        """Shapes executed at least `threshold` times (likely N+1 loops)."""
+        counts = Counter(e[0] for e in self.entries)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times execute() calls and counts fetched rows."""
+
+    def __init__(self, cursor, log, slow_ms):
+        self._cursor = cursor
+        self._log = log
+        self._slow_ms = slow_ms
+        self._entry = None
+        self._fetched = 0   # rows fetched so far for the current statement
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._add_fetched(1)
+            yield row
+
+    def _timed(self, method, sql, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args, **kwargs)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self._entry = self._log.record(sql, duration)
+            self._fetched = 0
+            if _listeners and method == self._cursor.execute:
+                params = args[0] if args else kwargs.get('params', ())
+                for listener in _listeners:
+                    listener(sql, params)
+            rowcount = getattr(self._cursor, 'rowcount', -1)
+            if rowcount and rowcount > 0:
+                self._entry[2] = rowcount
+            if duration >= self._slow_ms:
+                logger.warning("🐢 Slow query (%.1f ms): %s", duration, self._entry[0][:500],
+                               extra={'duration_ms': round(duration, 2)})
+
+    def execute(self, sql, *args, **kwargs):
+        return self._timed(self._cursor.execute, sql, *args, **kwargs)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._timed(self._cursor.executemany, sql, *args, **kwargs)
+
+    def _count(self, rows):
+        if self._entry is not None and rows:
+            self._entry[2] = max(self._entry[2], len(rows))
+        return rows
+
+    def fetchall(self):
+        return self._count(self._cursor.fetchall())
+
+    def _add_fetched(self, n):
+        # A buffered cursor's rowcount is already the full result size, so
+        # piecewise fetches only raise the count where rowcount was unknown
+        self._fetched += n
+        if self._entry is not None:
+            self._entry[2] = max(self._entry[2], self._fetched)
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._add_fetched(len(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None and self._entry is not None and self._entry[2] == 0:
+            self._entry[2] = 1
+        return row
+
+
+# ==============================================================
+# 🔹 Hooks used by PooledConnection and the Flask app
+# ==============================================================
+_settings = {'slow_ms': 100.0, 'n_plus_one': 5, 'headers': True}
+_listeners = []
+
+
+def add_listener(fn):
+    """Call fn(sql, params) after every instrumented execute() (e.g. to collect statements)."""
+    _listeners.append(fn)
+
+
+def remove_listener(fn):
+    _listeners.remove(fn)
+
+
+def wrap_cursor(cursor):
+    """Instrument `cursor` if a request is being recorded, otherwise return it as-is."""
+    log = _current.get()
+    if log is None:
+        return cursor
+    return InstrumentedCursor(cursor, log, _settings['slow_ms'])
+
+
+def current_log():
+    return _current.get()
+
+
+def init_app(app):
+    """Record SQL per request; expose totals as Server-Timing outside production."""
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+
+    _settings['slow_ms'] = float(app.config.get('SQL_SLOW_QUERY_MS', 100))
+    _settings['n_plus_one'] = int(app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    _settings['headers'] = app.config.get('APP_ENV', 'development') != 'production'
+
+    @app.before_request
+    def _start_query_log():
+        request.environ['query_log.token'] = _current.set(QueryLog())
+
+    @app.after_request
+    def _report_query_log(response):
+        log = _current.get()
+        if log is None:
+            return response
+
+        for shape, n in log.repeated_shapes(_settings['n_plus_one']):
+            logger.warning("⚠️ Possible N+1 on %s: %sx %s", request.endpoint, n, shape[:300],
+                           extra={'endpoint': request.endpoint, 'repeats': n})
+
+        if _settings['headers']:
+            response.headers['Server-Timing'] = (
+                f'db;dur={log.total_ms:.2f};desc="{log.count} queries"'
+            )
+            response.headers['X-DB-Queries'] = str(log.count)
+        return response
+
+    @app.teardown_request
+    def _end_query_log(exc=None):
+        token = request.environ.pop('query_log.token', None)
+        if token is not None:
+            _current.reset(token)
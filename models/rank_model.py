@@ -0,0 +1,167 @@
+# ==============================================================
+# FILE: models/rank_model.py
+# PURPOSE: Student ranking backed by a maintained per-student average table
+# ==============================================================
+
+from models.db import get_db
+
+# Term key under which each student's all-terms average is kept
+ALL_TERMS = 'All'
+
+SCOPES = ('school', 'year', 'class')
+
+
+class RankModel:
+    """
+    `student_averages` holds one row per (student_id, term) plus an
+    ALL_TERMS row, maintained in the same transaction as grade writes, and
+    carries the student's class_id so class and year ranks stay in the
+    (term, class_id, avg_score) index. A rank is then a COUNT over the index
+    range above the student's own average instead of sorting every student
+    in Python.
+
+    Ranking is competition style: ties share a rank and the next rank skips
+    (90, 90, 85 -> 1, 1, 3).
+    """
+
+    # ------------------------
+    # 🧩 INCREMENTAL MAINTENANCE
+    # ------------------------
+    @staticmethod
+    def apply(cursor, student_id, term, score, sign=1):
+        """Add (sign=1) or remove (sign=-1) one score from the student's averages."""
+        RankModel.apply_many(cursor, [(student_id, term, score, sign)])
+
+    @staticmethod
+    def apply_many(cursor, changes):
+        """
+        Apply (student_id, term, score, sign) changes to both the term row and
+        the ALL_TERMS row with a single multi-row upsert. class_id is read from
+        the student row, so it is current for every row a grade write touches.
+        """
+        deltas = {}
+        for student_id, term, score, sign in changes:
+            for key in ((student_id, term), (student_id, ALL_TERMS)):
+                d = deltas.setdefault(key, [0, 0.0])
+                d[0] += sign
+                d[1] += sign * float(score)
+        if not deltas:
+            return
+
+        placeholders = ", ".join(
+            ["(%s, %s, (SELECT class_id FROM students WHERE id = %s), %s, %s, %s)"] * len(deltas))
+        params = [
+            v for (student_id, term), (count, total) in deltas.items()
+            for v in (student_id, term, student_id, count, total, total / count if count > 0 else None)
+        ]
+        cursor.execute(f"""
+            INSERT INTO student_averages (student_id, term, class_id, grade_count, score_sum, avg_score)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE
+                class_id = VALUES(class_id),
+                grade_count = grade_count + VALUES(grade_count),
+                score_sum = score_sum + VALUES(score_sum),
+                avg_score = IF(grade_count > 0, score_sum / grade_count, NULL)
+        """, params)
+
+    @staticmethod
+    def set_class(cursor, student_id, class_id):
+        """Follow a student moving class (call in the same transaction)."""
+        cursor.execute("UPDATE student_averages SET class_id = %s WHERE student_id = %s",
+                       (class_id, student_id))
+
+    @staticmethod
+    def clear_class(cursor, class_id):
+        """A deleted class leaves its students without one (students.class_id ON DELETE SET NULL)."""
+        cursor.execute("UPDATE student_averages SET class_id = NULL WHERE class_id = %s", (class_id,))
+
+    # ------------------------
+    # 🔍 RANK
+    # ------------------------
+    @staticmethod
+    def rank_with_cursor(cursor, student_id, scope='school', term=None):
+        """
+        Return {'rank', 'tied', 'avg_score'} for a student, or None if the
+        student has no grades in that term (or, for class and year scope, has
+        no class). Uses a plain (tuple) cursor. Both queries are index lookups:
+        a primary-key read of the student's own average, then a range scan
+        over (term[, class_id], avg_score >= mine).
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {SCOPES}")
+        term = term or ALL_TERMS
+
+        cursor.execute("""
+            SELECT sa.avg_score, sa.class_id, c.year
+            FROM student_averages sa
+            LEFT JOIN classes c ON c.id = sa.class_id
+            WHERE sa.student_id = %s AND sa.term = %s
+        """, (student_id, term))
+        me = cursor.fetchone()
+        if me is None or me[0] is None:
+            return None
+        avg_score, class_id, year = me
+        if scope != 'school' and class_id is None:
+            return None
+
+        scope_filter, scope_params = "", ()
+        if scope == 'class':
+            scope_filter = "AND sa.class_id = %s"
+            scope_params = (class_id,)
+        elif scope == 'year':
+            # One (term, class_id, avg_score) range per class of that year
+            scope_filter = "AND sa.class_id IN (SELECT id FROM classes WHERE year = %s)"
+            scope_params = (year,)
+
+        cursor.execute(f"""
+            SELECT
+                COALESCE(SUM(sa.avg_score > %s), 0) + 1 AS student_rank,
+                COALESCE(SUM(sa.avg_score = %s), 0) AS tied
+            FROM student_averages sa
+            WHERE sa.term = %s {scope_filter} AND sa.avg_score >= %s
+        """, (avg_score, avg_score, term, *scope_params, avg_score))
+        rank, tied = cursor.fetchone()
+        return {
+            'rank': int(rank),
+            'tied': int(tied),
+            'avg_score': round(float(avg_score), 2),
+        }
+
+    @staticmethod
+    def get_rank(student_id, scope='school', term=None):
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            return RankModel.rank_with_cursor(cursor, student_id, scope, term)
+        finally:
+            cursor.close()
+
+    # ------------------------
+    # 🔁 REBUILD
+    # ------------------------
+    @staticmethod
+    def rebuild(conn):
+        """Recompute student_averages from grades inside one transaction."""
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM student_averages")
+            cursor.execute("""
+                INSERT INTO student_averages (student_id, term, class_id, grade_count, score_sum, avg_score)
+                SELECT g.student_id, g.term, s.class_id, COUNT(*), SUM(g.score), AVG(g.score)
+                FROM grades g
+                JOIN students s ON s.id = g.student_id
+                GROUP BY g.student_id, g.term, s.class_id
+            """)
+            cursor.execute("""
+                INSERT INTO student_averages (student_id, term, class_id, grade_count, score_sum, avg_score)
+                SELECT g.student_id, %s, s.class_id, COUNT(*), SUM(g.score), AVG(g.score)
+                FROM grades g
+                JOIN students s ON s.id = g.student_id
+                GROUP BY g.student_id, s.class_id
+            """, (ALL_TERMS,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
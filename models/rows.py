@@ -0,0 +1,83 @@
+# ==============================================================
+# FILE: models/rows.py
+# PURPOSE: Compact result rows: a tuple with attribute and key access
+# ==============================================================
+#
+# A dictionary cursor allocates one dict per row, each with its own hash
+# table over the column names. A Row is a plain tuple subclass with
+# __slots__ = (), so a row costs about what the tuple from a normal cursor
+# costs; the column names live once on a class shared by every row of the
+# same shape. Rows read like the dicts they replace:
+#
+#     row.name, row['name'], row.get('name'), dict(row), row._asdict()
+#
+# Rows are read-only. Iterating a Row yields values (it is a tuple); use
+# keys() / items() for the mapping view. JSON responses should send
+# row._asdict(), because json serializes tuples as lists.
+
+from functools import lru_cache
+from operator import itemgetter
+
+
+class Row(tuple):
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return zip(self._fields, self)
+
+    def _asdict(self):
+        return dict(zip(self._fields, self))
+
+    def __repr__(self):
+        return f"Row({', '.join(f'{k}={v!r}' for k, v in zip(self._fields, self))})"
+
+    def __reduce__(self):
+        return (_rebuild, (self._fields, tuple(self)))
+
+
+@lru_cache(maxsize=256)
+def row_class(fields):
+    """The Row subclass for a tuple of column names (cached per result shape)."""
+    namespace = {'__slots__': (), '_fields': fields, '_index': {name: i for i, name in enumerate(fields)}}
+    for i, name in enumerate(fields):
+        if name.isidentifier() and not name.startswith('_'):
+            namespace[name] = property(itemgetter(i))
+    return type('Row', (Row,), namespace)
+
+
+def _rebuild(fields, values):
+    return row_class(fields)(values)
+
+
+def fetch_rows(cursor, batch_size=1000):
+    """fetchall() from a plain (tuple) cursor as a list of Rows."""
+    cls = row_class(tuple(d[0] for d in cursor.description))
+    rows = []
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return rows
+        rows.extend(map(cls, batch))
@@ -0,0 +1,497 @@
+# ==============================================================
+# FILE: models/sqlite_backend.py
+# PURPOSE: Embedded SQLite backend (file or in-memory) for tests and benchmarks
+# ==============================================================
+#
+# The models are written for MySQL. This module makes them run unchanged on
+# SQLite by translating each statement once (cached) before it executes:
+#
+#   %s placeholders            -> ?
+#   NOW() / CURDATE()          -> CURRENT_TIMESTAMP / CURRENT_DATE
+#   IF(c, a, b)                -> IIF(c, a, b)
+#   GROUP_CONCAT(x SEPARATOR s)-> GROUP_CONCAT(x, s)
+#   INSERT IGNORE              -> INSERT OR IGNORE
+#   ON DUPLICATE KEY UPDATE    -> ON CONFLICT DO UPDATE SET (VALUES(c) -> excluded.c,
+#                                 later assignments see earlier ones, as in MySQL)
+#   ... FOR UPDATE             -> dropped (SQLite locks the whole database on write)
+#   LIKE ?                     -> LIKE ? ESCAPE '\'  (MySQL's default escape)
+#   TRUNCATE TABLE t           -> DELETE FROM t
+#   SET FOREIGN_KEY_CHECKS = n -> PRAGMA foreign_keys; other SET statements are skipped
+#   UPDATE t a JOIN u b ON c   -> UPDATE t AS a SET ... FROM u AS b WHERE c AND ...
+#     SET ... WHERE w             (only when every assignment targets t)
+#
+# Anything else that is MySQL-only (multi-table UPDATE/DELETE that cannot be
+# rewritten, INTERVAL arithmetic, index hints, ...) raises ProgrammingError
+# instead of reaching SQLite as something that might mean something else.
+#
+# schema() translates the CREATE TABLE statements of migrations/create_table.py
+# (AUTO_INCREMENT, ENUM, inline INDEX/KEY, ON UPDATE CURRENT_TIMESTAMP, JSON).
+
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from models.backend import (Backend, DatabaseError, IntegrityError, OperationalError,
+                            ProgrammingError)
+
+# Values in and out: dates as ISO text, DECIMAL columns back as Decimal
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(sep=' '))
+sqlite3.register_converter('DATE', lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter('DATETIME', lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter('DECIMAL', lambda b: Decimal(b.decode()))
+
+
+# ==============================================================
+# 🔹 Errors: re-raise as the mysql.connector classes models already catch
+# ==============================================================
+_INTEGRITY_ERRNO = (
+    ('UNIQUE', 1062),       # ER_DUP_ENTRY
+    ('FOREIGN KEY', 1452),  # ER_NO_REFERENCED_ROW_2
+    ('NOT NULL', 1048),     # ER_BAD_NULL_ERROR
+    ('CHECK', 3819),        # ER_CHECK_CONSTRAINT_VIOLATED
+)
+
+
+@contextmanager
+def _mysql_errors():
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        errno = next((n for marker, n in _INTEGRITY_ERRNO if marker in str(e)), None)
+        raise IntegrityError(msg=str(e), errno=errno) from e
+    except sqlite3.OperationalError as e:
+        message = str(e)
+        if 'locked' in message or 'busy' in message:
+            raise OperationalError(msg=message, errno=1205) from e  # ER_LOCK_WAIT_TIMEOUT
+        if message.startswith('no such table'):
+            raise ProgrammingError(msg=message, errno=1146) from e
+        raise ProgrammingError(msg=message) from e
+    except sqlite3.Error as e:
+        raise DatabaseError(msg=str(e)) from e
+
+
+# ==============================================================
+# 🔹 Statement translation
+# ==============================================================
+_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)")
+
+_TOKEN_RULES = [
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'%%'), '%'),
+    (re.compile(r'\bNOW\(\s*\)', re.I), 'CURRENT_TIMESTAMP'),
+    (re.compile(r'\bCURDATE\(\s*\)', re.I), 'CURRENT_DATE'),
+    (re.compile(r'\bIF\s*\(', re.I), 'IIF('),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.I), 'INSERT OR IGNORE'),
+    (re.compile(r'\s+FOR\s+UPDATE\b', re.I), ''),
+    (re.compile(r'\s+LOCK\s+IN\s+SHARE\s+MODE\b', re.I), ''),
+    (re.compile(r'\bLIKE\s+\?(?!\s*ESCAPE)', re.I), r"LIKE ? ESCAPE '\\'"),
+]
+_SEPARATOR = re.compile(r'\s+SEPARATOR\s*$', re.I)
+_ODKU = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.I)
+_VALUES_REF = re.compile(r'\bVALUES\s*\(\s*`?(\w+)`?\s*\)', re.I)
+_SET_FK = re.compile(r'^SET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)$', re.I)
+_UPDATE_JOIN = re.compile(
+    r'^UPDATE\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!JOIN\b|INNER\b|LEFT\b|SET\b)`?(\w+)`?)?\s+'
+    r'((?:INNER\s+|LEFT\s+(?:OUTER\s+)?|CROSS\s+)?JOIN\b.*?)\s+SET\s+(.*)$', re.I | re.S)
+_JOIN_ITEM = re.compile(
+    r'(INNER\s+|LEFT\s+(?:OUTER\s+)?|CROSS\s+)?JOIN\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!ON\b)`?(\w+)`?)?'
+    r'\s+ON\s+(.*?)(?=\s+(?:(?:INNER|LEFT|CROSS)\s+(?:OUTER\s+)?)?JOIN\b|$)', re.I | re.S)
+_UNSUPPORTED = [
+    (re.compile(r'^DELETE\s+(?!FROM\b)', re.I), 'multi-table DELETE'),
+    (re.compile(r'^DELETE\s+FROM\s+\w+(?:\s+\w+)?\s+(?:\w+\s+)*JOIN\b', re.I), 'DELETE ... JOIN'),
+    (re.compile(r'\bINTERVAL\b', re.I), 'INTERVAL arithmetic'),
+    (re.compile(r'\bDATE_(?:ADD|SUB)\s*\(', re.I), 'DATE_ADD/DATE_SUB'),
+    (re.compile(r'\b(?:USE|FORCE|IGNORE)\s+INDEX\b', re.I), 'index hints'),
+    (re.compile(r'\bSTRAIGHT_JOIN\b', re.I), 'STRAIGHT_JOIN'),
+    (re.compile(r'\bSQL_CALC_FOUND_ROWS\b|\bFOUND_ROWS\s*\(', re.I), 'FOUND_ROWS'),
+]
+_TRUNCATE = re.compile(r'^TRUNCATE\s+(?:TABLE\s+)?`?(\w+)`?$', re.I)
+
+
+def _split_top_level(text, sep=','):
+    """Split on `sep` outside parentheses and quotes."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _rewrite_tokens(sql):
+    pieces = _LITERAL.split(sql)
+    for i in range(0, len(pieces), 2):  # even pieces are outside quotes
+        piece = pieces[i]
+        for pattern, replacement in _TOKEN_RULES:
+            piece = pattern.sub(replacement, piece)
+        if i + 1 < len(pieces):
+            piece = _SEPARATOR.sub(', ', piece)
+        pieces[i] = piece
+    return ''.join(pieces)
+
+
+def _rewrite_upsert(sql):
+    head, assignments = _ODKU.split(sql, maxsplit=1)
+    translated = {}
+    clauses = []
+    for assignment in _split_top_level(assignments):
+        column, _, expr = assignment.partition('=')
+        column = column.strip().strip('`')
+        expr = _VALUES_REF.sub(r'excluded.\1', expr.strip())
+        # MySQL evaluates assignments left to right, so a column already
+        # assigned in this clause means its new value; SQLite always reads
+        # the old row, so substitute the earlier expression
+        for earlier, earlier_expr in translated.items():
+            expr = re.sub(rf'(?<![.\w]){re.escape(earlier)}(?!\w)', f'({earlier_expr})', expr)
+        translated[column] = expr
+        clauses.append(f"{column} = {expr}")
+    return f"{head.rstrip()} ON CONFLICT DO UPDATE SET {', '.join(clauses)}"
+
+
+def _find_top_level(text, keyword):
+    """Index of `keyword` (a regex) outside parentheses and quotes, or -1."""
+    depth, quote = 0, None
+    pattern = re.compile(rf'\s{keyword}\b', re.I)
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and pattern.match(text, i):
+            return i
+    return -1
+
+
+def _unsupported(what, sql):
+    return ProgrammingError(msg=f"SQLite backend cannot translate {what}: {' '.join(sql.split())[:200]}",
+                            errno=1235)  # ER_NOT_SUPPORTED_YET
+
+
+def _rewrite_update_join(match, sql):
+    table, alias, joins, rest = match.groups()
+    target = alias or table
+    cut = _find_top_level(rest, 'WHERE')
+    assignments, where = (rest[:cut], rest[cut:].strip()[5:].strip()) if cut >= 0 else (rest, None)
+
+    sources, conditions = [], []
+    for kind, join_table, join_alias, condition in _JOIN_ITEM.findall(joins.strip()):
+        if kind.strip().upper().startswith('LEFT'):
+            raise _unsupported('UPDATE ... LEFT JOIN', sql)
+        sources.append(f"{join_table} AS {join_alias}" if join_alias else join_table)
+        conditions.append(f"({condition.strip()})")
+    if not sources or len(sources) != len(re.findall(r'\bJOIN\b', joins, re.I)):
+        raise _unsupported('this UPDATE ... JOIN', sql)
+
+    clauses = []
+    for assignment in _split_top_level(assignments):
+        column, _, expr = assignment.partition('=')
+        owner, _, name = column.strip().rpartition('.')
+        if owner and owner.strip('`') not in (target, table):
+            raise _unsupported(f"UPDATE ... JOIN that sets columns of {owner} (split it per table)", sql)
+        clauses.append(f"{name.strip('`')} = {expr.strip()}")
+    if where:
+        conditions.append(f"({where})")
+    return (f"UPDATE {table} AS {target} SET {', '.join(clauses)} "
+            f"FROM {', '.join(sources)} WHERE {' AND '.join(conditions)}")
+
+
+@lru_cache(maxsize=2048)
+def translate(sql):
+    """
+    Return the SQLite form of a MySQL statement, or None if it has no SQLite
+    equivalent and can be skipped (SET session variables). Raises
+    ProgrammingError for MySQL-only constructs it cannot express.
+    """
+    statement = sql.strip().rstrip(';').strip()
+
+    match = _SET_FK.match(statement)
+    if match:
+        return f"PRAGMA foreign_keys = {'ON' if match.group(1) == '1' else 'OFF'}"
+    if re.match(r'^SET\s', statement, re.I):
+        return None
+    match = _TRUNCATE.match(statement)
+    if match:
+        return f"DELETE FROM {match.group(1)}"
+
+    outside_quotes = ' '.join(_LITERAL.split(statement)[::2])
+    for pattern, what in _UNSUPPORTED:
+        if pattern.search(outside_quotes):
+            raise _unsupported(what, statement)
+
+    match = _UPDATE_JOIN.match(statement)
+    if match:
+        statement = _rewrite_update_join(match, statement)
+    elif _ODKU.search(statement):
+        statement = _rewrite_upsert(statement)
+    return _rewrite_tokens(statement)
+
+
+# ==============================================================
+# 🔹 Schema translation (CREATE TABLE / DROP TABLE)
+# ==============================================================
+_CREATE = re.compile(r'^CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*)\)[^)]*$', re.I | re.S)
+_DROP = re.compile(r'^DROP\s+TABLE\s+(IF\s+EXISTS\s+)?(.*)$', re.I | re.S)
+_INDEX = re.compile(r'^(?:INDEX|KEY)\s+`?(\w+)`?\s*(\(.*\))$', re.I | re.S)
+_UNIQUE_KEY = re.compile(r'^UNIQUE\s+(?:KEY|INDEX)\s+`?(\w+)`?\s*(\(.*\))$', re.I | re.S)
+_ENUM = re.compile(r'^(`?\w+`?)\s+ENUM\s*\((.*?)\)(.*)$', re.I | re.S)
+_TEXT_TYPE = re.compile(r'^(`?\w+`?\s+(?:VARCHAR|CHAR|TEXT)\b(?:\s*\(\d+\))?)', re.I)
+
+
+def _translate_column(item):
+    match = _ENUM.match(item)
+    if match:
+        column, values, rest = match.groups()
+        item = f"{column} TEXT COLLATE NOCASE CHECK ({column} IN ({values})){rest}"
+    else:
+        # MySQL's default collations compare text case-insensitively
+        item = _TEXT_TYPE.sub(r'\1 COLLATE NOCASE', item)
+    item = re.sub(r'\bINT(?:EGER)?\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT',
+                  item, flags=re.I)
+    # 'DECIMAL FLOAT' keeps REAL affinity (NUMERIC would store 170.0 as the integer 170
+    # and make score_sum / grade_count an integer division) and the DECIMAL converter
+    item = re.sub(r'\bDECIMAL\s*\((\d+)\s*,\s*(\d+)\)', r'DECIMAL FLOAT(\1,\2)', item, flags=re.I)
+    item = re.sub(r'\bJSON\b', 'TEXT', item, flags=re.I)
+    return item
+
+
+def translate_ddl(statement):
+    """Return the SQLite statements for one MySQL DDL statement."""
+    statement = statement.strip().rstrip(';').strip()
+
+    match = _DROP.match(statement)
+    if match:
+        exists = 'IF EXISTS ' if match.group(1) else ''
+        return [f"DROP TABLE {exists}{t.strip('` ')}" for t in _split_top_level(match.group(2))]
+
+    match = _CREATE.match(statement)
+    if not match:
+        translated = translate(statement)
+        return [translated] if translated else []
+
+    if_not_exists, table, body = match.groups()
+    if_not_exists = 'IF NOT EXISTS ' if if_not_exists else ''
+    items, extra = [], []
+    for item in _split_top_level(body):
+        index = _INDEX.match(item)
+        unique = _UNIQUE_KEY.match(item)
+        if unique:
+            items.append(f"CONSTRAINT {unique.group(1)} UNIQUE {unique.group(2)}")
+        elif index:
+            extra.append(f"CREATE INDEX {index.group(1)} ON {table} {index.group(2)}")
+        else:
+            if re.search(r'\bON\s+UPDATE\s+CURRENT_TIMESTAMP\b', item, re.I):
+                item = re.sub(r'\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b', '', item, flags=re.I)
+                column = item.split()[0].strip('`')
+                extra.append(
+                    f"CREATE TRIGGER trg_{table}_{column} AFTER UPDATE ON {table} FOR EACH ROW "
+                    f"WHEN NEW.{column} IS OLD.{column} "
+                    f"BEGIN UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid; END"
+                )
+            items.append(_translate_column(item))
+    if if_not_exists:
+        extra = [e.replace('CREATE INDEX ', 'CREATE INDEX IF NOT EXISTS ', 1)
+                  .replace('CREATE TRIGGER ', 'CREATE TRIGGER IF NOT EXISTS ', 1) for e in extra]
+    return [f"CREATE TABLE {if_not_exists}{table} (\n    " + ',\n    '.join(items) + "\n)"] + extra
+
+
+# ==============================================================
+# 🔹 Connection / cursor (the mysql.connector surface the models use)
+# ==============================================================
+class SQLiteCursor:
+    def __init__(self, raw, dictionary=False):
+        self._raw = raw
+        self._dictionary = dictionary
+        self._skipped = False
+
+    @property
+    def description(self):
+        return None if self._skipped else self._raw.description
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self.description or ())
+
+    @property
+    def lastrowid(self):
+        return self._raw.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._raw.rowcount
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def execute(self, sql, params=()):
+        statement = translate(sql)
+        self._skipped = statement is None
+        if statement is not None:
+            with _mysql_errors():
+                self._raw.execute(statement, tuple(params or ()))
+
+    def executemany(self, sql, seq_of_params):
+        statement = translate(sql)
+        self._skipped = statement is None
+        if statement is not None:
+            with _mysql_errors():
+                self._raw.executemany(statement, (tuple(p) for p in seq_of_params))
+
+    def fetchone(self):
+        if self._skipped:
+            return None
+        with _mysql_errors():
+            return self._row(self._raw.fetchone())
+
+    def fetchmany(self, size=1):
+        if self._skipped:
+            return []
+        with _mysql_errors():
+            return [self._row(r) for r in self._raw.fetchmany(size)]
+
+    def fetchall(self):
+        if self._skipped:
+            return []
+        with _mysql_errors():
+            return [self._row(r) for r in self._raw.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteConnection:
+    def __init__(self, raw):
+        self._raw = raw
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def cursor(self, dictionary=False, buffered=None, **_):
+        # sqlite3 cursors already step through results lazily, so buffered=False needs nothing extra
+        return SQLiteCursor(self._raw.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        with _mysql_errors():
+            self._raw.execute("BEGIN")
+
+    def commit(self):
+        with _mysql_errors():
+            self._raw.commit()
+
+    def rollback(self):
+        with _mysql_errors():
+            self._raw.rollback()
+
+    def ping(self, reconnect=False):
+        with _mysql_errors():
+            self._raw.execute("SELECT 1").fetchone()
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except DatabaseError:
+            return False
+
+    def close(self):
+        self._raw.close()
+
+
+# ==============================================================
+# 🔹 Backend
+# ==============================================================
+class SQLiteBackend(Backend):
+    """
+    path=':memory:' gives every backend instance its own private in-memory
+    database (memdb VFS), shared by all of that instance's connections, so a
+    test or benchmark run can create as many isolated databases as it likes.
+    Any other path is a database file (WAL mode).
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=':memory:', busy_timeout=5.0):
+        self.memory = path in (':memory:', '')
+        self.path = f"file:/sms-{uuid.uuid4().hex}?vfs=memdb" if self.memory else path
+        self.busy_timeout = busy_timeout
+        self._anchor = None
+        self._lock = threading.Lock()
+        if self.memory:
+            # An in-memory database lives while at least one connection is open
+            self._anchor = self._open()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(path=config.get('SQLITE_PATH') or ':memory:')
+
+    def _open(self):
+        raw = sqlite3.connect(self.path, uri=self.memory, timeout=self.busy_timeout,
+                              detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        raw.execute("PRAGMA foreign_keys = ON")
+        if not self.memory:
+            raw.execute("PRAGMA journal_mode = WAL")
+            raw.execute("PRAGMA synchronous = NORMAL")
+        return raw
+
+    def connect(self):
+        return SQLiteConnection(self._open())
+
+    def schema(self, statements):
+        return [s for statement in statements for s in translate_ddl(statement)]
+
+    transactional_ddl = True
+
+    def table_exists(self, cursor, table):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        return cursor.fetchone()[0] > 0
+
+    def columns(self, cursor, table):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def indexes(self, cursor, table, unique_only=False):
+        cursor.execute(f"PRAGMA index_list({table})")
+        names = [row[1] for row in cursor.fetchall() if row[3] != 'pk' and (row[2] or not unique_only)]
+        result = {}
+        for name in names:
+            cursor.execute(f"PRAGMA index_info({name})")
+            result[name] = [row[2] for row in sorted(cursor.fetchall())]
+        return result
+
+    def close(self):
+        """Drop an in-memory database (closes the connection that keeps it alive)."""
+        with self._lock:
+            if self._anchor is not None:
+                self._anchor.close()
+                self._anchor = None
+
+    def describe(self):
+        return 'sqlite://:memory:' if self.memory else f"sqlite:///{self.path}"
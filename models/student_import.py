@@ -0,0 +1,269 @@
+# ==============================================================
+# FILE: models/student_import.py
+# PURPOSE: Streaming student enrollment import (CSV / XLSX)
+# ==============================================================
+
+import csv
+import io
+import logging
+import os
+import re
+from datetime import date, datetime
+from itertools import islice
+
+from models.audit_model import audit
+from models.cache import invalidate_dashboard
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('name', 'gender', 'dob', 'email', 'contact', 'address', 'class', 'year', 'status')
+GENDERS = {'male': 'Male', 'm': 'Male', 'female': 'Female', 'f': 'Female', 'other': 'Other'}
+STATUSES = ('active', 'inactive')
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y')
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+# ==============================================================
+# 🔹 Readers: yield (line_number, {column: value}) one row at a time
+# ==============================================================
+def read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {(k or '').strip().lower(): v for k, v in row.items() if k}
+
+
+def read_xlsx(path_or_file):
+    """First worksheet, first row as header; openpyxl read-only mode keeps memory flat."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise RuntimeError("XLSX import needs openpyxl (pip install openpyxl)") from e
+
+    workbook = load_workbook(path_or_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h or '').strip().lower() for h in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if values is None or all(v in (None, '') for v in values):
+                continue
+            yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(source, filename):
+    """Pick a reader from the file extension; `source` is a path or a binary file object."""
+    if os.path.splitext(filename)[1].lower() in ('.xlsx', '.xlsm'):
+        return read_xlsx(source)
+    if isinstance(source, (str, bytes, os.PathLike)):
+        return _read_csv_path(source)
+    return read_csv(io.TextIOWrapper(source, encoding='utf-8-sig', newline=''))
+
+
+def _read_csv_path(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from read_csv(f)
+
+
+# ==============================================================
+# 🔹 Importer
+# ==============================================================
+class StudentImporter:
+    """
+    Validates enrollment rows and writes `students` in multi-row INSERTs,
+    one transaction per `chunk_size` rows. Only the current chunk is held in
+    memory. Class names are resolved through one map loaded up front. Add a
+    `year` column when the same class name exists in more than one year.
+
+    Rows that fail are passed to `on_error(line, row, message)`; see
+    ErrorReport for a CSV writer.
+    """
+
+    def __init__(self, conn, chunk_size=1000, dry_run=False, on_error=None):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.on_error = on_error or (lambda line, row, message: None)
+        self.totals = {'rows': 0, 'imported': 0, 'errors': 0}
+        self.classes = self._load_classes()
+        # In a real run earlier chunks are already committed, so the database
+        # check catches repeated emails; a dry run has to remember them.
+        self._dry_run_emails = set()
+
+    def _load_classes(self):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT id, name, year FROM classes")
+            classes = {}
+            for class_id, name, year in cursor.fetchall():
+                classes.setdefault(name.strip().lower(), []).append((class_id, year))
+        finally:
+            cursor.close()
+        return classes
+
+    # ------------------------
+    # ▶️ RUN
+    # ------------------------
+    def run(self, numbered_rows):
+        rows = iter(numbered_rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._process_chunk(chunk)
+        if self.totals['imported'] and not self.dry_run:
+            invalidate_dashboard()
+            audit('student.import', 'student', None,
+                  {'imported': self.totals['imported'], 'errors': self.totals['errors']})
+        return self.totals
+
+    def _fail(self, line, row, message):
+        self.totals['errors'] += 1
+        self.on_error(line, row, message)
+
+    def _process_chunk(self, chunk):
+        valid = []
+        chunk_emails = set()
+        for line, raw in chunk:
+            self.totals['rows'] += 1
+            try:
+                record = self._validate(raw)
+            except ValueError as e:
+                self._fail(line, raw, str(e))
+                continue
+            email = record[3]
+            if email:
+                if email in chunk_emails or email in self._dry_run_emails:
+                    self._fail(line, raw, 'duplicate email in file')
+                    continue
+                chunk_emails.add(email)
+            valid.append((line, raw, record))
+
+        taken = self._existing_emails(chunk_emails)
+        rows = []
+        for line, raw, record in valid:
+            if record[3] and record[3] in taken:
+                self._fail(line, raw, 'email already exists')
+            else:
+                rows.append((line, raw, record))
+        if not rows:
+            return
+
+        if self.dry_run:
+            self._dry_run_emails.update(r[2][3] for r in rows if r[2][3])
+            self.totals['imported'] += len(rows)
+            return
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                INSERT INTO students (name, gender, dob, email, contact, address, class_id, status)
+                VALUES {', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s)'] * len(rows))}
+            """, [v for _, _, record in rows for v in record])
+            self.conn.commit()
+            self.totals['imported'] += len(rows)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"❌ Student import chunk failed (lines {rows[0][0]}-{rows[-1][0]}): {e}")
+            for line, raw, _ in rows:
+                self._fail(line, raw, f"insert failed: {e}")
+        finally:
+            cursor.close()
+
+    def _existing_emails(self, emails):
+        if not emails:
+            return set()
+        emails = list(emails)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT LOWER(email) FROM students WHERE email IN ({', '.join(['%s'] * len(emails))})",
+                           emails)
+            return {e for (e,) in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    # ------------------------
+    # ✅ VALIDATION
+    # ------------------------
+    def _validate(self, raw):
+        """Return the students row tuple for `raw`, or raise ValueError with the reason."""
+        def text(key):
+            value = raw.get(key)
+            return str(value).strip() if value not in (None, '') else None
+
+        name = text('name')
+        if not name:
+            raise ValueError('name is required')
+        if len(name) > 150:
+            raise ValueError('name is longer than 150 characters')
+
+        gender = text('gender')
+        if gender:
+            gender = GENDERS.get(gender.lower())
+            if gender is None:
+                raise ValueError('gender must be Male, Female or Other')
+
+        dob = self._parse_date(raw.get('dob'))
+
+        email = text('email')
+        if email:
+            email = email.lower()
+            if not _EMAIL.match(email):
+                raise ValueError('invalid email')
+
+        status = (text('status') or 'active').lower()
+        if status not in STATUSES:
+            raise ValueError('status must be active or inactive')
+
+        class_id = None
+        class_name = text('class')
+        if class_name:
+            class_id = self._resolve_class(class_name, text('year'))
+
+        return (name, gender, dob, email, text('contact'), text('address'), class_id, status)
+
+    @staticmethod
+    def _parse_date(value):
+        if value in (None, ''):
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(str(value).strip(), fmt).date()
+            except ValueError:
+                continue
+        raise ValueError(f"unrecognised date of birth '{value}' (use YYYY-MM-DD)")
+
+    def _resolve_class(self, class_name, year):
+        matches = self.classes.get(class_name.lower())
+        if not matches:
+            raise ValueError(f"unknown class '{class_name}'")
+        if year:
+            matches = [m for m in matches if str(m[1]) == str(year).split('.')[0]]
+            if not matches:
+                raise ValueError(f"class '{class_name}' has no {year} intake")
+        if len(matches) > 1:
+            raise ValueError(f"class name '{class_name}' is used in several years; add a year column")
+        return matches[0][0]
+
+
+class ErrorReport:
+    """on_error callback that appends failed rows (with the reason) to a CSV file as they happen."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=('line', 'error') + COLUMNS, extrasaction='ignore')
+        self._writer.writeheader()
+        self.count = 0
+
+    def __call__(self, line, row, message):
+        self._writer.writerow({**row, 'line': line, 'error': message})
+        self.count += 1
+
+    def close(self):
+        self._file.close()
@@ -1,9 +1,19 @@
 # models/student_model.py
-from models.db import get_db
+import logging
+from models.db import get_db, stream_rows
+from models.cache import invalidate_dashboard
+from models.grade_model import GradeModel
+from models.rank_model import RankModel
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 class StudentModel:
     """Model for managing students."""
 
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
     # ------------------------
     # 🔍 READ
     # ------------------------
@@ -11,7 +21,7 @@ class StudentModel:
     def get_all():
         """Fetch all students with their class info."""
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT 
                 s.id, s.name, s.gender, s.dob, s.email, s.contact, s.address,
@@ -20,10 +30,84 @@ class StudentModel:
             LEFT JOIN classes c ON s.class_id = c.id
             ORDER BY s.id DESC
         """)
-        students = cursor.fetchall()
+        students = fetch_rows(cursor)
         cursor.close()
         return students
 
+    @staticmethod
+    def get_page(after_id=None, class_id=None, status=None, gender=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Fetch one page of students (newest first) using keyset pagination on s.id.
+        Returns (students, next_cursor); next_cursor is None on the last page.
+        """
+        limit = max(1, min(int(limit or StudentModel.DEFAULT_PAGE_SIZE), StudentModel.MAX_PAGE_SIZE))
+
+        conditions = []
+        params = []
+        if after_id:
+            conditions.append("s.id < %s")
+            params.append(after_id)
+        if class_id:
+            conditions.append("s.class_id = %s")
+            params.append(class_id)
+        if status:
+            conditions.append("s.status = %s")
+            params.append(status)
+        if gender:
+            conditions.append("s.gender = %s")
+            params.append(gender)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit + 1)
+
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(f"""
+            SELECT 
+                s.id, s.name, s.gender, s.dob, s.email, s.contact, s.address,
+                s.image, s.status, c.name AS class_name
+            FROM students s
+            LEFT JOIN classes c ON s.class_id = c.id
+            {where}
+            ORDER BY s.id DESC
+            LIMIT %s
+        """, tuple(params))
+        students = fetch_rows(cursor)
+        cursor.close()
+
+        next_cursor = None
+        if len(students) > limit:
+            students = students[:limit]
+            next_cursor = students[-1]['id']
+        return students, next_cursor
+
+    EXPORT_HEADER = ('ID', 'Name', 'Gender', 'Date of Birth', 'Email', 'Contact', 'Address', 'Class', 'Status')
+
+    @staticmethod
+    def iter_export(class_id=None, status=None, gender=None):
+        """Stream every student matching the list-page filters as tuples (see EXPORT_HEADER)."""
+        conditions = []
+        params = []
+        if class_id:
+            conditions.append("s.class_id = %s")
+            params.append(class_id)
+        if status:
+            conditions.append("s.status = %s")
+            params.append(status)
+        if gender:
+            conditions.append("s.gender = %s")
+            params.append(gender)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        return stream_rows(f"""
+            SELECT s.id, s.name, s.gender, s.dob, s.email, s.contact, s.address,
+                   c.name AS class_name, s.status
+            FROM students s
+            LEFT JOIN classes c ON s.class_id = c.id
+            {where}
+            ORDER BY s.id DESC
+        """, tuple(params))
+
     @staticmethod
     def get_by_id(student_id):
         """Fetch a student by ID."""
@@ -54,10 +138,11 @@ class StudentModel:
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (name, gender, dob, email, contact, address, class_id, image, status))
             db.commit()
-            print(f"✅ Student '{name}' added successfully.")
+            invalidate_dashboard()
+            logger.info(f"✅ Student '{name}' added successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error adding student: {e}")
+            logger.error(f"❌ Error adding student: {e}")
         finally:
             cursor.close()
 
@@ -102,18 +187,21 @@ class StudentModel:
                 params.append(status)
 
             if not updates:
-                print("⚠️ No fields provided for update.")
+                logger.warning("⚠️ No fields provided for update.")
                 return
 
             query = f"UPDATE students SET {', '.join(updates)} WHERE id = %s"
             params.append(student_id)
 
             cursor.execute(query, tuple(params))
+            if class_id:
+                RankModel.set_class(cursor, student_id, class_id)
             db.commit()
-            print(f"✅ Student ID {student_id} updated successfully.")
+            invalidate_dashboard()
+            logger.info(f"✅ Student ID {student_id} updated successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error updating student: {e}")
+            logger.error(f"❌ Error updating student: {e}")
         finally:
             cursor.close()
 
@@ -126,11 +214,14 @@ class StudentModel:
         db = get_db()
         cursor = db.cursor()
         try:
+            # Grades cascade with the student; take them out of the rollups first
+            GradeModel.before_parent_delete(cursor, student_id=student_id)
             cursor.execute("DELETE FROM students WHERE id = %s", (student_id,))
             db.commit()
-            print(f"🗑️ Student ID {student_id} deleted successfully.")
+            invalidate_dashboard()
+            logger.info(f"🗑️ Student ID {student_id} deleted successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error deleting student: {e}")
+            logger.error(f"❌ Error deleting student: {e}")
         finally:
             cursor.close()
@@ -1,4 +1,10 @@
+import logging
 from models.db import get_db
+from models.cache import invalidate_dashboard
+from models.grade_model import GradeModel
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 class SubjectModel:
     """Model for managing subjects with many-to-many teacher assignments."""
@@ -10,7 +16,7 @@ class SubjectModel:
     def get_all():
         """Fetch all subjects with related class and assigned teachers."""
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT 
                 s.id AS subject_id,
@@ -26,7 +32,7 @@ class SubjectModel:
             GROUP BY s.id, s.name, s.image, c.name
             ORDER BY s.id DESC
         """)
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         return data
     
@@ -35,7 +41,7 @@ class SubjectModel:
     def get_all_subject_teacher():
         """Fetch all subjects with related class and assigned teachers including assignment metadata."""
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT 
                 s.id AS subject_id,
@@ -54,7 +60,7 @@ class SubjectModel:
             GROUP BY s.id, s.name, s.image, c.name, st.id, st.teacher_id, st.assigned_at
             ORDER BY s.id DESC
         """)
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         return data
     
@@ -98,10 +104,10 @@ class SubjectModel:
                 VALUES (%s, %s, %s)
             """, (name, class_id, image))
             db.commit()
-            print(f"✅ Subject '{name}' added successfully.")
+            logger.info(f"✅ Subject '{name}' added successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error adding subject: {e}")
+            logger.error(f"❌ Error adding subject: {e}")
         finally:
             cursor.close()
 
@@ -125,16 +131,16 @@ class SubjectModel:
                 updates.append("image = %s")
                 params.append(image)
             if not updates:
-                print("⚠️ No fields to update for subject.")
+                logger.warning("⚠️ No fields to update for subject.")
                 return
             query = f"UPDATE subjects SET {', '.join(updates)} WHERE id = %s"
             params.append(subject_id)
             cursor.execute(query, tuple(params))
             db.commit()
-            print(f"✅ Subject ID {subject_id} updated successfully.")
+            logger.info(f"✅ Subject ID {subject_id} updated successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error updating subject: {e}")
+            logger.error(f"❌ Error updating subject: {e}")
         finally:
             cursor.close()
 
@@ -172,10 +178,10 @@ class SubjectModel:
                 WHERE subject_id = %s AND teacher_id = %s
             """, (subject_id, teacher_id))
             db.commit()
-            print(f"🗑️ Removed teacher ID {teacher_id} from subject ID {subject_id}.")
+            logger.info(f"🗑️ Removed teacher ID {teacher_id} from subject ID {subject_id}.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error removing teacher: {e}")
+            logger.error(f"❌ Error removing teacher: {e}")
         finally:
             cursor.close()
 
@@ -187,11 +193,14 @@ class SubjectModel:
         db = get_db()
         cursor = db.cursor()
         try:
+            # Grades cascade with the subject; take them out of the rollups first
+            GradeModel.before_parent_delete(cursor, subject_id=subject_id)
             cursor.execute("DELETE FROM subjects WHERE id = %s", (subject_id,))
             db.commit()
-            print(f"🗑️ Subject ID {subject_id} deleted successfully.")
+            invalidate_dashboard()
+            logger.info(f"🗑️ Subject ID {subject_id} deleted successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error deleting subject: {e}")
+            logger.error(f"❌ Error deleting subject: {e}")
         finally:
             cursor.close()
@@ -1,4 +1,10 @@
+import logging
 from models.db import get_db
+from models.cache import invalidate_dashboard
+from models.audit_model import audit
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 class TeacherModel:
     """Model for managing teacher-related operations."""
@@ -10,7 +16,7 @@ class TeacherModel:
     def get_all_teachers():
         """Fetch all teachers with user info."""
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         cursor.execute("""
             SELECT 
                 u.id, u.username, u.email, u.image, u.status, 
@@ -19,7 +25,7 @@ class TeacherModel:
             JOIN users u ON t.user_id = u.id
             ORDER BY u.username ASC
         """)
-        data = cursor.fetchall()
+        data = fetch_rows(cursor)
         cursor.close()
         return data
 
@@ -58,20 +64,23 @@ class TeacherModel:
             cursor.execute("""
                 INSERT INTO users (username, email, password_hash, role, image)
                 VALUES (%s, %s, %s, 'teacher', %s)
-            """, (username, email, password_hash, department, image))
+            """, (username, email, password_hash, image))
             user_id = cursor.lastrowid
 
-            # Insert into teachers table
+            # Insert into teachers table (name is required; the username stands in)
             cursor.execute("""
-                INSERT INTO teachers (user_id, specialization)
-                VALUES (%s, %s)
-            """, (user_id, department))
+                INSERT INTO teachers (user_id, name, email, specialization)
+                VALUES (%s, %s, %s, %s)
+            """, (user_id, username, email, department))
 
             db.commit()
-            print(f"✅ Teacher '{username}' added successfully.")
+            invalidate_dashboard()
         except Exception as e:
             db.rollback()
-            print(f"❌ Error adding teacher: {e}")
+            logger.error(f"❌ Error adding teacher: {e}")
+        else:
+            audit('teacher.create', 'user', user_id, {'username': username, 'specialization': department})
+            logger.info(f"✅ Teacher '{username}' added successfully.")
         finally:
             cursor.close()
 
@@ -87,39 +96,40 @@ class TeacherModel:
         db = get_db()
         cursor = db.cursor()
         try:
-            updates = []
+            user_updates = []
             params = []
 
             if username:
-                updates.append("u.username = %s")
+                user_updates.append("username = %s")
                 params.append(username)
             if email:
-                updates.append("u.email = %s")
+                user_updates.append("email = %s")
                 params.append(email)
-            if department:
-                updates.append("t.specialization = %s")
-                params.append(department)
             if image:
-                updates.append("u.image = %s")
+                user_updates.append("image = %s")
                 params.append(image)
 
-            if not updates:
-                print("⚠️ No fields to update for teacher.")
+            if not user_updates and not department:
+                logger.warning("⚠️ No fields to update for teacher.")
                 return
 
-            query = f"""
-                UPDATE users u
-                JOIN teachers t ON u.id = t.user_id
-                SET {', '.join(updates)}
-                WHERE u.id = %s
-            """
-            params.append(teacher_id)
-            cursor.execute(query, tuple(params))
+            # One single-table UPDATE per table (same transaction), so the
+            # statement is portable instead of MySQL's multi-table UPDATE ... JOIN
+            if user_updates:
+                cursor.execute(f"""
+                    UPDATE users
+                    SET {', '.join(user_updates)}
+                    WHERE id = %s AND id IN (SELECT user_id FROM teachers)
+                """, (*params, teacher_id))
+            if department:
+                cursor.execute("""
+                    UPDATE teachers SET specialization = %s WHERE user_id = %s
+                """, (department, teacher_id))
             db.commit()
-            print(f"✅ Teacher ID {teacher_id} updated successfully.")
+            logger.info(f"✅ Teacher ID {teacher_id} updated successfully.")
         except Exception as e:
             db.rollback()
-            print(f"❌ Error updating teacher: {e}")
+            logger.error(f"❌ Error updating teacher: {e}")
         finally:
             cursor.close()
 
@@ -135,9 +145,12 @@ class TeacherModel:
             cursor.execute("DELETE FROM teachers WHERE user_id = %s", (teacher_id,))
             cursor.execute("DELETE FROM users WHERE id = %s", (teacher_id,))
             db.commit()
-            print(f"🗑️ Teacher ID {teacher_id} deleted successfully.")
+            invalidate_dashboard()
         except Exception as e:
             db.rollback()
-            print(f"❌ Error deleting teacher: {e}")
+            logger.error(f"❌ Error deleting teacher: {e}")
+        else:
+            audit('teacher.delete', 'user', teacher_id)
+            logger.info(f"🗑️ Teacher ID {teacher_id} deleted successfully.")
         finally:
             cursor.close()
@@ -0,0 +1,146 @@
+# ==============================================================
+# FILE: models/unit_of_work.py
+# PURPOSE: Group several model writes into one transaction (one commit)
+# ==============================================================
+#
+# Model methods commit on their own. Inside a unit of work they join the
+# request's connection (get_db()) instead: their db.commit() is deferred to
+# the end of the outermost scope and their db.rollback() marks the scope as
+# failed. Nested scopes are savepoints, so an inner failure can be caught
+# without losing the outer work:
+#
+#     with unit_of_work():
+#         TeacherModel.add_teacher(...)
+#         SubjectModel.assign_teacher_to_subject(...)
+#
+#     @unit_of_work()          # request-scoped: the whole view is one transaction
+#     def enroll(): ...
+#
+# Side effects that must only happen once the data is committed (dashboard
+# cache invalidation, audit events) go through on_commit(). With no scope open
+# everything behaves as before: each method commits immediately.
+
+import itertools
+import logging
+from contextlib import contextmanager
+
+from flask import g, has_app_context
+
+from models.backend import Error
+from models.db import get_db
+
+logger = logging.getLogger(__name__)
+
+_savepoint_ids = itertools.count(1)
+
+
+class UnitOfWorkRolledBack(RuntimeError):
+    """A model method inside the scope failed, so the scope's writes were rolled back."""
+
+
+class Scope:
+    def __init__(self, conn, parent=None):
+        self.conn = conn
+        self.parent = parent
+        self.savepoint = f"uow_{next(_savepoint_ids)}" if parent else None
+        self.failed = False
+        self.abandoned = False
+        self.callbacks = []
+
+    def fail(self):
+        """Called when a model method inside the scope rolls back."""
+        self.failed = True
+
+    def rollback(self):
+        """Discard this scope's writes when it ends, without raising."""
+        self.abandoned = True
+
+    # ------------------------
+    # 🔧 Begin / end
+    # ------------------------
+    def _execute(self, sql):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def begin(self):
+        if self.savepoint:
+            self._execute(f"SAVEPOINT {self.savepoint}")
+        elif not self.conn.in_transaction:
+            self.conn.start_transaction()
+
+    def commit(self):
+        if self.savepoint:
+            self._execute(f"RELEASE SAVEPOINT {self.savepoint}")
+            self.parent.callbacks.extend(self.callbacks)
+            return
+        self.conn.commit()
+        for callback in self.callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"❌ on_commit callback failed: {e}")
+
+    def discard(self):
+        self.callbacks = []
+        if not self.savepoint:
+            self.conn.rollback()
+            return
+        try:
+            self._execute(f"ROLLBACK TO SAVEPOINT {self.savepoint}")
+            self._execute(f"RELEASE SAVEPOINT {self.savepoint}")
+        except Error as e:
+            # The engine already rolled back the whole transaction (deadlock,
+            # lock wait timeout), so the enclosing scopes cannot commit either
+            logger.warning(f"⚠️ Savepoint {self.savepoint} is gone ({e}); failing the outer scope")
+            self.parent.fail()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Open a unit of work on the request's connection; nested calls become
+    savepoints. Commits when the block ends, rolls back if it raises. If a
+    model method inside failed (and only logged it) the writes are rolled
+    back and UnitOfWorkRolledBack is raised. Usable as a decorator.
+    """
+    conn = get_db()
+    parent = conn.scopes[-1] if conn.scopes else None
+    scope = Scope(conn, parent)
+    scope.begin()
+    conn.scopes.append(scope)
+    try:
+        yield scope
+    except BaseException:
+        conn.scopes.pop()
+        scope.discard()
+        raise
+
+    conn.scopes.pop()
+    if scope.failed or scope.abandoned:
+        scope.discard()
+        if scope.failed:
+            raise UnitOfWorkRolledBack("A step in the unit of work failed; its changes were rolled back.")
+        return
+    scope.commit()
+
+
+def current_scope():
+    """The innermost open scope on this request's connection, or None."""
+    if not has_app_context():
+        return None
+    conn = g.get('db')
+    if conn is None or conn.released or not conn.scopes:
+        return None
+    return conn.scopes[-1]
+
+
+def on_commit(fn):
+    """Run fn() once the current unit of work commits (now if none is open; never on rollback)."""
+    scope = current_scope()
+    if scope is None:
+        return fn()
+    scope.callbacks.append(fn)
+    return None
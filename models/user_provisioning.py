@@ -0,0 +1,213 @@
+# ==============================================================
+# FILE: models/user_provisioning.py
+# PURPOSE: Bulk account creation from CSV (set-based checks, chunked inserts)
+# ==============================================================
+
+import csv
+import logging
+import re
+import secrets
+from itertools import islice
+
+from models.audit_model import audit
+from models.cache import invalidate_dashboard
+from utils.security import get_hasher
+
+logger = logging.getLogger(__name__)
+
+ROLES = ('admin', 'teacher', 'student')
+STATUSES = ('active', 'inactive')
+REQUIRED = ('username', 'email', 'role')
+REPORT_FIELDS = ('line', 'email', 'username', 'role', 'result', 'user_id', 'message', 'temporary_password')
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _in_clause(values):
+    return ', '.join(['%s'] * len(values))
+
+
+class UserProvisioner:
+    """
+    Creates accounts from CSV rows:
+        username,email,role[,password,name,specialization,contact,status]
+
+    Rows are processed `chunk_size` at a time. For each chunk:
+      1. rows are validated and checked against earlier rows of the file;
+      2. existing usernames/emails are found with one IN (...) query each;
+      3. passwords are hashed together across the hashing process pool;
+      4. users (and teachers) are written with multi-row INSERTs in one
+         transaction per chunk.
+    Each input row yields one report row. A blank password gets a generated
+    temporary one, which is returned in the report.
+    """
+
+    def __init__(self, conn, chunk_size=500, dry_run=False):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.seen_emails = set()
+        self.seen_usernames = set()
+        self.totals = {'created': 0, 'skipped': 0, 'error': 0}
+
+    # ------------------------
+    # ▶️ ENTRY POINTS
+    # ------------------------
+    def run_csv(self, stream):
+        """Yield report rows for a text stream of CSV (header row required)."""
+        reader = csv.DictReader(stream)
+        rows = ((reader.line_num, {k.strip().lower(): (v or '').strip() for k, v in row.items() if k})
+                for row in reader)
+        return self.run(rows)
+
+    def run(self, numbered_rows):
+        """Yield report rows for an iterable of (line_number, row_dict)."""
+        for chunk in _chunks(numbered_rows, self.chunk_size):
+            for report in self._process_chunk(chunk):
+                self.totals[report['result']] += 1
+                yield report
+
+    # ------------------------
+    # 🔧 ONE CHUNK
+    # ------------------------
+    def _process_chunk(self, chunk):
+        reports = []
+        candidates = []
+        for line, row in chunk:
+            report = {'line': line, 'email': row.get('email', '').lower(),
+                      'username': row.get('username', ''), 'role': row.get('role', '').lower(),
+                      'status': (row.get('status') or 'active').lower()}
+            error = self._validate(report)
+            if error:
+                reports.append({**report, 'result': 'error', 'message': error})
+                continue
+            self.seen_emails.add(report['email'])
+            self.seen_usernames.add(report['username'].lower())
+            candidates.append((report, row))
+            reports.append(report)
+
+        if candidates:
+            taken_emails, taken_usernames = self._existing(candidates)
+            fresh = []
+            for report, row in candidates:
+                if report['email'] in taken_emails:
+                    report.update(result='skipped', message='email already exists')
+                elif report['username'].lower() in taken_usernames:
+                    report.update(result='skipped', message='username already exists')
+                else:
+                    fresh.append((report, row))
+            if fresh:
+                self._insert(fresh)
+        return reports
+
+    def _validate(self, report):
+        missing = [f for f in REQUIRED if not report[f]]
+        if missing:
+            return f"missing {', '.join(missing)}"
+        if not _EMAIL.match(report['email']):
+            return 'invalid email'
+        if report['role'] not in ROLES:
+            return f"role must be one of {', '.join(ROLES)}"
+        if report['status'] not in STATUSES:
+            return f"status must be one of {', '.join(STATUSES)}"
+        if report['email'] in self.seen_emails:
+            return 'duplicate email in file'
+        # Usernames match case-insensitively, as under MySQL's default collation
+        if report['username'].lower() in self.seen_usernames:
+            return 'duplicate username in file'
+        return None
+
+    def _existing(self, candidates):
+        emails = [r['email'] for r, _ in candidates]
+        usernames = [r['username'].lower() for r, _ in candidates]
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT LOWER(email) FROM users WHERE email IN ({_in_clause(emails)})", emails)
+            taken_emails = {e for (e,) in cursor.fetchall()}
+            # The column collation is case-insensitive (MySQL default; NOCASE on
+            # SQLite), so the bare column matches any case and can use an index
+            cursor.execute(f"SELECT username FROM users WHERE username IN ({_in_clause(usernames)})", usernames)
+            taken_usernames = {u.lower() for (u,) in cursor.fetchall()}
+        finally:
+            cursor.close()
+        return taken_emails, taken_usernames
+
+    def _insert(self, fresh):
+        passwords = []
+        for report, row in fresh:
+            password = row.get('password')
+            if not password:
+                password = secrets.token_urlsafe(9)
+                report['temporary_password'] = password
+            passwords.append(password)
+
+        if self.dry_run:
+            for report, _ in fresh:
+                report.update(result='created', message='dry run: not written')
+            return
+
+        hashes = get_hasher().hash_many(passwords)
+        users = [
+            (r['username'], r['email'], h, r['role'], r['status'])
+            for (r, row), h in zip(fresh, hashes)
+        ]
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                INSERT INTO users (username, email, password_hash, role, status)
+                VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(users))}
+            """, [v for u in users for v in u])
+
+            # Read the new ids back by (unique) email; multi-row inserts do not
+            # promise consecutive ids under interleaved auto-increment locking
+            emails = [r['email'] for r, _ in fresh]
+            cursor.execute(f"SELECT id, LOWER(email) FROM users WHERE email IN ({_in_clause(emails)})", emails)
+            ids = {email: user_id for user_id, email in cursor.fetchall()}
+
+            teachers = [
+                (ids[r['email']], row.get('name') or r['username'], r['email'],
+                 row.get('contact') or None, row.get('specialization') or None)
+                for r, row in fresh if r['role'] == 'teacher'
+            ]
+            if teachers:
+                cursor.execute(f"""
+                    INSERT INTO teachers (user_id, name, email, contact, specialization)
+                    VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(teachers))}
+                """, [v for t in teachers for v in t])
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"❌ Bulk user insert failed for {len(fresh)} row(s): {e}")
+            for report, _ in fresh:
+                report.update(result='error', message=f"insert failed: {e}")
+                report.pop('temporary_password', None)
+            return
+        finally:
+            cursor.close()
+
+        for report, _ in fresh:
+            report.update(result='created', user_id=ids.get(report['email']), message='')
+        invalidate_dashboard()
+        audit('user.bulk_create', 'user', None,
+              {'created': len(fresh), 'first_line': fresh[0][0]['line'], 'last_line': fresh[-1][0]['line']})
+
+
+def write_report(reports, stream):
+    """Write report rows as CSV to `stream`; returns the number of rows written."""
+    writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for report in reports:
+        writer.writerow(report)
+        count += 1
+    return count
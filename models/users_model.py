@@ -3,9 +3,15 @@
 # DESCRIPTION: User Model for managing CRUD operations and authentication
 # =====================================================================
 
+import logging
 from .db import get_db
-from werkzeug.security import check_password_hash, generate_password_hash
-from mysql.connector import Error
+from .cache import invalidate_dashboard
+from .audit_model import audit
+from utils.security import hash_password, verify_password
+from models.backend import Error
+from models.rows import fetch_rows
+
+logger = logging.getLogger(__name__)
 
 
 class UserModel:
@@ -16,13 +22,13 @@ class UserModel:
     @staticmethod
     def get_all_users(role=None):
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         try:
             if role:
                 cursor.execute("SELECT * FROM users WHERE role != 'admin'")
             else:
                 cursor.execute("SELECT * FROM users")
-            return cursor.fetchall()
+            return fetch_rows(cursor)
         finally:
             cursor.close()
 
@@ -79,16 +85,21 @@ class UserModel:
         db = get_db()
         cursor = db.cursor()
         try:
-            print("Attempting insert:", username, email, role)
+            logger.debug("Attempting insert: %s %s %s", username, email, role)
             cursor.execute("""
                 INSERT INTO users (username, email, password_hash, role, status, image)
                 VALUES (%s, %s, %s, %s, %s, %s)
             """, (username, email, password_hash, role, status, image))
+            user_id = cursor.lastrowid
             db.commit()
-            print(f"✅ User '{username}' with role '{role}' created successfully.")
+            invalidate_dashboard()
         except Error as e:
-            print(f"❌ Error creating user: {e}")
+            logger.error(f"❌ Error creating user: {e}")
             db.rollback()
+        else:
+            # Outside the try: an audit failure must not roll back committed data
+            audit('user.create', 'user', user_id, {'username': username, 'role': role})
+            logger.info(f"✅ User '{username}' with role '{role}' created successfully.")
         finally:
             cursor.close()
 
@@ -125,17 +136,21 @@ class UserModel:
                 params.append(image)
 
             if not updates:
-                print("⚠️ No fields to update.")
+                logger.warning("⚠️ No fields to update.")
                 return
 
             query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s"
             params.append(user_id)
             cursor.execute(query, tuple(params))
             db.commit()
-            print(f"✅ User ID {user_id} updated successfully.")
+            invalidate_dashboard()
         except Error as e:
-            print(f"❌ Error updating user: {e}")
+            logger.error(f"❌ Error updating user: {e}")
             db.rollback()
+        else:
+            audit('user.update', 'user', user_id,
+                  {'fields': [u.split(' =')[0] for u in updates], 'role': role, 'status': status})
+            logger.info(f"✅ User ID {user_id} updated successfully.")
         finally:
             cursor.close()
 
@@ -149,10 +164,13 @@ class UserModel:
         try:
             cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
             db.commit()
-            print(f"🗑️ User ID {user_id} deleted successfully.")
+            invalidate_dashboard()
         except Error as e:
-            print(f"❌ Error deleting user: {e}")
+            logger.error(f"❌ Error deleting user: {e}")
             db.rollback()
+        else:
+            audit('user.delete', 'user', user_id)
+            logger.info(f"🗑️ User ID {user_id} deleted successfully.")
         finally:
             cursor.close()
 
@@ -161,19 +179,35 @@ class UserModel:
     # ------------------------
     @staticmethod
     def verify_password(stored_hash, password):
-        return check_password_hash(stored_hash, password)
+        return verify_password(stored_hash, password)
 
     @staticmethod
     def change_password(user_id, new_password):
         db = get_db()
         cursor = db.cursor()
         try:
-            hashed = generate_password_hash(new_password)
+            hashed = hash_password(new_password)
             cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s", (hashed, user_id))
             db.commit()
-            print(f"🔑 Password updated for user ID {user_id}.")
         except Error as e:
-            print(f"❌ Error updating password: {e}")
+            logger.error(f"❌ Error updating password: {e}")
+            db.rollback()
+        else:
+            audit('user.password_change', 'user', user_id)
+            logger.info(f"🔑 Password updated for user ID {user_id}.")
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def set_password_hash(user_id, password_hash):
+        """Store an upgraded hash of the same password (rehash-on-login); not audited."""
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s", (password_hash, user_id))
+            db.commit()
+        except Error as e:
+            logger.error(f"❌ Error upgrading password hash: {e}")
             db.rollback()
         finally:
             cursor.close()
@@ -188,10 +222,13 @@ class UserModel:
         try:
             cursor.execute("UPDATE users SET status = %s WHERE id = %s", (status, user_id))
             db.commit()
-            print(f"⚙️ User ID {user_id} status set to '{status}'.")
+            invalidate_dashboard()
         except Error as e:
-            print(f"❌ Error updating status: {e}")
+            logger.error(f"❌ Error updating status: {e}")
             db.rollback()
+        else:
+            audit('user.status', 'user', user_id, {'status': status})
+            logger.info(f"⚙️ User ID {user_id} status set to '{status}'.")
         finally:
             cursor.close()
 
@@ -212,13 +249,13 @@ class UserModel:
     @staticmethod
     def search_users(keyword):
         db = get_db()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         try:
             like = f"%{keyword}%"
             cursor.execute("""
                 SELECT * FROM users
                 WHERE username LIKE %s OR email LIKE %s
             """, (like, like))
-            return cursor.fetchall()
+            return fetch_rows(cursor)
         finally:
             cursor.close()
@@ -1,6 +1,6 @@
 # routes/attendance_routes.py
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from datetime import date
+from datetime import date, datetime
 from models.attendance_model import AttendanceModel
 from models.class_model import ClassModel
 
@@ -12,23 +12,86 @@ def attendance():
         flash("Please login first", "danger")
         return redirect(url_for('auth.login'))
 
-    data = AttendanceModel.get_all_attendance()
+    today = date.today()
+    date_from = _parse_date(request.args.get('date_from')) or today
+    date_to = _parse_date(request.args.get('date_to')) or today
+    class_id = request.args.get('class_id', type=int)
+    per_page = request.args.get('per_page', AttendanceModel.DEFAULT_PAGE_SIZE, type=int)
+    after = _parse_cursor(request.args.get('after'))
+
+    # Default view: teachers only see their own classes
+    if class_id:
+        class_ids = [class_id]
+    elif session.get('role') == 'teacher':
+        class_ids = ClassModel.get_ids_for_teacher(session.get('user_id'))
+    else:
+        class_ids = None
+
+    data, next_cursor = AttendanceModel.get_attendance_page(
+        date_from, date_to, class_ids=class_ids, after=after, limit=per_page
+    )
     classes = ClassModel.get_all_classes()
-    return render_template('attendance/attendance.html', attendance=data, classes=classes)
+    filters = {
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'class_id': class_id,
+        'per_page': per_page,
+    }
+    return render_template('attendance/attendance.html',
+                           attendance=data,
+                           classes=classes,
+                           filters=filters,
+                           next_cursor=_format_cursor(next_cursor),
+                           is_first_page=after is None)
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def _parse_cursor(value):
+    """Cursor format: 'YYYY-MM-DD_<id>'."""
+    if not value or '_' not in value:
+        return None
+    day, _, row_id = value.partition('_')
+    day = _parse_date(day)
+    if day is None or not row_id.isdigit():
+        return None
+    return day, int(row_id)
+
+
+def _format_cursor(cursor):
+    if not cursor:
+        return None
+    day, row_id = cursor
+    return f"{day.isoformat()}_{row_id}"
 
 @attendance_routes.route('/attendance/mark', methods=['POST'])
 def mark_attendance():
     class_id = request.form.get('class_id')
-    statuses = request.form.getlist('status')
     student_ids = request.form.getlist('student_id')
 
-    for student_id, status in zip(student_ids, statuses):
-        AttendanceModel.mark_attendance(student_id,class_id, date.today(), status)
+    records = [
+        (student_id, request.form.get(f'status_{student_id}'))
+        for student_id in student_ids
+        if request.form.get(f'status_{student_id}')
+    ]
+
+    if not class_id or not records:
+        flash("Please select a class and mark at least one student.", "warning")
+        return redirect(url_for('attendance_routes.attendance'))
 
-    flash("Attendance marked successfully!", "success")
+    try:
+        AttendanceModel.mark_attendance_bulk(class_id, date.today(), records)
+        flash("Attendance marked successfully!", "success")
+    except Exception:
+        flash("❌ Failed to save attendance. Please try again.", "danger")
     return redirect(url_for('attendance_routes.attendance'))
 
 @attendance_routes.route('/attendance/students/<int:class_id>')
 def get_students_by_class(class_id):
     students = AttendanceModel.get_students_in_class(class_id)
-    return {'students': students}
+    return {'students': [s._asdict() for s in students]}
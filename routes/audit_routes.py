@@ -0,0 +1,46 @@
+# ===============================================================
+# FILE: routes/audit_routes.py
+# DESCRIPTION: Audit trail viewer (admin only) and its JSON API
+# ===============================================================
+from flask import Blueprint, render_template, request, jsonify
+from models.audit_model import AuditModel
+from routes.auth import login_required, admin_required
+
+audit_bp = Blueprint('audit', __name__, url_prefix='/audit')
+
+
+def _page_from_args():
+    filters = {
+        'user_id': request.args.get('user_id', type=int),
+        'action': request.args.get('action') or None,
+        'entity_type': request.args.get('entity_type') or None,
+        'entity_id': request.args.get('entity_id', type=int),
+    }
+    after = request.args.get('after', type=int)
+    per_page = request.args.get('per_page', AuditModel.DEFAULT_PAGE_SIZE, type=int)
+    events, next_cursor = AuditModel.get_page(after_id=after, limit=per_page, **filters)
+    return filters, after, per_page, events, next_cursor
+
+
+# ---------------- Audit Log Page ----------------
+@audit_bp.route('/')
+@login_required
+@admin_required
+def audit_logs():
+    filters, after, per_page, events, next_cursor = _page_from_args()
+    return render_template('audit/audit_logs.html',
+                           events=events,
+                           filters=filters,
+                           per_page=per_page,
+                           next_cursor=next_cursor,
+                           is_first_page=after is None)
+
+
+# ---------------- Audit Log API ----------------
+@audit_bp.route('/api')
+@login_required
+@admin_required
+def audit_logs_api():
+    """GET /audit/api?action=grade.&user_id=&entity_type=&entity_id=&after=&per_page="""
+    _, _, _, events, next_cursor = _page_from_args()
+    return jsonify({'events': events, 'next_cursor': next_cursor})
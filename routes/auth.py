@@ -2,11 +2,17 @@
 # FILE: routes/auth.py
 # DESCRIPTION: Authentication & User Management Routes
 # ===============================================================
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+import csv
+import io
+import logging
+from flask import Blueprint, Response, render_template, request, redirect, url_for, session, flash, stream_with_context
 from models.users_model import UserModel
+from models.user_provisioning import UserProvisioner, REPORT_FIELDS
 from functools import wraps
 from models.db import get_db
-from werkzeug.security import check_password_hash, generate_password_hash
+from utils.security import get_hasher, hash_password, verify_password
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -57,8 +63,11 @@ def login():
                 flash(f"Welcome back, Admin {user['email']}!", "success")
                 return redirect(url_for('dashboard.dashboard_home'))
 
-            # Normal user: verify hashed password
-            elif check_password_hash(user['password_hash'], password):
+            # Normal user: verify hashed password (off-thread; HashPoolBusy -> 503)
+            elif verify_password(user['password_hash'], password):
+                # Upgrade hashes made under an older policy while we have the plaintext
+                if get_hasher().needs_rehash(user['password_hash']):
+                    UserModel.set_password_hash(user['id'], hash_password(password))
                 session['user_id'] = user['id']
                 session['email'] = user['email']
                 session['role'] = user['role']
@@ -118,7 +127,7 @@ def change_password():
 
         user = UserModel.get_user_by_id(session['user_id'])
 
-        if not check_password_hash(user['password_hash'], current):
+        if not verify_password(user['password_hash'], current):
             flash("Current password is incorrect.", "danger")
             return redirect(url_for('auth.change_password'))
 
@@ -146,14 +155,14 @@ def create_user():
         if role not in ["teacher", "student", "admin"]:
             flash("⚠️ Invalid role selected.", "warning")
             return redirect(url_for('auth.create_user'))
-        print(role)
+        logger.debug("Login role: %s", role)
         # Check if username or email already exists
         if UserModel.get_user_by_username(username):
             flash("⚠️ Username already exists.", "warning")
         elif UserModel.get_user_by_email(email):
             flash("⚠️ Email already exists.", "warning")
         else:
-            password_hash = generate_password_hash(password)
+            password_hash = hash_password(password)
             UserModel.create_user(
                 username=username,
                 email=email,
@@ -179,7 +188,7 @@ def update_user(user_id):
         role = request.form.get('role')
         password = request.form.get('password')
 
-        pass_hash = generate_password_hash(password) if password else None
+        pass_hash = hash_password(password) if password else None
 
         UserModel.update_user(user_id, username=username, email=email, role=role, password_hash=pass_hash)
 
@@ -206,3 +215,41 @@ def delete_user(user_id):
 def manage_users():
     users = UserModel.get_all_users(exclude_admin=False)
     return render_template('users/manage_users.html', users=users)
+
+
+# ---------------- Bulk Import Users (Admin) ----------------
+@auth_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def import_users():
+    """
+    Upload a CSV (username,email,role[,password,name,specialization,contact,status]).
+    The per-row report is streamed back as CSV while the import runs.
+    """
+    if request.method == 'GET':
+        return render_template('users/import_users.html', columns=REPORT_FIELDS)
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash("⚠️ Please choose a CSV file.", "warning")
+        return redirect(url_for('auth.import_users'))
+
+    dry_run = bool(request.form.get('dry_run'))
+    source = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    provisioner = UserProvisioner(get_db(), dry_run=dry_run)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for report in provisioner.run_csv(source):
+            writer.writerow(report)
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = 'user_import_dry_run.csv' if dry_run else 'user_import_report.csv'
+    return Response(stream_with_context(generate()), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
@@ -1,7 +1,13 @@
+import logging
 from flask import Blueprint, render_template, session, redirect, url_for, flash
 from models.db import get_db
+from models.cache import dashboard_cache
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
 dashboard_bp = Blueprint('dashboard', __name__)
 
 ############################################
@@ -47,6 +53,18 @@ def admin_dashboard():
         flash("You are not authorized to access the admin dashboard.", "danger")
         return redirect(url_for('dashboard.dashboard_home'))
 
+    try:
+        stats = dashboard_cache.get_or_set('dashboard:admin', _load_admin_stats)
+        return render_template('dashboard/dashboard_admin.html', **stats)
+
+    except Exception as e:
+        logger.exception("Admin Dashboard Error: %s", e)
+        flash("Error loading admin dashboard.", "danger")
+        return render_template('errors/404.html', message=f"Error: {e}")
+
+
+def _load_admin_stats():
+    """Run the admin dashboard aggregates (cached by admin_dashboard)."""
     db = get_db()
     cursor = db.cursor(dictionary=True)
     try:
@@ -60,42 +78,17 @@ def admin_dashboard():
         cursor.execute("SELECT COUNT(*) AS total_classes FROM classes")
         total_classes = cursor.fetchone()['total_classes']
 
-        # ---- Average Grade by Class ----
-        cursor.execute("""
-            SELECT c.name AS class_name, 
-                   ROUND(AVG(g.score), 2) AS avg_score
-            FROM grades g
-            JOIN classes c ON g.class_id = c.id
-            GROUP BY c.name
-            ORDER BY c.name
-        """)
-        class_data = cursor.fetchall()
-
+        # ---- Average Grade by Class (from grade_stats rollup) ----
+        class_data = GradeStatsModel.class_averages()
         class_names = [row['class_name'] for row in class_data]
         avg_grades = [row['avg_score'] for row in class_data]
 
-        # ---- Grade Distribution ----
-        cursor.execute("""
-            SELECT 
-                CASE
-                    WHEN score >= 90 THEN 'A'
-                    WHEN score >= 80 THEN 'B'
-                    WHEN score >= 70 THEN 'C'
-                    WHEN score >= 60 THEN 'D'
-                    ELSE 'F'
-                END AS grade_category,
-                COUNT(*) AS total
-            FROM grades
-            GROUP BY grade_category
-            ORDER BY grade_category ASC
-        """)
-        grade_dist = cursor.fetchall()
-
-        student_labels = [row['grade_category'] for row in grade_dist]
-        student_counts = [row['total'] for row in grade_dist]
+        # ---- Grade Distribution (from grade_stats rollup) ----
+        grade_dist = GradeStatsModel.distribution()
+        student_labels = [letter for letter, _ in grade_dist]
+        student_counts = [total for _, total in grade_dist]
 
-        return render_template(
-            'dashboard/dashboard_admin.html',
+        return dict(
             total_students=total_students,
             total_teachers=total_teachers,
             total_classes=total_classes,
@@ -104,14 +97,8 @@ def admin_dashboard():
             student_labels=student_labels,
             student_counts=student_counts
         )
-
-    except Exception as e:
-        print("Admin Dashboard Error:", e)
-        flash("Error loading admin dashboard.", "danger")
-        return render_template('errors/404.html', message=f"Error: {e}")
     finally:
         cursor.close()
-        db.close()
 
 
 ############################################
@@ -144,25 +131,11 @@ def teacher_dashboard():
         """, (teacher_id,))
         total_students = cursor.fetchone()['total_students'] or 0
 
-        # ✅ Average score overall for this teacher’s classes
-        cursor.execute("""
-            SELECT ROUND(AVG(g.score), 2) AS overall_avg
-            FROM grades g
-            JOIN classes c ON g.class_id = c.id
-            WHERE c.id = %s
-        """, (teacher_id,))
-        overall_avg = cursor.fetchone()['overall_avg'] or 0
+        # ✅ Average score overall for this teacher’s classes (rollup)
+        overall_avg = GradeStatsModel.overall_average([teacher_id])
 
-        # ✅ Chart Data: Average score by class
-        cursor.execute("""
-            SELECT c.name AS class_name, ROUND(AVG(g.score), 2) AS avg_score
-            FROM grades g
-            JOIN classes c ON g.class_id = c.id
-            WHERE c.id = %s
-            GROUP BY c.name
-            ORDER BY c.name
-        """, (teacher_id,))
-        data = cursor.fetchall()
+        # ✅ Chart Data: Average score by class (rollup)
+        data = GradeStatsModel.class_averages([teacher_id])
 
         class_names = [row['class_name'] for row in data] if data else []
         avg_scores = [row['avg_score'] for row in data] if data else []
@@ -178,7 +151,7 @@ def teacher_dashboard():
         )
 
     except Exception as e:
-        print("Teacher Dashboard Error:", e)
+        logger.exception("Teacher Dashboard Error: %s", e)
         flash("Error loading teacher dashboard.", "danger")
         return render_template('errors/404.html', message=str(e))
 
@@ -203,13 +176,13 @@ def student_dashboard():
 
     try:
         # Fetch student info
-        cursor.execute("SELECT name FROM students WHERE id = %s", (student_id,))
+        cursor.execute("SELECT name, class_id FROM students WHERE id = %s", (student_id,))
         student_info = cursor.fetchone()
         student_name = student_info['name'] if student_info else "Unknown"
 
         # Fetch student's grades by subject
         cursor.execute("""
-            SELECT s.name AS subject_name, g.score
+            SELECT s.id AS subject_id, s.name AS subject_name, g.score
             FROM grades g
             JOIN subjects s ON g.subject_id = s.id
             WHERE g.student_id = %s
@@ -218,6 +191,12 @@ def student_dashboard():
         labels = [row['subject_name'] for row in grades_data]
         values = [row['score'] for row in grades_data]
 
+        # Class average per subject for comparison (rollup)
+        class_avg_map = GradeStatsModel.subject_averages_for_class(
+            student_info['class_id'] if student_info else None
+        )
+        class_avgs = [class_avg_map.get(row['subject_id']) for row in grades_data]
+
         # Attendance count
         cursor.execute("""
             SELECT 
@@ -230,17 +209,22 @@ def student_dashboard():
         present_days = attendance.get('present_days', 0)
         absent_days = attendance.get('absent_days', 0)
 
+        # Rank within class (indexed lookup, ties share a rank)
+        class_rank = RankModel.get_rank(student_id, scope='class')
+
         return render_template(
             'dashboard/dashboard_student.html',
             student_name=student_name,
             labels=labels,
             values=values,
+            class_avgs=class_avgs,
+            class_rank=class_rank,
             present_days=present_days,
             absent_days=absent_days
         )
 
     except Exception as e:
-        print("Student Dashboard Error:", e)
+        logger.exception("Student Dashboard Error: %s", e)
         return render_template('errors/404.html', message=f"Error: {e}")
 
     finally:
@@ -0,0 +1,98 @@
+# ==============================================================
+# FILE: routes/export_routes.py
+# PURPOSE: Streamed CSV / XLSX downloads of the list pages
+# ==============================================================
+
+from datetime import date
+
+from flask import Blueprint, Response, abort, request, session, stream_with_context
+
+from models.attendance_model import AttendanceModel
+from models.class_model import ClassModel
+from models.grade_model import GradeModel
+from models.student_model import StudentModel
+from routes.attendance_routes import _parse_date
+from routes.auth import login_required
+from utils.export import FORMATS
+
+export_bp = Blueprint('export', __name__, url_prefix='/export')
+
+
+def _download(name, fmt, header, rows):
+    """
+    Stream `rows` in the requested format. Nothing is buffered: the first
+    bytes go out as soon as the first rows are fetched, and the request
+    context (and the export's DB connection) lives until the last chunk.
+    """
+    if fmt not in FORMATS:
+        abort(404)
+    mimetype, encoder = FORMATS[fmt]
+    kwargs = {'sheet_title': name.title()} if fmt == 'xlsx' else {}
+    filename = f"{name}-{date.today().isoformat()}.{fmt}"
+    return Response(
+        stream_with_context(encoder(header, rows, **kwargs)),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no',  # let nginx pass chunks straight through
+        },
+    )
+
+
+def _staff_only():
+    if session.get('role') not in ('admin', 'teacher'):
+        abort(403)
+
+
+# ------------------------
+# 📤 STUDENTS (same filters as /students/)
+# ------------------------
+@export_bp.route('/students.<fmt>')
+@login_required
+def export_students(fmt):
+    _staff_only()
+    rows = StudentModel.iter_export(
+        class_id=request.args.get('class_id', type=int),
+        status=request.args.get('status') or None,
+        gender=request.args.get('gender') or None,
+    )
+    return _download('students', fmt, StudentModel.EXPORT_HEADER, rows)
+
+
+# ------------------------
+# 📤 GRADES
+# ------------------------
+@export_bp.route('/grades.<fmt>')
+@login_required
+def export_grades(fmt):
+    _staff_only()
+    rows = GradeModel.iter_export(
+        class_id=request.args.get('class_id', type=int),
+        subject_id=request.args.get('subject_id', type=int),
+        term=request.args.get('term') or None,
+    )
+    return _download('grades', fmt, GradeModel.EXPORT_HEADER, rows)
+
+
+# ------------------------
+# 📤 ATTENDANCE (same filters and teacher scoping as /attendance)
+# ------------------------
+@export_bp.route('/attendance.<fmt>')
+@login_required
+def export_attendance(fmt):
+    _staff_only()
+    today = date.today()
+    date_from = _parse_date(request.args.get('date_from')) or today
+    date_to = _parse_date(request.args.get('date_to')) or today
+    class_id = request.args.get('class_id', type=int)
+
+    if class_id:
+        class_ids = [class_id]
+    elif session.get('role') == 'teacher':
+        class_ids = ClassModel.get_ids_for_teacher(session.get('user_id'))
+    else:
+        class_ids = None
+
+    rows = AttendanceModel.iter_export(date_from, date_to, class_ids=class_ids)
+    return _download('attendance', fmt, AttendanceModel.EXPORT_HEADER, rows)
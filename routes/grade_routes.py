@@ -1,8 +1,12 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+import logging
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from models.grade_model import GradeModel
 from models.student_model import StudentModel
 from models.subject_model import SubjectModel
 from models.class_model import ClassModel
+from models.grading_scale import get_scale
+
+logger = logging.getLogger(__name__)
 
 grade_bp = Blueprint('grade', __name__, url_prefix='/grades')
 
@@ -19,11 +23,8 @@ def add_grade():
         class_id = request.form.get('class_id')
         score = request.form.get('score')
 
-        print("\n📘 DEBUG INFO:")
-        print("Student ID:", student_id)
-        print("Subject ID:", subject_id)
-        print("Class ID:", class_id)
-        print("Score:", score)
+        logger.debug("📘 Add grade: student=%s subject=%s class=%s score=%s",
+                     student_id, subject_id, class_id, score)
 
         if not all([student_id, subject_id, class_id, score]):
             flash('All fields are required!', 'danger')
@@ -33,16 +34,7 @@ def add_grade():
         score = float(score)
 
         # Grade logic
-        if score >= 90:
-            grade = 'A'; remarks = 'Excellent'
-        elif score >= 80:
-            grade = 'B'; remarks = 'Good'
-        elif score >= 70:
-            grade = 'C'; remarks = 'Average'
-        elif score >= 60:
-            grade = 'D'; remarks = 'Needs Improvement'
-        else:
-            grade = 'F'; remarks = 'Fail'
+        grade, remarks = get_scale().classify(score)
 
         # Add to database
         try:
@@ -52,7 +44,7 @@ def add_grade():
             return redirect(url_for('grade.list_grades'))
         except Exception as e:
             flash(f'❌ Error adding grade: {e}', 'danger')
-            print(f"Error adding grade: {e}")
+            logger.error(f"Error adding grade: {e}")
             return redirect(url_for('grade.add_grade'))
 
     # GET method → Load dropdown data
@@ -75,21 +67,7 @@ def edit_grade(id):
 
     if request.method == 'POST':
         score = float(request.form['score'])
-        if score >= 90:
-            grade_letter = 'A'
-            remarks = 'Excellent'
-        elif score >= 80:
-            grade_letter = 'B'
-            remarks = 'Good'
-        elif score >= 70:
-            grade_letter = 'C'
-            remarks = 'Average'
-        elif score >= 60:
-            grade_letter = 'D'
-            remarks = 'Needs Improvement'
-        else:
-            grade_letter = 'F'
-            remarks = 'Fail'
+        grade_letter, remarks = get_scale().classify(score)
 
         GradeModel.update_grade(id, score, grade_letter, remarks)
         flash('Grade updated successfully!', 'success')
@@ -103,3 +81,54 @@ def delete_grade(id):
     GradeModel.delete_grade(id)
     flash('Grade deleted successfully!', 'success')
     return redirect(url_for('grade.list_grades'))
+
+
+@grade_bp.route('/gradebook', methods=['GET', 'POST'])
+def gradebook():
+    """
+    Enter a whole class's scores for one subject and term.
+    POST accepts either the gradebook form (score_<student_id> fields) or JSON:
+    {"class_id": 1, "subject_id": 2, "term": "Term 1",
+     "scores": [{"student_id": 5, "score": 87.5}, ...]}
+    """
+    source = request.get_json(silent=True) if request.is_json else None
+    params = source if source is not None else (request.form if request.method == 'POST' else request.args)
+    class_id = params.get('class_id')
+    subject_id = params.get('subject_id')
+    term = params.get('term') or GradeModel.TERMS[0]
+
+    if request.method == 'POST':
+        if not class_id or not subject_id:
+            if source is not None:
+                return jsonify({'error': 'class_id and subject_id are required'}), 400
+            flash('Please choose a class and subject.', 'danger')
+            return redirect(url_for('grade.gradebook'))
+
+        if source is not None:
+            entries = [(row.get('student_id'), row.get('score')) for row in source.get('scores', [])]
+        else:
+            entries = [(sid, request.form.get(f'score_{sid}')) for sid in request.form.getlist('student_id')]
+
+        try:
+            saved, errors = GradeModel.save_gradebook(class_id, subject_id, term, entries)
+        except ValueError as e:
+            if source is not None:
+                return jsonify({'error': str(e)}), 400
+            flash(f'❌ {e}', 'danger')
+            return redirect(url_for('grade.gradebook'))
+
+        if source is not None:
+            return jsonify({'saved': saved, 'errors': errors}), (207 if errors else 200)
+
+        flash(f'✅ Saved {saved} grade(s).', 'success')
+        for err in errors:
+            flash(f"⚠️ Student {err['student_id']}: {err['error']}", 'warning')
+        return redirect(url_for('grade.gradebook', class_id=class_id, subject_id=subject_id, term=term))
+
+    roster = GradeModel.get_gradebook(class_id, subject_id, term) if class_id and subject_id else []
+    return render_template('grade/gradebook.html',
+                           roster=roster,
+                           classes=ClassModel.get_all_classes(),
+                           subjects=SubjectModel.get_all(),
+                           terms=GradeModel.TERMS,
+                           selected={'class_id': class_id, 'subject_id': subject_id, 'term': term})
@@ -2,6 +2,9 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from models.student_model import StudentModel
 from models.class_model import ClassModel # for selecting classes
+from models.db import get_db
+from models.student_import import COLUMNS, StudentImporter, read_rows
+from routes.auth import login_required, admin_required
 
 student_bp = Blueprint('student', __name__, url_prefix='/students')
 
@@ -10,8 +13,23 @@ def list_students():
     if 'user_id' not in session:
         return redirect(url_for('auth.login'))
 
-    students = StudentModel.get_all()
-    return render_template('students/students.html', students=students)
+    filters = {
+        'class_id': request.args.get('class_id', type=int),
+        'status': request.args.get('status') or None,
+        'gender': request.args.get('gender') or None,
+    }
+    after = request.args.get('after', type=int)
+    per_page = request.args.get('per_page', StudentModel.DEFAULT_PAGE_SIZE, type=int)
+
+    students, next_cursor = StudentModel.get_page(after_id=after, limit=per_page, **filters)
+    classes = ClassModel.get_all_classes()
+    return render_template('students/students.html',
+                           students=students,
+                           classes=classes,
+                           filters=filters,
+                           per_page=per_page,
+                           next_cursor=next_cursor,
+                           is_first_page=after is None)
 
 
 @student_bp.route('/add', methods=['GET', 'POST'])
@@ -65,3 +83,36 @@ def delete_student(id):
     StudentModel.delete(id)
     flash('Student deleted successfully!', 'success')
     return redirect(url_for('student.list_students'))
+
+
+@student_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def import_students():
+    """Upload an enrollment file (CSV or XLSX); shows totals and the first rejected rows."""
+    if request.method == 'GET':
+        return render_template('students/import_students.html', columns=COLUMNS, result=None)
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Please choose a CSV or XLSX file.', 'warning')
+        return redirect(url_for('student.import_students'))
+
+    errors = []
+    max_shown = 200
+
+    def on_error(line, row, message):
+        if len(errors) < max_shown:
+            errors.append({'line': line, 'name': row.get('name'), 'error': message})
+
+    dry_run = bool(request.form.get('dry_run'))
+    try:
+        importer = StudentImporter(get_db(), dry_run=dry_run, on_error=on_error)
+        totals = importer.run(read_rows(upload.stream, upload.filename))
+    except RuntimeError as e:
+        flash(f'❌ {e}', 'danger')
+        return redirect(url_for('student.import_students'))
+
+    return render_template('students/import_students.html', columns=COLUMNS,
+                           result={'totals': totals, 'errors': errors, 'dry_run': dry_run,
+                                   'truncated': totals['errors'] > len(errors)})
@@ -1,6 +1,6 @@
 # routes/teacher_routes.py
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from werkzeug.security import generate_password_hash
+from utils.security import hash_password
 from models.teacher_model import TeacherModel
 
 teacher_routes = Blueprint('teacher_routes', __name__)
@@ -27,7 +27,7 @@ def add_teacher():
         flash("All fields are required", "danger")
         return redirect(url_for('teacher_routes.teachers'))
 
-    password_hash = generate_password_hash(password)
+    password_hash = hash_password(password)
     TeacherModel.add_teacher(username, email, password_hash, department)
 
     flash("Teacher added successfully!", "success")
@@ -1,16 +1,18 @@
-import mysql.connector
+import argparse
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from config import Config
+from models.backend import create_backend
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
+
+def _connect():
+    """Open a connection on the configured backend (DB_BACKEND: mysql or sqlite)."""
+    return create_backend({k: getattr(Config, k) for k in dir(Config) if k.isupper()}).connect()
 
 def seed_data():
-    conn = mysql.connector.connect(
-        host=Config.MYSQL_HOST,
-        user=Config.MYSQL_USER,
-        password=Config.MYSQL_PASSWORD,
-        database=Config.MYSQL_DB
-    )
+    conn = _connect()
     cursor = conn.cursor()
 
     print("⚙️ Resetting and seeding data...")
@@ -22,6 +24,8 @@ def seed_data():
     tables = [
         'subject_teacher',
         'audit_logs',
+        'grade_stats',
+        'student_averages',
         'grades',
         'attendance',
         'subjects',
@@ -161,13 +165,54 @@ def seed_data():
         (user_map['teacher2'], 'Marked attendance for Class B'),
     ])
 
+    conn.commit()
+
+    # ------------------------------------------------
+    # 🔹 Step 11: Build grade_stats and student_averages rollups
+    # ------------------------------------------------
+    GradeStatsModel.rebuild(conn)
+    RankModel.rebuild(conn)
+
     # ------------------------------------------------
     # 🔹 Finalize
     # ------------------------------------------------
-    conn.commit()
     cursor.close()
     conn.close()
     print("✅ All data seeded successfully with image paths and subject-teacher assignments!")
 
+def seed_synthetic(args):
+    """Generate a large deterministic dataset (see seeders/synthetic_data.py)."""
+    from seeders.synthetic_data import SyntheticPlan, generate
+
+    conn = _connect()
+    plan = SyntheticPlan(
+        schools=args.schools,
+        classes_per_school=args.classes_per_school,
+        students_per_class=args.students_per_class,
+        teachers_per_school=args.teachers_per_school,
+        subjects_per_class=args.subjects_per_class,
+        school_days=args.days,
+        seed=args.seed,
+    )
+    try:
+        generate(conn, plan, batch_size=args.batch_size)
+    finally:
+        conn.close()
+
+
 if __name__ == "__main__":
-    seed_data()
+    parser = argparse.ArgumentParser(description="Seed the database with demo or synthetic data.")
+    parser.add_argument('--schools', type=int, help="Generate synthetic data for N schools (e.g. 200 ≈ 100k students)")
+    parser.add_argument('--classes-per-school', type=int, default=20)
+    parser.add_argument('--students-per-class', type=int, default=25)
+    parser.add_argument('--teachers-per-school', type=int, default=25)
+    parser.add_argument('--subjects-per-class', type=int, default=6)
+    parser.add_argument('--days', type=int, default=180, help="School days of attendance")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.schools:
+        seed_synthetic(args)
+    else:
+        seed_data()
@@ -0,0 +1,249 @@
+# ==============================================================
+# FILE: seeders/synthetic_data.py
+# PURPOSE: Deterministic large-scale data generator for load/benchmark tests
+# USAGE:   python seeders/seed_data.py --schools 200 --seed 42
+# ==============================================================
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from itertools import islice
+
+from werkzeug.security import generate_password_hash
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.grading_scale import get_scale
+from models.grade_stats_model import GradeStatsModel
+from models.rank_model import RankModel
+
+TERMS = ('Term 1', 'Term 2', 'Term 3', 'Final')
+SUBJECT_NAMES = ('Mathematics', 'Science', 'English', 'History', 'Geography',
+                 'Physics', 'Chemistry', 'Biology', 'Khmer', 'Art')
+FIRST_NAMES = ('Dara', 'Lina', 'Sophy', 'Mark', 'Lisa', 'John', 'Vanna', 'Sokha',
+               'Chenda', 'Rith', 'Bopha', 'Kosal', 'Nary', 'Piseth', 'Srey', 'Vibol')
+LAST_NAMES = ('Chan', 'Lim', 'Eng', 'Doe', 'Sok', 'Heng', 'Keo', 'Meas', 'Noun', 'Ouk')
+ATTENDANCE_STATUSES = ('Present', 'Absent', 'Late', 'Excused')
+ATTENDANCE_CUM_WEIGHTS = (90, 95, 99, 100)
+
+# Every generated account shares one hash of this password so seeding is not
+# dominated by 600k-iteration PBKDF2 runs.
+SYNTHETIC_PASSWORD = 'password'
+
+TABLES = ('subject_teacher', 'audit_logs', 'grade_stats', 'student_averages', 'grades',
+          'attendance', 'subjects', 'students', 'classes', 'teachers', 'users')
+
+
+class SyntheticPlan:
+    """Sizes of the generated dataset; totals are derived from the per-school numbers."""
+
+    def __init__(self, schools=1, classes_per_school=20, students_per_class=25,
+                 teachers_per_school=25, subjects_per_class=6, school_days=180,
+                 terms=TERMS, start_date=date(2025, 1, 6), seed=42):
+        self.schools = schools
+        self.classes_per_school = classes_per_school
+        self.students_per_class = students_per_class
+        self.teachers_per_school = teachers_per_school
+        self.subjects_per_class = subjects_per_class
+        self.school_days = school_days
+        self.terms = tuple(terms)
+        self.start_date = start_date
+        self.seed = seed
+
+    @property
+    def classes(self):
+        return self.schools * self.classes_per_school
+
+    @property
+    def students(self):
+        return self.classes * self.students_per_class
+
+    @property
+    def teachers(self):
+        return self.schools * self.teachers_per_school
+
+    def summary(self):
+        return {
+            'schools': self.schools,
+            'teachers': self.teachers,
+            'classes': self.classes,
+            'students': self.students,
+            'subjects': self.classes * self.subjects_per_class,
+            'attendance': self.students * self.school_days,
+            'grades': self.students * self.subjects_per_class * len(self.terms),
+        }
+
+
+# ==============================================================
+# 🔹 Helpers
+# ==============================================================
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_insert(conn, table, columns, rows, batch_size):
+    """Stream rows into `table` in executemany batches (one commit per batch)."""
+    cursor = conn.cursor()
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    total = 0
+    started = time.perf_counter()
+    try:
+        for chunk in _chunks(rows, batch_size):
+            cursor.executemany(sql, chunk)
+            conn.commit()
+            total += len(chunk)
+    finally:
+        cursor.close()
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else float('inf')
+    print(f"   {table:<16} {total:>12,} rows  {elapsed:8.2f}s  {rate:>12,.0f} rows/sec")
+    return total, elapsed
+
+
+def _school_days(start, count):
+    day = start
+    produced = 0
+    while produced < count:
+        if day.weekday() < 5:
+            yield day
+            produced += 1
+        day += timedelta(days=1)
+
+
+# ==============================================================
+# 🔹 Row generators (ids are assigned here, so no read-back is needed)
+# ==============================================================
+def _users_and_teachers(plan):
+    password_hash = generate_password_hash(SYNTHETIC_PASSWORD)
+    users = [(1, 'admin', 'admin@example.com', password_hash, 'admin', 'active')]
+    teachers = []
+    for t in range(1, plan.teachers + 1):
+        user_id = t + 1
+        school = (t - 1) // plan.teachers_per_school + 1
+        email = f"teacher{t}@school{school}.example.com"
+        users.append((user_id, f"teacher{t}", email, password_hash, 'teacher', 'active'))
+        teachers.append((t, user_id, f"Teacher {t}", email, SUBJECT_NAMES[t % len(SUBJECT_NAMES)], 'active'))
+    return users, teachers
+
+
+def _class_teacher(plan, class_id):
+    school = (class_id - 1) // plan.classes_per_school
+    offset = (class_id - 1) % plan.classes_per_school % plan.teachers_per_school
+    return school * plan.teachers_per_school + offset + 1
+
+
+def _classes(plan):
+    for c in range(1, plan.classes + 1):
+        school = (c - 1) // plan.classes_per_school + 1
+        grade_level = (c - 1) % plan.classes_per_school // 2 + 1
+        yield (c, f"S{school}-G{grade_level}-{'AB'[(c - 1) % 2]}", 2025, _class_teacher(plan, c))
+
+
+def _students(plan, rng):
+    for s in range(1, plan.students + 1):
+        class_id = (s - 1) // plan.students_per_class + 1
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        gender = rng.choice(('Male', 'Female'))
+        dob = date(2008, 1, 1) + timedelta(days=rng.randrange(0, 1460))
+        status = 'active' if rng.random() < 0.97 else 'inactive'
+        yield (s, name, gender, dob, f"student{s}@studentmail.example.com", None, None, class_id, status)
+
+
+def _subjects(plan):
+    for c in range(1, plan.classes + 1):
+        for k in range(plan.subjects_per_class):
+            subject_id = (c - 1) * plan.subjects_per_class + k + 1
+            yield (subject_id, SUBJECT_NAMES[k % len(SUBJECT_NAMES)], c)
+
+
+def _subject_teachers(plan):
+    for subject_id, _, class_id in _subjects(plan):
+        yield (subject_id, _class_teacher(plan, class_id))
+
+
+def _attendance(plan, rng):
+    days = list(_school_days(plan.start_date, plan.school_days))
+    for day in days:
+        for class_id in range(1, plan.classes + 1):
+            first = (class_id - 1) * plan.students_per_class + 1
+            statuses = rng.choices(ATTENDANCE_STATUSES, cum_weights=ATTENDANCE_CUM_WEIGHTS,
+                                   k=plan.students_per_class)
+            for offset, status in enumerate(statuses):
+                yield (first + offset, class_id, day, status)
+
+
+def _grades(plan, rng, block=1000):
+    """Grades are generated a block of students at a time so letters are classified in one call."""
+    scale = get_scale()
+    for block_start in range(1, plan.students + 1, block):
+        rows = []
+        for s in range(block_start, min(block_start + block, plan.students + 1)):
+            class_id = (s - 1) // plan.students_per_class + 1
+            teacher_id = _class_teacher(plan, class_id)
+            ability = rng.gauss(75, 10)
+            for k in range(plan.subjects_per_class):
+                subject_id = (class_id - 1) * plan.subjects_per_class + k + 1
+                for term in plan.terms:
+                    score = round(min(100.0, max(0.0, rng.gauss(ability, 8))), 2)
+                    rows.append((s, subject_id, class_id, teacher_id, term, score))
+        letters, remarks = scale.classify_many([r[5] for r in rows])
+        for row, letter, remark in zip(rows, letters, remarks):
+            yield (*row, letter, remark)
+
+
+# ==============================================================
+# 🔹 Entry point
+# ==============================================================
+def generate(conn, plan, batch_size=5000, truncate=True):
+    """Load a synthetic dataset described by `plan` and print per-table throughput."""
+    rng = random.Random(plan.seed)
+    cursor = conn.cursor()
+    print(f"⚙️ Generating synthetic data (seed={plan.seed}): {plan.summary()}")
+
+    # FK and unique checks are deferred for the load and restored at the end
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0;")
+    cursor.execute("SET UNIQUE_CHECKS = 0;")
+    if truncate:
+        for t in TABLES:
+            cursor.execute(f"TRUNCATE TABLE {t};")
+    cursor.close()
+
+    users, teachers = _users_and_teachers(plan)
+    loads = [
+        ('users', ('id', 'username', 'email', 'password_hash', 'role', 'status'), users),
+        ('teachers', ('id', 'user_id', 'name', 'email', 'specialization', 'status'), teachers),
+        ('classes', ('id', 'name', 'year', 'teacher_id'), _classes(plan)),
+        ('students', ('id', 'name', 'gender', 'dob', 'email', 'contact', 'address', 'class_id', 'status'),
+         _students(plan, rng)),
+        ('subjects', ('id', 'name', 'class_id'), _subjects(plan)),
+        ('subject_teacher', ('subject_id', 'teacher_id'), _subject_teachers(plan)),
+        ('attendance', ('student_id', 'class_id', 'date', 'status'), _attendance(plan, rng)),
+        ('grades', ('student_id', 'subject_id', 'class_id', 'teacher_id', 'term', 'score',
+                    'grade_letter', 'remarks'), _grades(plan, rng)),
+    ]
+
+    total_rows = 0
+    started = time.perf_counter()
+    try:
+        for table, columns, rows in loads:
+            count, _ = _bulk_insert(conn, table, columns, rows, batch_size)
+            total_rows += count
+    finally:
+        cursor = conn.cursor()
+        cursor.execute("SET UNIQUE_CHECKS = 1;")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1;")
+        cursor.close()
+
+    print("🔁 Building rollups...")
+    GradeStatsModel.rebuild(conn)
+    RankModel.rebuild(conn)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {total_rows:,} rows in {elapsed:.1f}s ({total_rows / elapsed:,.0f} rows/sec overall)")
+    return total_rows
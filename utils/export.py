@@ -0,0 +1,162 @@
+# ==============================================================
+# FILE: utils/export.py
+# PURPOSE: Streamed CSV / XLSX encoders (constant memory, rows in -> bytes out)
+# ==============================================================
+
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+CHUNK_BYTES = 64 * 1024
+
+# Excel's hard limit per worksheet (including the header row)
+XLSX_MAX_ROWS = 1_048_576
+
+
+def csv_chunks(header, rows, chunk_bytes=CHUNK_BYTES):
+    """Yield UTF-8 CSV (with BOM so Excel detects the encoding) in ~chunk_bytes pieces."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('﻿')
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_bytes:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+# ==============================================================
+# 🔹 XLSX: a minimal SpreadsheetML package written through zipfile to a
+#    non-seekable sink, so bytes can be sent while rows are still being read
+# ==============================================================
+class _Sink(io.RawIOBase):
+    """Write-only stream whose bytes are collected and handed out by drain()."""
+
+    def __init__(self):
+        self._parts = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+def _col(index):
+    name = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+def _cell(ref, value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+    text = escape(str(value))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(number, values):
+    cells = ''.join(_cell(f"{_col(i)}{number}", v) for i, v in enumerate(values))
+    return f'<row r="{number}">{cells}</row>'
+
+
+_SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+               '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+               '<sheetData>')
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def xlsx_chunks(header, rows, sheet_title='Sheet', chunk_bytes=CHUNK_BYTES):
+    """
+    Yield an .xlsx file in pieces. Values are written as inline strings or
+    numbers (dates as ISO text), so no shared-string table has to be kept in
+    memory. Output rolls over to a new worksheet every XLSX_MAX_ROWS rows.
+    """
+    sink = _Sink()
+    zf = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+    sheets = 0
+    rows = iter(rows)
+    exhausted = False
+
+    while not exhausted:
+        sheets += 1
+        with zf.open(f'xl/worksheets/sheet{sheets}.xml', 'w', force_zip64=True) as part:
+            part.write(_SHEET_HEAD.encode('utf-8'))
+            part.write(_row_xml(1, header).encode('utf-8'))
+            number = 1
+            for row in rows:
+                number += 1
+                part.write(_row_xml(number, row).encode('utf-8'))
+                if sink.size >= chunk_bytes:
+                    yield sink.drain()
+                if number >= XLSX_MAX_ROWS:
+                    break
+            else:
+                exhausted = True
+            part.write(_SHEET_TAIL.encode('utf-8'))
+        yield sink.drain()
+
+    titles = [sheet_title if n == 1 else f"{sheet_title} {n}" for n in range(1, sheets + 1)]
+    zf.writestr('[Content_Types].xml',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                + ''.join(f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                          'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                          for n in range(1, sheets + 1))
+                + '</Types>')
+    zf.writestr('_rels/.rels',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                '<Relationship Id="rId1" Target="xl/workbook.xml" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+                '</Relationships>')
+    zf.writestr('xl/workbook.xml',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+                + ''.join(f'<sheet name="{escape(t[:31])}" sheetId="{n}" r:id="rId{n}"/>'
+                          for n, t in enumerate(titles, start=1))
+                + '</sheets></workbook>')
+    zf.writestr('xl/_rels/workbook.xml.rels',
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                + ''.join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                          'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+                          for n in range(1, sheets + 1))
+                + '</Relationships>')
+    zf.close()
+    yield sink.drain()
+
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', csv_chunks),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', xlsx_chunks),
+}
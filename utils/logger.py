@@ -0,0 +1,150 @@
+# ==============================================================
+# FILE: utils/logger.py
+# PURPOSE: Structured JSON logging with a non-blocking queue handler
+# ==============================================================
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from flask import request
+
+_request_id = ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra={...}
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id and any extra fields."""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request being handled (runs in the caller's thread)."""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = _request_id.get()
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue that never blocks the caller: when the
+    sink falls behind and the queue is full, the record is dropped and counted.
+    """
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Render message and traceback now, while args and exc_info are still valid
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+_handler = None
+
+
+def configure_logging(level='INFO', queue_size=10000, stream=None):
+    """
+    Route the root logger through a bounded queue; a background listener
+    thread writes JSON lines to `stream` (stdout by default). Idempotent.
+    """
+    global _listener, _handler
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _handler is not None:
+        return _handler
+
+    sink = logging.StreamHandler(stream or sys.stdout)
+    sink.setFormatter(JsonFormatter())
+
+    _handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    _handler.addFilter(RequestIdFilter())
+    root.handlers[:] = [_handler]
+
+    _listener = logging.handlers.QueueListener(_handler.queue, sink, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records():
+    return _handler.dropped if _handler is not None else 0
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+def init_app(app):
+    """
+    Configure logging from LOG_LEVEL / LOG_QUEUE_SIZE and give every request
+    an id (incoming X-Request-ID or a new one), echoed back on the response.
+    """
+    configure_logging(app.config.get('LOG_LEVEL', 'INFO'), int(app.config.get('LOG_QUEUE_SIZE', 10000)))
+    access = logging.getLogger('app.access')
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get('X-Request-ID', '')
+        rid = incoming[:64] if incoming else uuid.uuid4().hex
+        request.environ['logger.token'] = _request_id.set(rid)
+
+    @app.after_request
+    def _echo_request_id(response):
+        rid = _request_id.get()
+        if rid:
+            response.headers['X-Request-ID'] = rid
+        access.debug("%s %s %s", request.method, request.path, response.status_code,
+                     extra={'endpoint': request.endpoint, 'status': response.status_code})
+        return response
+
+    @app.teardown_request
+    def _clear_request_id(exc=None):
+        token = request.environ.pop('logger.token', None)
+        if token is not None:
+            _request_id.reset(token)
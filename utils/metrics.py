@@ -0,0 +1,238 @@
+# ==============================================================
+# FILE: utils/metrics.py
+# PURPOSE: Request, DB, cache and pool metrics in Prometheus text format
+# ==============================================================
+
+import threading
+import time
+
+from flask import Response, abort, request
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """Counters owned by one thread; only that thread ever writes to it."""
+
+    def __init__(self):
+        self.requests = {}   # (endpoint, method, status) -> count
+        self.latency = {}    # (endpoint, status) -> [bucket counts..., +Inf, sum]
+        self.db = {}         # endpoint -> [queries, seconds]
+
+    def add(self, other):
+        """Add another shard's counts into this one."""
+        for key, n in list(other.requests.items()):
+            self.requests[key] = self.requests.get(key, 0) + n
+        for key, hist in list(other.latency.items()):
+            merged = self.latency.setdefault(key, [0] * len(hist))
+            for i, v in enumerate(list(hist)):
+                merged[i] += v
+        for key, (q, s) in list(other.db.items()):
+            merged = self.db.setdefault(key, [0, 0.0])
+            merged[0] += q
+            merged[1] += s
+
+
+class MetricsRegistry:
+    """
+    Lock-light metrics store: every thread increments its own shard, so the
+    request path takes no lock at all. A lock is only held when a new thread
+    registers its shard and while a scrape copies the shard list.
+
+    Shards of finished threads (e.g. recycled gunicorn threads) are folded
+    into one retired shard whenever a shard is registered or a scrape runs,
+    so the list stays at one shard per live thread and no counts are lost.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []            # [(owner thread, shard)]
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._prune()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _prune(self):
+        """Fold shards of threads that have exited into the retired totals (lock held)."""
+        live = []
+        for owner, shard in self._shards:
+            if owner.is_alive():
+                live.append((owner, shard))
+            else:
+                self._retired.add(shard)
+        self._shards = live
+
+    # ------------------------
+    # ✍️ RECORD
+    # ------------------------
+    def observe_request(self, endpoint, method, status, seconds):
+        shard = self._shard()
+        key = (endpoint, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+
+        hist = shard.latency.get((endpoint, status))
+        if hist is None:
+            hist = shard.latency[(endpoint, status)] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(self.buckets)] += 1
+        hist[-1] += seconds
+
+    def observe_db(self, endpoint, queries, seconds):
+        shard = self._shard()
+        totals = shard.db.get(endpoint)
+        if totals is None:
+            totals = shard.db[endpoint] = [0, 0.0]
+        totals[0] += queries
+        totals[1] += seconds
+
+    # ------------------------
+    # 📤 EXPORT
+    # ------------------------
+    def snapshot(self):
+        """Merge all shards into (requests, latency, db) dicts."""
+        total = _Shard()
+        with self._lock:
+            self._prune()
+            total.add(self._retired)
+            shards = [shard for _, shard in self._shards]
+
+        for shard in shards:
+            total.add(shard)
+        return total.requests, total.latency, total.db
+
+    def render(self, extra=()):
+        """Prometheus text exposition (format 0.0.4)."""
+        requests, latency, db = self.snapshot()
+        lines = []
+
+        lines.append("# HELP http_requests_total HTTP requests handled.")
+        lines.append("# TYPE http_requests_total counter")
+        for (endpoint, method, status), n in sorted(requests.items()):
+            lines.append(f'http_requests_total{{endpoint="{_esc(endpoint)}",method="{method}",status="{status}"}} {n}')
+
+        lines.append("# HELP http_request_duration_seconds Request latency.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (endpoint, status), hist in sorted(latency.items()):
+            labels = f'endpoint="{_esc(endpoint)}",status="{status}"'
+            cumulative = 0
+            for bound, n in zip(self.buckets, hist):
+                cumulative += n
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += hist[len(self.buckets)]
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {hist[-1]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        lines.append("# HELP db_queries_total SQL statements executed, by endpoint.")
+        lines.append("# TYPE db_queries_total counter")
+        for endpoint, (q, _) in sorted(db.items()):
+            lines.append(f'db_queries_total{{endpoint="{_esc(endpoint)}"}} {q}')
+        lines.append("# HELP db_query_seconds_total Time spent in SQL, by endpoint.")
+        lines.append("# TYPE db_query_seconds_total counter")
+        for endpoint, (_, s) in sorted(db.items()):
+            lines.append(f'db_query_seconds_total{{endpoint="{_esc(endpoint)}"}} {s:.6f}')
+
+        for name, kind, help_text, samples in extra:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_esc(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _esc(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ==============================================================
+# 🔹 Gauges read at scrape time (cache and pool keep their own counters)
+# ==============================================================
+def _cache_metrics(caches):
+    hits, misses, ratio, entries = [], [], [], []
+    for name, cache in caches.items():
+        s = cache.stats()
+        lookups = s['hits'] + s['misses']
+        labels = {'cache': name}
+        hits.append((labels, s['hits']))
+        misses.append((labels, s['misses']))
+        ratio.append((labels, round(s['hits'] / lookups, 4) if lookups else 0))
+        entries.append((labels, s['entries']))
+    return [
+        ('cache_hits_total', 'counter', 'Cache hits.', hits),
+        ('cache_misses_total', 'counter', 'Cache misses.', misses),
+        ('cache_hit_ratio', 'gauge', 'Hits / lookups since start.', ratio),
+        ('cache_entries', 'gauge', 'Entries currently cached.', entries),
+    ]
+
+
+def _pool_metrics(stats):
+    gauges = ('open', 'idle', 'in_use', 'pool_size', 'max_overflow')
+    counters = ('checkouts', 'waits', 'timeouts', 'created', 'recycled', 'invalidated')
+    out = [(f"db_pool_{g.replace('pool_', '')}", 'gauge', f'Connection pool {g}.', [({}, stats[g])])
+           for g in gauges if g in stats]
+    out += [(f'db_pool_{c}_total', 'counter', f'Connection pool {c}.', [({}, stats[c])])
+            for c in counters if c in stats]
+    return out
+
+
+def init_app(app, caches=None, pool_stats=None):
+    """
+    Record every request and expose GET /metrics. The endpoint only answers
+    addresses in METRICS_ALLOWED_IPS (loopback by default) so it is scraped
+    locally. Each gunicorn worker keeps its own counters.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return None
+
+    registry = MetricsRegistry()
+    caches = caches or {}
+    allowed = {ip.strip() for ip in app.config.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')}
+
+    @app.before_request
+    def _start_timer():
+        request.environ['metrics.started'] = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = request.environ.pop('metrics.started', None)
+        if started is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        registry.observe_request(endpoint, request.method, response.status_code,
+                                 time.perf_counter() - started)
+
+        from models.query_log import current_log
+        log = current_log()
+        if log is not None and log.count:
+            registry.observe_db(endpoint, log.count, log.total_ms / 1000)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if request.remote_addr not in allowed:
+            abort(404)
+        extra = _cache_metrics(caches)
+        if pool_stats is not None:
+            extra += _pool_metrics(pool_stats())
+        from utils.logger import dropped_records
+        extra.append(('log_records_dropped_total', 'counter',
+                      'Log records dropped because the log queue was full.', [({}, dropped_records())]))
+        return Response(registry.render(extra), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    app.extensions['metrics'] = registry
+    return registry
@@ -0,0 +1,166 @@
+# ==============================================================
+# FILE: utils/profiler.py
+# PURPOSE: Opt-in sampling profiler for live requests (collapsed stacks)
+# ==============================================================
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import request, session
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: one background thread snapshots the stacks of the
+    request threads being profiled every `interval` seconds and counts them
+    as collapsed stacks ("frame;frame;frame count"), the input format of
+    flamegraph.pl / speedscope.
+
+    Overhead is capped by `budget`: the share of wall time the sampler may
+    spend walking stacks, measured over a rolling window. Past the budget no
+    new requests are profiled and running profiles stop taking samples until
+    the window recovers.
+    """
+
+    WINDOW = 10.0  # seconds
+
+    def __init__(self, output_dir, interval=0.005, budget=0.01, max_concurrent=4):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.budget = budget
+        self.max_concurrent = max_concurrent
+
+        self._targets = {}            # thread id -> Counter of stacks
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()   # serializes appends to .folded files
+        self._wake = threading.Event()
+        self._thread = None
+        self._window_start = time.perf_counter()
+        self._window_busy = 0.0
+        self.stats = {'profiled': 0, 'skipped_budget': 0, 'samples': 0, 'samples_skipped': 0, 'written': 0}
+
+    # ------------------------
+    # 🔧 Sampler thread
+    # ------------------------
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            if not self._targets:
+                self._wake.wait()
+                self._wake.clear()
+            time.sleep(self.interval)
+
+            with self._lock:
+                if self._over_budget():
+                    self.stats['samples_skipped'] += 1
+                    continue
+
+            started = time.perf_counter()
+            frames = sys._current_frames()
+            with self._lock:
+                for tid, stacks in self._targets.items():
+                    frame = frames.get(tid)
+                    if frame is not None:
+                        stacks[self._collapse(frame)] += 1
+                        self.stats['samples'] += 1
+            del frames
+            self._account(time.perf_counter() - started)
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _roll_window(self):
+        now = time.perf_counter()
+        if now - self._window_start > self.WINDOW:
+            self._window_start = now
+            self._window_busy = 0.0
+        return now
+
+    def _account(self, busy):
+        with self._lock:
+            self._roll_window()
+            self._window_busy += busy
+
+    def _over_budget(self):
+        """Call with self._lock held."""
+        elapsed = max(self._roll_window() - self._window_start, self.interval)
+        return self._window_busy / elapsed > self.budget
+
+    # ------------------------
+    # ▶️ Per-request start/stop
+    # ------------------------
+    def start(self):
+        """Begin profiling the current thread; False if the overhead budget is spent."""
+        with self._lock:
+            if self._over_budget() or len(self._targets) >= self.max_concurrent:
+                self.stats['skipped_budget'] += 1
+                return False
+            self._targets[threading.get_ident()] = Counter()
+            self.stats['profiled'] += 1
+        self._ensure_thread()
+        self._wake.set()
+        return True
+
+    def stop(self, endpoint):
+        with self._lock:
+            stacks = self._targets.pop(threading.get_ident(), None)
+        if stacks:
+            self._write(endpoint, stacks)
+
+    def _write(self, endpoint, stacks):
+        # File I/O stays off self._lock so the sampler and start() never wait on disk
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint or 'unknown')
+        path = os.path.join(self.output_dir, f"{safe}.folded")
+        lines = ''.join(f"{stack} {count}\n" for stack, count in stacks.items())
+        with self._write_lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        with self._lock:
+            self.stats['written'] += 1
+
+
+def init_app(app):
+    """
+    Enable with PROFILER_ENABLED. A request is profiled when it is randomly
+    sampled (PROFILER_SAMPLE_RATE) or when an admin sends the PROFILER_HEADER.
+    Output: <PROFILER_OUTPUT_DIR>/<endpoint>.folded
+    """
+    if not app.config.get('PROFILER_ENABLED'):
+        return None
+
+    profiler = SamplingProfiler(
+        output_dir=app.config.get('PROFILER_OUTPUT_DIR', 'profiles'),
+        interval=float(app.config.get('PROFILER_INTERVAL_MS', 5)) / 1000,
+        budget=float(app.config.get('PROFILER_OVERHEAD_BUDGET', 0.01)),
+    )
+    sample_rate = float(app.config.get('PROFILER_SAMPLE_RATE', 0.01))
+    header = app.config.get('PROFILER_HEADER', 'X-Profile')
+
+    @app.before_request
+    def _maybe_profile():
+        requested = header in request.headers and session.get('role') == 'admin'
+        if requested or random.random() < sample_rate:
+            request.environ['profiler.active'] = profiler.start()
+
+    @app.teardown_request
+    def _finish_profile(exc=None):
+        if request.environ.pop('profiler.active', False):
+            profiler.stop(request.endpoint)
+
+    app.extensions['sampling_profiler'] = profiler
+    return profiler
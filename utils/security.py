@@ -0,0 +1,217 @@
+# ==============================================================
+# FILE: utils/security.py
+# PURPOSE: Password hashing off the request thread (bounded process pool)
+# ==============================================================
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+class HashPoolBusy(RuntimeError):
+    """The hashing pool is saturated; the caller should answer 'try again'."""
+
+
+def normalize_method(method):
+    """Fill in werkzeug's defaults: 'pbkdf2' -> 'pbkdf2:sha256:600000', 'scrypt' -> 'scrypt:32768:8:1'."""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        hash_name = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if parts[0] == 'scrypt':
+        n, r, p = (parts[1:] + ['32768', '8', '1'][len(parts) - 1:])[:3]
+        return f"scrypt:{n}:{r}:{p}"
+    return method
+
+
+# Module-level so they can be pickled into worker processes
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored_hash, password):
+    return check_password_hash(stored_hash, password)
+
+
+class PasswordHasher:
+    """
+    Runs hash/verify in a process pool so PBKDF2/scrypt work neither holds
+    the GIL nor pins request threads. At most `max_pending` jobs may be queued
+    or running; beyond that calls fail fast with HashPoolBusy instead of
+    letting requests pile up behind the pool. workers=0 hashes inline.
+    """
+
+    def __init__(self, method='scrypt', workers=None, max_pending=None, timeout=10.0):
+        self.method = normalize_method(method)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(1, self.workers) * 4
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hashed': 0, 'verified': 0, 'rejected_busy': 0, 'timed_out': 0}
+
+    # ------------------------
+    # 🔧 Pool plumbing
+    # ------------------------
+    def _pool(self):
+        # A pool inherited through fork (gunicorn --preload) is unusable; build one per process
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _submit(self, fn, *args, release=()):
+        """
+        Submit a job that already holds a pending slot. The slot (and any
+        semaphores in `release`) is freed when the job finishes, not when the
+        caller stops waiting, so queued + running work stays bounded.
+        """
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            for sem in release:
+                sem.release()
+            raise
+
+        def done(_):
+            self._slots.release()
+            for sem in release:
+                sem.release()
+        future.add_done_callback(done)
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # still queued: drop it (its done callback frees the slot)
+            self._bump('timed_out')
+            raise HashPoolBusy("Password hashing timed out; try again shortly.") from None
+
+    def _run(self, fn, *args):
+        if self.workers == 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            self._bump('rejected_busy')
+            raise HashPoolBusy("Password hashing is saturated; try again shortly.")
+        return self._result(self._submit(fn, *args))
+
+    def _bump(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    # ------------------------
+    # 🔐 Public API
+    # ------------------------
+    def hash(self, password):
+        result = self._run(_hash, password, self.method)
+        self._bump('hashed')
+        return result
+
+    def verify(self, stored_hash, password):
+        if not stored_hash:
+            return False
+        result = self._run(_verify, stored_hash, password)
+        self._bump('verified')
+        return result
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch (bulk provisioning). At most half of the pending slots
+        are in use by the batch at any time: a new job is submitted only when
+        one of its earlier jobs finishes, so the pool's FIFO queue never holds
+        more batch work than that and interactive logins keep capacity while
+        an import runs. The batch waits for slots rather than failing.
+        """
+        passwords = list(passwords)
+        if self.workers == 0 or not passwords:
+            hashes = [_hash(p, self.method) for p in passwords]
+        else:
+            window = threading.BoundedSemaphore(max(1, min(self.workers, self.max_pending // 2)))
+            futures = []
+            try:
+                for password in passwords:
+                    if not window.acquire(timeout=self.timeout):
+                        raise HashPoolBusy("Password hashing is saturated; try again shortly.")
+                    if not self._slots.acquire(timeout=self.timeout):
+                        window.release()
+                        raise HashPoolBusy("Password hashing is saturated; try again shortly.")
+                    futures.append(self._submit(_hash, password, self.method, release=(window,)))
+                hashes = [self._result(f) for f in futures]
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+        self._bump('hashed', len(hashes))
+        return hashes
+
+    def needs_rehash(self, stored_hash):
+        """True if the stored hash was made with different parameters than the current policy."""
+        if not stored_hash or '$' not in stored_hash:
+            return True
+        return normalize_method(stored_hash.split('$', 1)[0]) != self.method
+
+    def stats(self):
+        with self._stats_lock:
+            return {'method': self.method, 'workers': self.workers,
+                    'max_pending': self.max_pending, **self._stats}
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+
+# ==============================================================
+# 🔹 Process-wide hasher
+# ==============================================================
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def _hasher_from(config):
+    workers = config.get('PASSWORD_HASH_WORKERS')
+    return PasswordHasher(
+        method=config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+        workers=None if workers in (None, '') else int(workers),
+        max_pending=int(config.get('PASSWORD_HASH_MAX_PENDING', 0)) or None,
+        timeout=float(config.get('PASSWORD_HASH_TIMEOUT', 10)),
+    )
+
+
+def configure_hasher(config):
+    global _hasher
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+        _hasher = _hasher_from(config)
+    return _hasher
+
+
+def get_hasher():
+    """Return the shared hasher, building it from Config on first use."""
+    global _hasher
+    if _hasher is None:
+        from config import Config
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = _hasher_from({k: getattr(Config, k) for k in dir(Config) if k.isupper()})
+    return _hasher
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_password(stored_hash, password):
+    return get_hasher().verify(stored_hash, password)